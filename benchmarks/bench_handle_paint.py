@@ -0,0 +1,63 @@
+"""
+TransformRectItem.paint のハンドル描画の性能比較
+
+ハンドルを毎回ベクター描画する場合と、描画済みのグリフ（QPixmapCache）を使う場合で、
+ビューポート程度の大きさの画像へ paint() を繰り返し呼ぶ時間を計測する。
+ドラッグ中を想定し、描画位置と回転角は呼び出しごとに少しずつ変える。
+
+使用例:
+    python benchmarks/bench_handle_paint.py --repeats 2000
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from PySide6.QtCore import QRectF
+from PySide6.QtGui import QColor, QImage, QPainter
+from PySide6.QtWidgets import QApplication, QStyleOptionGraphicsItem
+
+from animation_tools_common.transform_rect_item import TransformRectItem
+
+
+def bench_paint(item: TransformRectItem, use_glyph_cache: bool, repeats: int, rotate: bool) -> float:
+    item.use_glyph_cache = use_glyph_cache
+    image = QImage(800, 600, QImage.Format.Format_ARGB32_Premultiplied)
+    image.fill(QColor(255, 255, 255))
+    option = QStyleOptionGraphicsItem()
+    painter = QPainter(image)
+    start = time.perf_counter()
+    for i in range(repeats):
+        painter.save()
+        painter.translate(200 + (i % 50) * 3.3, 150 + (i % 30) * 2.7)
+        if rotate:
+            painter.rotate(i % 90)
+        item.paint(painter, option, None)
+        painter.restore()
+    elapsed = time.perf_counter() - start
+    painter.end()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeats', type=int, default=2000)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    item = TransformRectItem(QRectF(0, 0, 240, 160))
+    print(f"{'debug':>6} {'rotate':>7} {'vector(us)':>11} {'glyph(us)':>10}")
+    for debug in (False, True):
+        item.set_debug_mode(debug)
+        for rotate in (False, True):
+            vector_time = bench_paint(item, False, args.repeats, rotate)
+            glyph_time = bench_paint(item, True, args.repeats, rotate)
+            print(f"{str(debug):>6} {str(rotate):>7} "
+                  f"{vector_time / args.repeats * 1e6:>11.1f} {glyph_time / args.repeats * 1e6:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+CustomSceneのアイテムインデックス方針ごとの性能比較
+
+シーンサイズごとに、'none' / 'bsp' / 'adaptive' の各方針で
+  - 静的なシーンでの範囲検索（items(rect)）と点検索（itemAt）
+  - TransformToolで多数の選択アイテムをドラッグ移動する操作
+にかかる時間を計測する。
+
+使用例:
+    python benchmarks/bench_item_index.py --sizes 1000 5000 20000
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from PySide6.QtCore import QCoreApplication, QEvent, QPointF, QRectF, Qt
+from PySide6.QtGui import QTransform
+from PySide6.QtWidgets import QApplication, QGraphicsRectItem, QGraphicsSceneMouseEvent
+
+from animation_tools_common.custom_scene import CustomScene, ItemIndexPolicy
+from animation_tools_common.tools.transform_tool import TransformTool
+
+
+def build_scene(n: int, policy: ItemIndexPolicy) -> CustomScene:
+    scene = CustomScene()
+    scene.setIndexPolicy(policy)
+    columns = int(math.sqrt(n)) or 1
+    for i in range(n):
+        item = QGraphicsRectItem(0, 0, 40, 30)
+        item.setPos((i % columns) * 50, (i // columns) * 40)
+        scene.importItem(item)
+    # BSPツリーはイベントループで遅延構築されるため、計測前に反映させる
+    QCoreApplication.processEvents()
+    return scene
+
+
+def send_mouse(scene: CustomScene, event_type: QEvent.Type, pos: QPointF, down_pos: QPointF, last_pos: QPointF) -> None:
+    event = QGraphicsSceneMouseEvent(event_type)
+    event.setScenePos(pos)
+    event.setLastScenePos(last_pos)
+    event.setButtonDownScenePos(Qt.MouseButton.LeftButton, down_pos)
+    if event_type == QEvent.Type.GraphicsSceneMouseMove:
+        event.setButtons(Qt.MouseButton.LeftButton)
+    else:
+        event.setButton(Qt.MouseButton.LeftButton)
+        event.setButtons(Qt.MouseButton.LeftButton if event_type == QEvent.Type.GraphicsSceneMousePress else Qt.MouseButton.NoButton)
+    QCoreApplication.sendEvent(scene, event)
+
+
+def bench_queries(scene: CustomScene, queries: int = 500) -> float:
+    rng = random.Random(0)
+    bounds = scene.itemsBoundingRect()
+    start = time.perf_counter()
+    for _ in range(queries):
+        x = bounds.left() + rng.random() * bounds.width()
+        y = bounds.top() + rng.random() * bounds.height()
+        scene.items(QRectF(x, y, 120, 90))
+        scene.itemAt(QPointF(x, y), QTransform())
+    return time.perf_counter() - start
+
+
+def bench_drag(scene: CustomScene, selected: int, moves: int = 60) -> float:
+    tool = TransformTool(scene)
+    scene.registerTool('transform', tool)
+    items = [item for item in scene.items() if item is not tool.transform_rect_item][:selected]
+    for item in items:
+        item.setSelected(True)
+
+    # 変形矩形の内側を掴んで移動する（中心は変形中心ハンドルなので避ける）
+    rect = tool.transform_rect_item.rect()
+    press = tool.transform_rect_item.mapToScene(rect.center() + QPointF(rect.width() / 4, rect.height() / 4))
+    start = time.perf_counter()
+    send_mouse(scene, QEvent.Type.GraphicsSceneMousePress, press, press, press)
+    last = press
+    for i in range(1, moves + 1):
+        pos = press + QPointF(i * 2, i)
+        send_mouse(scene, QEvent.Type.GraphicsSceneMouseMove, pos, press, last)
+        # 実際の操作と同様に、移動イベントの間でインデックスの更新を処理させる
+        QCoreApplication.processEvents()
+        last = pos
+    send_mouse(scene, QEvent.Type.GraphicsSceneMouseRelease, last, press, last)
+    QCoreApplication.processEvents()
+    elapsed = time.perf_counter() - start
+    scene.selectionChanged.disconnect(tool.onSelectionChanged)
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 5000, 20000])
+    parser.add_argument('--drag-fraction', type=float, default=0.25, help='ドラッグで動かすアイテムの割合')
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    print(f"{'items':>7} {'policy':>9} {'queries(ms)':>12} {'drag(ms)':>10}")
+    for n in args.sizes:
+        for mode in ('none', 'bsp', 'adaptive'):
+            policy = ItemIndexPolicy(mode=mode)
+            query_time = bench_queries(build_scene(n, policy))
+            drag_time = bench_drag(build_scene(n, policy), int(n * args.drag_fraction))
+            print(f"{n:>7} {mode:>9} {query_time * 1000:>12.1f} {drag_time * 1000:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
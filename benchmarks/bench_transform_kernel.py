@@ -0,0 +1,93 @@
+"""
+TransformTool の選択アイテム変形の性能比較
+
+アイテムを1つずつ変形する場合と、TransformBatch（NumPy）でまとめて変形する場合で、
+ドラッグ中の1回の移動イベントにあたる拡大縮小・回転・移動の時間を計測する。
+配列の作成はドラッグの開始時に1回だけ行うため、別に計測する。
+
+使用例:
+    python benchmarks/bench_transform_kernel.py --counts 1000 10000 --repeats 20
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from PySide6.QtCore import QPointF
+from PySide6.QtGui import QTransform
+from PySide6.QtWidgets import QApplication, QGraphicsEllipseItem, QGraphicsRectItem, QGraphicsScene
+
+from animation_tools_common.tools.transform_tool import TransformTool
+from animation_tools_common.transform_kernel import TransformBatch
+
+
+def make_items(scene: QGraphicsScene, count: int) -> list:
+    items = []
+    for i in range(count):
+        item = QGraphicsRectItem(0, 0, 20, 10) if i % 2 == 0 else QGraphicsEllipseItem(0, 0, 20, 10)
+        item.setPos((i % 100) * 25, (i // 100) * 15)
+        item.setTransform(QTransform().rotate(i % 45))
+        scene.addItem(item)
+        items.append(item)
+    return items
+
+
+def per_item(tool: TransformTool, items: list, operation: str, step: int) -> None:
+    origin = QPointF(step, -step)
+    for item in items:
+        if operation == 'scale':
+            if isinstance(item, QGraphicsRectItem):
+                tool._transformRectItem(item, 1.001, 0.999, origin)
+            else:
+                tool._transformGenericItem(item, 1.001, 0.999, origin)
+        elif operation == 'rotate':
+            tool._rotateItem(item, 0.5, origin)
+        else:
+            item.setPos(item.pos() + QPointF(1, 0.5))
+
+
+def batched(batch: TransformBatch, operation: str, step: int) -> None:
+    origin = QPointF(step, -step)
+    if operation == 'scale':
+        batch.scale(1.001, 0.999, origin)
+    elif operation == 'rotate':
+        batch.rotate(0.5, origin)
+    else:
+        batch.translate(1, 0.5)
+    batch.apply()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--counts', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--repeats', type=int, default=20)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    print(f"{'items':>6} {'operation':>10} {'per item(ms)':>13} {'batch(ms)':>10}")
+    for count in args.counts:
+        scene = QGraphicsScene()
+        tool = TransformTool(scene)
+        items = make_items(scene, count)
+        start = time.perf_counter()
+        batch = TransformBatch(items)
+        print(f"{count:>6} {'gather':>10} {'':>13} {(time.perf_counter() - start) * 1e3:>10.2f}")
+        for operation in ('scale', 'rotate', 'translate'):
+            start = time.perf_counter()
+            for step in range(args.repeats):
+                per_item(tool, items, operation, step)
+            per_item_time = (time.perf_counter() - start) / args.repeats
+            batch = TransformBatch(items)
+            start = time.perf_counter()
+            for step in range(args.repeats):
+                batched(batch, operation, step)
+            batch_time = (time.perf_counter() - start) / args.repeats
+            print(f"{count:>6} {operation:>10} {per_item_time * 1e3:>13.2f} {batch_time * 1e3:>10.2f}")
+        scene.selectionChanged.disconnect(tool.onSelectionChanged)
+
+
+if __name__ == '__main__':
+    main()
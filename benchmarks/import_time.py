@@ -0,0 +1,88 @@
+"""
+パッケージのインポート時間を計測するスクリプト
+
+python -X importtime の出力を解析し、対象モジュールのインポートにかかった累積時間と
+時間のかかっている依存モジュールを表示する。--budget-ms を超えた場合は終了コード1を返す。
+
+使用例:
+    python benchmarks/import_time.py animation_tools_common.filename_format --budget-ms 20
+    python benchmarks/import_time.py animation_tools_common.custom_scene --top 15
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+_LINE_RE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)\s*$')
+
+
+@dataclass
+class ImportRecord:
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> list[ImportRecord]:
+    """-X importtime の標準エラー出力を解析"""
+    records: list[ImportRecord] = []
+    for line in output.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            # 最上位のモジュールは空白1つ、以降ネストごとに2つ増える
+            records.append(ImportRecord(name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return records
+
+
+def measure_import_time(module: str) -> list[ImportRecord]:
+    """新しいインタプリタでmoduleをインポートし、インポート記録を返す"""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [SRC_DIR, env.get('PYTHONPATH')]))
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, env=env, check=True)
+    return parse_importtime(proc.stderr)
+
+
+def total_cost_us(records: list[ImportRecord], module: str) -> int:
+    """moduleとその親パッケージのインポートにかかった累積時間（マイクロ秒）"""
+    parts = module.split('.')
+    targets = {'.'.join(parts[:i + 1]) for i in range(len(parts))}
+    return sum(r.cumulative_us for r in records if r.depth == 0 and r.name in targets)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('module', nargs='?', default='animation_tools_common.filename_format')
+    parser.add_argument('--budget-ms', type=float, default=None, help='許容するインポート時間（ミリ秒）')
+    parser.add_argument('--top', type=int, default=10, help='表示する依存モジュールの数')
+    parser.add_argument('--repeat', type=int, default=5, help='計測回数（最小値を採用）')
+    args = parser.parse_args()
+
+    runs = [measure_import_time(args.module) for _ in range(args.repeat)]
+    costs = [total_cost_us(records, args.module) for records in runs]
+    best_index = costs.index(min(costs))
+    records = runs[best_index]
+    total_ms = costs[best_index] / 1000.0
+
+    qt_modules = sorted({r.name for r in records if r.name.startswith(('PySide6', 'shiboken6'))})
+    print(f"{args.module}: {total_ms:.2f} ms (best of {args.repeat})")
+    print(f"PySide6 modules loaded: {', '.join(qt_modules) if qt_modules else 'none'}")
+    print(f"\nslowest imports (self time):")
+    for r in sorted(records, key=lambda r: r.self_us, reverse=True)[:args.top]:
+        print(f"  {r.self_us / 1000.0:8.2f} ms  {r.name}")
+
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print(f"\nimport time budget exceeded: {total_ms:.2f} ms > {args.budget_ms:.2f} ms")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
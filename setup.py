@@ -7,6 +7,7 @@ setup(
     package_dir={"": "src"},
     install_requires=[
         "PySide6>=6.0.0",
+        "numpy",
     ],
     author="あなたの名前",
     description="アニメーション制作ツール用の共通コンポーネント",
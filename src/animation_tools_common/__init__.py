@@ -0,0 +1,97 @@
+"""アニメーション制作ツール用の共通コンポーネント
+
+公開名は初回アクセス時に定義モジュールをインポートする（PEP 562）。
+filename_format など Qt に依存しないモジュールだけを使う場合、PySide6 は読み込まれない。
+"""
+from importlib import import_module
+
+# typingの読み込みも避けるため定数で代用（型チェッカーはTYPE_CHECKINGを真として扱う）
+TYPE_CHECKING = False
+
+__version__ = "0.1.0"
+
+# 公開名 -> 定義モジュール
+_LAZY_ATTRS: dict[str, str] = {
+    # シーン・ビュー
+    'CustomScene': '.custom_scene',
+    'ItemIndexPolicy': '.custom_scene',
+    'CustomBaseGraphicsView': '.custom_view',
+    'TransformScene': '.transform_scene',
+    'TransformView': '.transform_scene',
+    # アイテム
+    'TransformRectItem': '.transform_rect_item',
+    'SelectionPathItem': '.selection_path_item',
+    'RegionItem': '.region_item_v2',
+    # ツール
+    'BaseTool': '.tools.base_tool',
+    'SelectTool': '.tools.select_tool',
+    'TransformTool': '.tools.transform_tool',
+    'RegionTool': '.tools.region_tool',
+    'PanTool': '.tools.pan_tool',
+    # アクション
+    'BaseAction': '.actions.base_action',
+    'DeleteAction': '.actions.delete_action',
+    'DuplicateAction': '.actions.duplicate_action',
+    'SelectSimilarAction': '.actions.select_similar_actions',
+    # テンプレート管理
+    'TemplateManager': '.template_manager',
+    'TemplateManagerWidget': '.template_manager_widget',
+    'TemplateOptionsDialog': '.template_manager_widget',
+    # 選択
+    'batchSelection': '.selection',
+    'selectAll': '.selection',
+    'selectionBatchActive': '.selection',
+    'SelectionSets': '.selection_sets',
+    # 入力の記録と再生
+    'SceneInputRecorder': '.input_recorder',
+    'SceneInputReplayer': '.input_recorder',
+    # Qtに依存しないユーティリティ
+    'format_filename': '.filename_format',
+    'parse_filename': '.filename_format',
+    'Rect': '.obj',
+    'RectF': '.obj',
+    'GridRectF': '.obj',
+    'debug_decorator': '.decorators',
+}
+
+__all__ = sorted(_LAZY_ATTRS)
+
+
+def __getattr__(name: str) -> object:
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    # 2回目以降は通常の属性参照で解決されるようにキャッシュ
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .custom_scene import CustomScene, ItemIndexPolicy
+    from .custom_view import CustomBaseGraphicsView
+    from .transform_scene import TransformScene, TransformView
+    from .transform_rect_item import TransformRectItem
+    from .selection_path_item import SelectionPathItem
+    from .region_item_v2 import RegionItem
+    from .tools.base_tool import BaseTool
+    from .tools.select_tool import SelectTool
+    from .tools.transform_tool import TransformTool
+    from .tools.region_tool import RegionTool
+    from .tools.pan_tool import PanTool
+    from .actions.base_action import BaseAction
+    from .actions.delete_action import DeleteAction
+    from .actions.duplicate_action import DuplicateAction
+    from .actions.select_similar_actions import SelectSimilarAction
+    from .template_manager import TemplateManager
+    from .template_manager_widget import TemplateManagerWidget, TemplateOptionsDialog
+    from .selection import batchSelection, selectAll, selectionBatchActive
+    from .selection_sets import SelectionSets
+    from .input_recorder import SceneInputRecorder, SceneInputReplayer
+    from .filename_format import format_filename, parse_filename
+    from .obj import Rect, RectF, GridRectF
+    from .decorators import debug_decorator
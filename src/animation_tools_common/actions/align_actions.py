@@ -1,13 +1,15 @@
-from typing import List
-from PySide6.QtWidgets import QGraphicsItem
+from typing import TYPE_CHECKING, Sequence
 from .base_action import BaseAction
 
+if TYPE_CHECKING:
+    from PySide6.QtWidgets import QGraphicsItem
+
 class BaseAlignAction(BaseAction):
     """揃えるアクションの基底クラス"""
     pass
-    def _get_selected_items(self) -> List[QGraphicsItem]:
+    def _get_selected_items(self) -> Sequence['QGraphicsItem']:
         """シーンから選択されているアイテムを取得"""
-        return self.scene.selectedItems()
+        return self._selectedItems()
 
 class AlignLeftAction(BaseAlignAction):
     """選択アイテムを左端に揃えるアクション"""
@@ -29,6 +31,8 @@ class AlignLeftAction(BaseAlignAction):
             current_left = item.sceneBoundingRect().left()
             item.moveBy(left_most - current_left, 0)
 
+        self._notifyGeometryChanged(items)
+
 class AlignCenterAction(BaseAlignAction):
     """選択アイテムを水平中央に揃えるアクション"""
     
@@ -52,6 +56,8 @@ class AlignCenterAction(BaseAlignAction):
             current_center = item.sceneBoundingRect().center().x()
             item.moveBy(reference_center - current_center, 0)
 
+        self._notifyGeometryChanged(items)
+
 class AlignRightAction(BaseAlignAction):
     """選択アイテムを右端に揃えるアクション"""
     
@@ -72,6 +78,7 @@ class AlignRightAction(BaseAlignAction):
             current_right = item.sceneBoundingRect().right()
             item.moveBy(right_most - current_right, 0)
 
+        self._notifyGeometryChanged(items)
 
 class AlignTopAction(BaseAlignAction):
     """選択アイテムを上端に揃えるアクション"""
@@ -93,6 +100,8 @@ class AlignTopAction(BaseAlignAction):
             current_top = item.sceneBoundingRect().top()
             item.moveBy(0, top_most - current_top)
 
+        self._notifyGeometryChanged(items)
+
 class AlignVerticalCenterAction(BaseAlignAction):
     """選択アイテムを垂直中央に揃えるアクション"""
     
@@ -116,6 +125,8 @@ class AlignVerticalCenterAction(BaseAlignAction):
             current_center = item.sceneBoundingRect().center().y()
             item.moveBy(0, reference_center - current_center)
 
+        self._notifyGeometryChanged(items)
+
 class AlignBottomAction(BaseAlignAction):
     """選択アイテムを下端に揃えるアクション"""
     
@@ -136,6 +147,8 @@ class AlignBottomAction(BaseAlignAction):
             current_bottom = item.sceneBoundingRect().bottom()
             item.moveBy(0, bottom_most - current_bottom)
 
+        self._notifyGeometryChanged(items)
+
 class DistributeHorizontallyAction(BaseAlignAction):
     """選択アイテムを水平方向に等間隔で並べるアクション"""
     
@@ -172,6 +185,8 @@ class DistributeHorizontallyAction(BaseAlignAction):
             )
             current_x += rect.width() + spacing
 
+        self._notifyGeometryChanged(items)
+
 class DistributeVerticallyAction(BaseAlignAction):
     """選択アイテムを垂直方向に等間隔で並べるアクション"""
     
@@ -208,6 +223,8 @@ class DistributeVerticallyAction(BaseAlignAction):
             )
             current_y += rect.height() + spacing
 
+        self._notifyGeometryChanged(items)
+
 class DistributeTiledAction(BaseAlignAction):
     """選択アイテムをタイル状に並べるアクション"""
     
@@ -256,4 +273,6 @@ class DistributeTiledAction(BaseAlignAction):
             item.moveBy(
                 target_x - rect.left() + (max_width - rect.width()) / 2,
                 target_y - rect.top() + (max_height - rect.height()) / 2
-            )
\ No newline at end of file
+            )
+
+        self._notifyGeometryChanged(items)
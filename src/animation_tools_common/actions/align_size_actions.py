@@ -10,7 +10,7 @@ class AlignMinSizeAction(BaseAction):
     action_shortcut = "Ctrl+Shift+1"
     
     def execute(self) -> None:
-        selected_items = self.scene.selectedItems()
+        selected_items = self._selectedItems()
         if len(selected_items) < 2:
             return
             
@@ -38,6 +38,8 @@ class AlignMinSizeAction(BaseAction):
                 # その他のアイテムはスケールを使用
                 item.setScale(min_rect.width() / item.boundingRect().width())
 
+        self._notifyGeometryChanged(selected_items)
+
 class AlignMaxSizeAction(BaseAction):
     """選択アイテムを最大サイズに揃えるアクション"""
     
@@ -46,7 +48,7 @@ class AlignMaxSizeAction(BaseAction):
     action_shortcut = "Ctrl+Shift+2"
     
     def execute(self) -> None:
-        selected_items = self.scene.selectedItems()
+        selected_items = self._selectedItems()
         if len(selected_items) < 2:
             return
             
@@ -74,6 +76,8 @@ class AlignMaxSizeAction(BaseAction):
                 # その他のアイテムはスケールを使用
                 item.setScale(max_rect.width() / item.boundingRect().width())
 
+        self._notifyGeometryChanged(selected_items)
+
 class AlignMiddleSizeAction(BaseAction):
     """選択アイテムを中間サイズに揃えるアクション"""
     
@@ -82,7 +86,7 @@ class AlignMiddleSizeAction(BaseAction):
     action_shortcut = "Ctrl+Shift+3"
     
     def execute(self) -> None:
-        selected_items = self.scene.selectedItems()
+        selected_items = self._selectedItems()
         if len(selected_items) < 2:
             return
             
@@ -118,7 +122,9 @@ class AlignMiddleSizeAction(BaseAction):
                 ))
             else:
                 # その他のアイテムはスケールを使用
-                item.setScale(middle_rect.width() / item.boundingRect().width()) 
+                item.setScale(middle_rect.width() / item.boundingRect().width())
+
+        self._notifyGeometryChanged(selected_items)
 
 class AlignAverageWidthAction(BaseAction):
     """選択アイテムの横幅を揃えるアクション"""
@@ -128,7 +134,7 @@ class AlignAverageWidthAction(BaseAction):
     action_shortcut = "Ctrl+Shift+4"
     
     def execute(self) -> None:
-        selected_items = self.scene.selectedItems()
+        selected_items = self._selectedItems()
         if len(selected_items) < 2:
             return
             
@@ -156,6 +162,8 @@ class AlignAverageWidthAction(BaseAction):
                 scale_factor = item.scale() * (average_width / current_width)
                 item.setScale(scale_factor)
 
+        self._notifyGeometryChanged(selected_items)
+
 class AlignAverageHeightAction(BaseAction):
     """選択アイテムの高さを揃えるアクション"""
     
@@ -164,7 +172,7 @@ class AlignAverageHeightAction(BaseAction):
     action_shortcut = "Ctrl+Shift+5"
     
     def execute(self) -> None:
-        selected_items = self.scene.selectedItems()
+        selected_items = self._selectedItems()
         if len(selected_items) < 2:
             return
             
@@ -192,6 +200,8 @@ class AlignAverageHeightAction(BaseAction):
                 scale_factor = item.scale() * (average_height / current_height)
                 item.setScale(scale_factor)
 
+        self._notifyGeometryChanged(selected_items)
+
 class AlignMinWidthAction(BaseAction):
     """選択アイテムの横幅を最小値に揃えるアクション"""
     
@@ -200,7 +210,7 @@ class AlignMinWidthAction(BaseAction):
     action_shortcut = "Ctrl+Shift+6"
     
     def execute(self) -> None:
-        selected_items = self.scene.selectedItems()
+        selected_items = self._selectedItems()
         if len(selected_items) < 2:
             return
             
@@ -226,6 +236,8 @@ class AlignMinWidthAction(BaseAction):
                 scale_factor = item.scale() * (min_width / current_width)
                 item.setScale(scale_factor)
 
+        self._notifyGeometryChanged(selected_items)
+
 class AlignMaxWidthAction(BaseAction):
     """選択アイテムの横幅を最大値に揃えるアクション"""
     
@@ -234,7 +246,7 @@ class AlignMaxWidthAction(BaseAction):
     action_shortcut = "Ctrl+Shift+7"
     
     def execute(self) -> None:
-        selected_items = self.scene.selectedItems()
+        selected_items = self._selectedItems()
         if len(selected_items) < 2:
             return
             
@@ -260,6 +272,8 @@ class AlignMaxWidthAction(BaseAction):
                 scale_factor = item.scale() * (max_width / current_width)
                 item.setScale(scale_factor)
 
+        self._notifyGeometryChanged(selected_items)
+
 class AlignMinHeightAction(BaseAction):
     """選択アイテムの高さを最小値に揃えるアクション"""
     
@@ -268,7 +282,7 @@ class AlignMinHeightAction(BaseAction):
     action_shortcut = "Ctrl+Shift+8"
     
     def execute(self) -> None:
-        selected_items = self.scene.selectedItems()
+        selected_items = self._selectedItems()
         if len(selected_items) < 2:
             return
             
@@ -294,6 +308,8 @@ class AlignMinHeightAction(BaseAction):
                 scale_factor = item.scale() * (min_height / current_height)
                 item.setScale(scale_factor)
 
+        self._notifyGeometryChanged(selected_items)
+
 class AlignMaxHeightAction(BaseAction):
     """選択アイテムの高さを最大値に揃えるアクション"""
     
@@ -302,7 +318,7 @@ class AlignMaxHeightAction(BaseAction):
     action_shortcut = "Ctrl+Shift+9"
     
     def execute(self) -> None:
-        selected_items = self.scene.selectedItems()
+        selected_items = self._selectedItems()
         if len(selected_items) < 2:
             return
             
@@ -326,4 +342,6 @@ class AlignMaxHeightAction(BaseAction):
             else:
                 current_height = item.boundingRect().height()
                 scale_factor = item.scale() * (max_height / current_height)
-                item.setScale(scale_factor) 
\ No newline at end of file
+                item.setScale(scale_factor)
+
+        self._notifyGeometryChanged(selected_items)
@@ -1,7 +1,10 @@
+from typing import TYPE_CHECKING, Sequence
 from PySide6.QtGui import QAction, QIcon, QKeySequence
-from PySide6.QtWidgets import QGraphicsScene
 from PySide6.QtCore import QObject
 
+if TYPE_CHECKING:
+    from PySide6.QtWidgets import QGraphicsScene, QGraphicsItem
+
 class BaseAction(QAction):
     """アクションの基底クラス"""
     
@@ -11,7 +14,7 @@ class BaseAction(QAction):
     action_tooltip: str = ' '
     action_checkable: bool = False
     
-    def __init__(self, scene: QGraphicsScene, parent: QObject | None = None):
+    def __init__(self, scene: 'QGraphicsScene', parent: QObject | None = None):
         super().__init__(parent)
         self.scene = scene
         self._setup()
@@ -38,4 +41,15 @@ class BaseAction(QAction):
     
     def execute(self) -> None:
         """アクションの実行処理"""
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
+
+    def _selectedItems(self) -> Sequence['QGraphicsItem']:
+        """シーンの選択アイテム（シーンにキャッシュがある場合はキャッシュを使う）"""
+        if hasattr(self.scene, 'cachedSelectedItems'):
+            return self.scene.cachedSelectedItems()
+        return self.scene.selectedItems()
+
+    def _notifyGeometryChanged(self, items: Sequence['QGraphicsItem']) -> None:
+        """移動・変形したアイテムをシーンの空間インデックスに通知"""
+        if hasattr(self.scene, 'notifyGeometryChanged'):
+            self.scene.notifyGeometryChanged(items)
\ No newline at end of file
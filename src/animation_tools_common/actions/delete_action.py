@@ -10,6 +10,6 @@ class DeleteAction(BaseAction):
     
     def execute(self) -> None:
         """選択されているアイテムを削除"""
-        selected_items = self.scene.selectedItems()
+        selected_items = self._selectedItems()
         for item in selected_items:
             self.scene.removeItem(item) 
\ No newline at end of file
@@ -11,7 +11,7 @@ class DuplicateAction(BaseAction):
     
     def execute(self) -> None:
         """選択されているアイテムを複製"""
-        selected_items = self.scene.selectedItems()
+        selected_items = self._selectedItems()
         offset = 20  # 複製時のオフセット
         
         for item in selected_items:
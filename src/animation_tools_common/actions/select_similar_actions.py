@@ -0,0 +1,64 @@
+from typing import Hashable
+from PySide6.QtWidgets import QGraphicsItem
+from ..attribute_index import attributeKey
+from ..selection import batchSelection
+from .base_action import BaseAction
+
+class SelectSimilarAction(BaseAction):
+    """選択アイテムと属性が一致するアイテムを選択するアクション"""
+
+    action_text = "類似を選択"
+    action_tooltip = "選択されているアイテムと同じ種類・サイズのアイテムを選択します"
+    action_shortcut = "Ctrl+Shift+A"
+    # 一致させる属性（attribute_index.ATTRIBUTES のいずれか）
+    attributes: tuple[str, ...] = ('type', 'size')
+
+    def execute(self) -> None:
+        selected_items = self._selectedItems()
+        if not selected_items:
+            return
+
+        # 属性の一致するアイテムは結果も同じになるため、選択アイテムをキーでまとめて検索は1回ずつにする
+        keys = dict.fromkeys(self._keys(item) for item in selected_items)
+        similar: dict[QGraphicsItem, None] = {}  # 順序を保った重複なしの集合
+        for key in keys:
+            similar.update(dict.fromkeys(self._itemsMatching(key)))
+
+        selectable = QGraphicsItem.GraphicsItemFlag.ItemIsSelectable
+        with batchSelection(self.scene):
+            for item in similar:
+                if item.flags() & selectable and item.isVisible():
+                    item.setSelected(True)
+
+    def _keys(self, item: QGraphicsItem) -> tuple[tuple[str, Hashable], ...]:
+        """itemの (属性, キー) の組（itemが持たない属性は除く）"""
+        if hasattr(self.scene, 'attribute_index'):
+            return self.scene.attribute_index.keys(item, self.attributes)
+        keys = ((attribute, attributeKey(item, attribute)) for attribute in self.attributes)
+        return tuple((attribute, key) for attribute, key in keys if key is not None)
+
+    def _itemsMatching(self, keys: tuple[tuple[str, Hashable], ...]) -> list[QGraphicsItem]:
+        """属性が一致するアイテム（シーンに属性の索引がない場合は全アイテムを調べる）"""
+        if not keys:
+            return []
+        if hasattr(self.scene, 'attribute_index'):
+            return self.scene.attribute_index.itemsMatching(keys)
+        return [other for other in self.scene.items()
+                if other.topLevelItem() is other
+                and all(attributeKey(other, attribute) == key for attribute, key in keys)]
+
+class SelectSameLabelPrefixAction(SelectSimilarAction):
+    """選択アイテムとラベルの接頭辞（末尾の連番を除いた部分）が同じアイテムを選択するアクション"""
+
+    action_text = "同じラベルを選択"
+    action_tooltip = "選択されているアイテムとラベルの接頭辞が同じアイテムを選択します"
+    action_shortcut = ''
+    attributes = ('type', 'label_prefix')
+
+class SelectSameColorAction(SelectSimilarAction):
+    """選択アイテムと色が同じアイテムを選択するアクション"""
+
+    action_text = "同じ色を選択"
+    action_tooltip = "選択されているアイテムと同じ色のアイテムを選択します"
+    action_shortcut = ''
+    attributes = ('type', 'color')
@@ -0,0 +1,262 @@
+"""
+アイテムの属性（種類・サイズ・ラベル・色・回転）による索引
+
+「選択中のアイテムと同じサイズ・同じ色のアイテムを選択」のような検索を、
+シーン全体の走査ではなく結果の件数に比例する時間で行うための索引。
+属性ごとに 値 -> アイテム集合 のハッシュ索引を持ち、ラベルは前方一致検索用にソート済みの索引も持つ。
+
+アイテムの属性が変わった場合は markDirty() で通知する。再計算は次の検索時にまとめて行う。
+"""
+import bisect
+import math
+import re
+from typing import Any, Hashable, Iterable
+
+from PySide6.QtGui import QColor
+from PySide6.QtWidgets import QGraphicsItem
+
+# 索引を持つ属性
+ATTRIBUTES = ('type', 'size', 'label', 'label_prefix', 'color', 'rotation')
+
+_TRAILING_NUMBER = re.compile(r'\d+$')
+
+
+def labelPrefix(label: str) -> str:
+    """ラベルから末尾の連番を除いたもの（'A-012' -> 'A-'）"""
+    return _TRAILING_NUMBER.sub('', label)
+
+
+def _property(item: QGraphicsItem, name: str) -> Any:
+    """RegionItem.label のようなプロパティの値（持たない場合やメソッドの場合はNone）"""
+    value = getattr(item, name, None)
+    return None if callable(value) else value
+
+
+def attributeKey(item: QGraphicsItem, attribute: str, size_bucket: float = 10.0) -> Hashable | None:
+    """
+    アイテムの属性の索引キー
+
+    Args:
+        item: 対象のアイテム
+        attribute: ATTRIBUTES のいずれか
+        size_bucket: サイズを丸める単位（この幅に収まるサイズの差は同じサイズとみなす）
+
+    Returns:
+        索引のキー。アイテムがその属性を持たない場合はNone
+    """
+    if attribute == 'type':
+        return type(item)
+    if attribute == 'size':
+        rect = item.rect() if hasattr(item, 'rect') else item.boundingRect()
+        return round(rect.width() / size_bucket), round(rect.height() / size_bucket)
+    if attribute == 'label':
+        return _property(item, 'label')
+    if attribute == 'label_prefix':
+        label = _property(item, 'label')
+        return labelPrefix(label) if label is not None else None
+    if attribute == 'color':
+        color = _property(item, 'color')
+        return QColor(color).rgba() if color is not None else None
+    if attribute == 'rotation':
+        # 変形ツールは回転を変換行列に反映するため、変換行列のX軸の向きと rotation() を合わせた角度とする
+        transform = item.transform()
+        angle = math.degrees(math.atan2(transform.m12(), transform.m11())) + item.rotation()
+        return round(angle % 360, 3) % 360
+    raise ValueError(f"unknown attribute: {attribute}")
+
+
+class AttributeIndex:
+    """アイテム属性のハッシュ索引とラベルのソート済み索引"""
+
+    def __init__(self, size_bucket: float = 10.0):
+        if size_bucket <= 0:
+            raise ValueError(f"size_bucket must be positive: {size_bucket}")
+        self.size_bucket = size_bucket
+        self._hash: dict[str, dict[Hashable, set[QGraphicsItem]]] = {name: {} for name in ATTRIBUTES}
+        self._keys: dict[QGraphicsItem, dict[str, Hashable | None]] = {}
+        # ラベルの前方一致検索用（(ラベル, 登録番号) のソート済みリスト）
+        self._labels: list[tuple[str, int]] = []
+        self._order: dict[QGraphicsItem, int] = {}
+        self._by_order: dict[int, QGraphicsItem] = {}
+        self._dirty: set[QGraphicsItem] = set()
+        self._next_order = 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, item: QGraphicsItem) -> bool:
+        return item in self._keys
+
+    def insert(self, item: QGraphicsItem) -> None:
+        """アイテムを登録（登録済みの場合は属性を更新）"""
+        if item not in self._keys:
+            self._order[item] = self._next_order
+            self._by_order[self._next_order] = item
+            self._next_order += 1
+            self._keys[item] = dict.fromkeys(ATTRIBUTES)
+        self._reindex(item)
+
+    def remove(self, item: QGraphicsItem) -> None:
+        """アイテムの登録を解除（未登録の場合は何もしない）"""
+        keys = self._keys.pop(item, None)
+        if keys is None:
+            return
+        for attribute, key in keys.items():
+            self._unindex(item, attribute, key)
+        del self._by_order[self._order.pop(item)]
+        self._dirty.discard(item)
+
+    def clear(self) -> None:
+        """全アイテムの登録を解除"""
+        for table in self._hash.values():
+            table.clear()
+        self._keys.clear()
+        self._labels.clear()
+        self._order.clear()
+        self._by_order.clear()
+        self._dirty.clear()
+
+    def markDirty(self, items: QGraphicsItem | Iterable[QGraphicsItem]) -> None:
+        """
+        属性が変わったアイテムを通知
+
+        Args:
+            items: サイズ・回転・ラベル・色などが変わったアイテム（未登録のアイテムは無視される）
+        """
+        if isinstance(items, QGraphicsItem):
+            items = (items,)
+        keys = self._keys
+        self._dirty.update(item for item in items if item in keys)
+
+    def key(self, item: QGraphicsItem, attribute: str) -> Hashable | None:
+        """登録済みアイテムの属性の索引キー（未登録の場合はその場で計算）"""
+        self._flush()
+        keys = self._keys.get(item)
+        if keys is None:
+            return attributeKey(item, attribute, self.size_bucket)
+        return keys[attribute]
+
+    def itemsWith(self, attribute: str, key: Hashable) -> list[QGraphicsItem]:
+        """
+        属性の索引キーが一致するアイテムを取得
+
+        Args:
+            attribute: ATTRIBUTES のいずれか
+            key: attributeKey() が返すキー
+
+        Returns:
+            登録順に並んだアイテムのリスト
+        """
+        self._flush()
+        return self._sorted(self._hash[attribute].get(key, ()))
+
+    def itemsWithLabelPrefix(self, prefix: str) -> list[QGraphicsItem]:
+        """
+        ラベルが指定の文字列で始まるアイテムを取得
+
+        Returns:
+            ラベル順に並んだアイテムのリスト
+        """
+        self._flush()
+        labels = self._labels
+        items = []
+        for i in range(bisect.bisect_left(labels, (prefix, -1)), len(labels)):
+            label, order = labels[i]
+            if not label.startswith(prefix):
+                break
+            items.append(self._by_order[order])
+        return items
+
+    def similarItems(self, item: QGraphicsItem, attributes: Iterable[str]) -> list[QGraphicsItem]:
+        """
+        指定の属性がすべて一致するアイテムを取得（item自身を含む）
+
+        最も件数の少ない属性の集合から他の属性の集合に含まれるものを選ぶため、
+        計算量は結果（の候補）の件数に比例する。
+        itemが持たない属性（RegionItem以外のラベルなど）は条件から除く。
+
+        Args:
+            item: 基準のアイテム
+            attributes: 一致させる属性（ATTRIBUTES のいずれか）
+
+        Returns:
+            登録順に並んだアイテムのリスト
+        """
+        return self.itemsMatching(self.keys(item, attributes))
+
+    def keys(self, item: QGraphicsItem, attributes: Iterable[str]) -> tuple[tuple[str, Hashable], ...]:
+        """
+        指定の属性の索引キー（itemが持たない属性は除く）
+
+        Returns:
+            (属性, キー) のタプル。同じキーのアイテムは similarItems() の結果も同じになる
+        """
+        self._flush()
+        keys = []
+        for attribute in attributes:
+            key = self.key(item, attribute)
+            if key is not None:
+                keys.append((attribute, key))
+        return tuple(keys)
+
+    def itemsMatching(self, keys: Iterable[tuple[str, Hashable]]) -> list[QGraphicsItem]:
+        """
+        属性の索引キーがすべて一致するアイテムを取得
+
+        Args:
+            keys: keys() が返す (属性, キー) の並び
+
+        Returns:
+            登録順に並んだアイテムのリスト（条件がない場合は空）
+        """
+        self._flush()
+        groups = [self._hash[attribute].get(key, set()) for attribute, key in keys]
+        if not groups:
+            return []
+        groups.sort(key=len)
+        smallest, others = groups[0], groups[1:]
+        return self._sorted(candidate for candidate in smallest
+                            if all(candidate in group for group in others))
+
+    def _sorted(self, items: Iterable[QGraphicsItem]) -> list[QGraphicsItem]:
+        return sorted(items, key=self._order.__getitem__)
+
+    def _flush(self) -> None:
+        """属性が変わったアイテムの索引を更新"""
+        if not self._dirty:
+            return
+        dirty = self._dirty
+        self._dirty = set()
+        for item in dirty:
+            self._reindex(item)
+
+    def _reindex(self, item: QGraphicsItem) -> None:
+        keys = self._keys[item]
+        for attribute in ATTRIBUTES:
+            key = attributeKey(item, attribute, self.size_bucket)
+            old_key = keys[attribute]
+            if key == old_key:
+                continue
+            self._unindex(item, attribute, old_key)
+            keys[attribute] = key
+            if key is None:
+                continue
+            self._hash[attribute].setdefault(key, set()).add(item)
+            if attribute == 'label':
+                bisect.insort(self._labels, (key, self._order[item]))
+
+    def _unindex(self, item: QGraphicsItem, attribute: str, key: Hashable | None) -> None:
+        if key is None:
+            return
+        table = self._hash[attribute]
+        group = table.get(key)
+        if group is None or item not in group:
+            return
+        group.discard(item)
+        if not group:
+            del table[key]
+        if attribute == 'label':
+            entry = (key, self._order[item])
+            i = bisect.bisect_left(self._labels, entry)
+            if i < len(self._labels) and self._labels[i] == entry:
+                del self._labels[i]
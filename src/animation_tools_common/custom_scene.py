@@ -1,33 +1,262 @@
-from PySide6.QtCore import Qt, QObject, QPointF, QRectF, QRect
+from PySide6.QtCore import Qt, QObject, QPointF, QRectF, QRect, QTimer
 from PySide6.QtGui import QPen, QColor, QKeyEvent, QIcon, QAction, QKeySequence, QPainter
 from PySide6.QtWidgets import QGraphicsScene, QGraphicsItem, QGraphicsRectItem, QGraphicsSceneMouseEvent, QToolBar, QVBoxLayout
-from typing import Type, Dict, Optional, Callable
+from typing import Any, Type, Dict, Optional, Callable, Iterable
+from dataclasses import dataclass
+import time
 
-from .actions.align_actions import AlignLeftAction, AlignCenterAction, AlignRightAction, AlignTopAction, AlignVerticalCenterAction, AlignBottomAction, DistributeHorizontallyAction, DistributeVerticallyAction, DistributeTiledAction
-from .actions.delete_action import DeleteAction
-from .actions.duplicate_action import DuplicateAction
 from .tools.base_tool import BaseTool
-from .tools.region_tool import RegionTool
 from .transform_rect_item import TransformRectItem
+from .helper_items import HELPER_ITEM_TYPES
+from .spatial_index import SpatialIndex
+from .attribute_index import AttributeIndex
+from .selection import SelectionBounds, SelectionCache, batchSelection, selectAll
+from .selection_sets import SelectionSets
 from .actions.base_action import BaseAction
-from .actions.align_size_actions import AlignMinSizeAction, AlignMaxSizeAction, AlignMiddleSizeAction, AlignAverageWidthAction, AlignMinWidthAction, AlignMaxWidthAction, AlignAverageHeightAction, AlignMinHeightAction, AlignMaxHeightAction
+
+@dataclass
+class ItemIndexPolicy:
+    """
+    アイテムインデックス（items(rect)やitemAtの検索に使われるQtの空間インデックス）の切り替え方針
+
+    mode:
+        'none': 常にインデックスなし（線形探索）
+        'bsp': 常にBSPツリーを使用
+        'adaptive': アイテム数が多い静的なシーンではBSPツリーを使い、
+                    多数のアイテムを高頻度で動かすドラッグ中だけインデックスを外す
+    """
+    mode: str = 'adaptive'
+    min_items: int = 500        # adaptive時、このアイテム数以上でBSPツリーを使う
+    drag_items: int = 200       # ドラッグで動かすアイテムがこの数以上ならインデックスを外す候補
+    drag_rate: float = 20.0     # 1秒あたりの移動イベント数がこの値以上なら高頻度ドラッグとみなす
+    bsp_depth: int = 0          # BSPツリーの深さ（0の場合はQtが自動で決定）
+
+def _propertyAccessor(item: QGraphicsItem, name: str) -> tuple[str | None, str | None]:
+    """
+    プロパティの取得・設定に使うメソッド名
+
+    Returns:
+        (取得メソッド名, 設定メソッド名)。メソッドがなくPythonのプロパティ・属性として代入する場合は
+        (name, None)、プロパティを持たない場合は (None, None)
+    """
+    capitalized = name[0].upper() + name[1:]
+    if callable(getattr(item, 'set' + capitalized, None)):
+        for getter_name in (name, 'is' + capitalized):
+            if callable(getattr(item, getter_name, None)):
+                return getter_name, 'set' + capitalized
+    descriptor = getattr(type(item), name, None)
+    if isinstance(descriptor, property):
+        return (name, None) if descriptor.fset is not None else (None, None)
+    if hasattr(item, name) and not callable(getattr(item, name)):
+        return name, None
+    return None, None
+
 
 class CustomScene(QGraphicsScene):
     """拡張可能なカスタムシーン"""
+
     def __init__(self, parent: QObject | None = None):
         super().__init__(parent)
         self.tools: Dict[str, BaseTool] = {}
         self.active_tool: Optional[BaseTool] = None
+        # アクティブなツールより先にイベントを受け取るツール（優先度の高い順）
+        self._overlay_tools: list[tuple[int, int, BaseTool]] = []
+        self._overlay_seq = 0
         self.tool_actions: Dict[str, QAction] = {}  # 追加：ツールアクションの管理
         self.scene_actions: Dict[str, QAction] = {}  # 追加：シーンアクション用の辞書
         # self._active_item: Optional[QGraphicsItem] = None  # アクティブアイテムを保持
         # self._active_item_pen = QPen(QColor(0, 255, 0), 2, Qt.PenStyle.DashLine)  # アクティブアイテムの枠線スタイル
+        self.index_policy = ItemIndexPolicy()
+        # アイテム数が変わった後のインデックス方式の再判定（まとめて追加した場合も1回だけ行う）
+        self._index_method_stale = False
+        self._index_method_timer = QTimer(self)
+        self._index_method_timer.setSingleShot(True)
+        self._index_method_timer.setInterval(0)
+        self._index_method_timer.timeout.connect(self._applyPendingIndexMethod)
+        self._drag_start_time: float | None = None
+        self._drag_moves = 0
+        self._drag_item_count = 0
+        self._drag_unindexed = False
+        self._dragged_items: list[QGraphicsItem] | None = None  # ドラッグで動いているアイテム（移動の開始まではNone）
+        self.spatial_index = SpatialIndex()  # 選択可能なトップレベルアイテムの空間インデックス
+        self.attribute_index = AttributeIndex()  # 種類・サイズ・ラベルなどによる索引（類似選択用）
+        self._selection_cache = SelectionCache(self)
+        self.selection_bounds = SelectionBounds(self)  # 選択アイテム全体の矩形（変形矩形の表示用）
+        self.selection_sets = SelectionSets(self)  # 名前付きの選択セット
         self._setup()
     
     def _setup(self):
         """初期設定"""
         # 選択可能なアイテムのデフォルト設定
         self.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
+        self._applyStaticIndexMethod()
+
+    def setIndexPolicy(self, policy: ItemIndexPolicy) -> None:
+        """
+        アイテムインデックスの切り替え方針を設定
+
+        Args:
+            policy: インデックスの方針としきい値
+        """
+        if policy.mode not in ('none', 'bsp', 'adaptive'):
+            raise ValueError(f"Unknown index mode '{policy.mode}'")
+        self.index_policy = policy
+        self._applyStaticIndexMethod()
+
+    def _staticIndexMethod(self) -> QGraphicsScene.ItemIndexMethod:
+        """ドラッグしていない時に使うインデックス方式を判定"""
+        mode = self.index_policy.mode
+        # 子アイテムや削除されたアイテムも正しく数えるため、アイテム数は判定する時に数える
+        if mode == 'bsp' or (mode == 'adaptive' and len(self.items()) >= self.index_policy.min_items):
+            return QGraphicsScene.ItemIndexMethod.BspTreeIndex
+        return QGraphicsScene.ItemIndexMethod.NoIndex
+
+    def _applyStaticIndexMethod(self) -> None:
+        """静的なシーン向けのインデックス方式を適用（変化がない場合は何もしない）"""
+        self._index_method_stale = False
+        self._index_method_timer.stop()
+        method = self._staticIndexMethod()
+        if method == QGraphicsScene.ItemIndexMethod.BspTreeIndex and self.bspTreeDepth() != self.index_policy.bsp_depth:
+            self.setBspTreeDepth(self.index_policy.bsp_depth)
+        if self.itemIndexMethod() != method:
+            self.setItemIndexMethod(method)
+
+    def _scheduleIndexMethodUpdate(self) -> None:
+        """アイテム数が変わった時、イベントループに戻った時点でインデックス方式を再判定"""
+        if self.index_policy.mode != 'adaptive':
+            return
+        self._index_method_stale = True
+        if self._drag_start_time is None:
+            self._index_method_timer.start()
+
+    def _applyPendingIndexMethod(self) -> None:
+        """予約されたインデックス方式の再判定（ドラッグ中は終了時まで遅らせる）"""
+        if self._index_method_stale and self._drag_start_time is None:
+            self._applyStaticIndexMethod()
+
+    def _beginDragIndexTracking(self) -> None:
+        """ドラッグ開始時に移動頻度の計測を開始"""
+        self._drag_start_time = time.perf_counter()
+        self._drag_moves = 0
+        self._drag_unindexed = False
+        # 選択アイテムを動かすツールの場合のみ、動くアイテム数として選択数を使う
+        if self.active_tool and self.active_tool.moves_selection:
+            self._drag_item_count = len(self.cachedSelectedItems())
+        else:
+            self._drag_item_count = 0
+
+    def _updateDragIndex(self) -> None:
+        """多数のアイテムを高頻度で動かしている場合、ドラッグ中はインデックスを外す"""
+        if self._drag_start_time is None or self._drag_unindexed or self.index_policy.mode != 'adaptive':
+            return
+        if self._drag_item_count < self.index_policy.drag_items:
+            return
+        if self.active_tool and not self.active_tool.moves_selection:
+            # ドラッグ中に選択アイテムを動かさなくなった（プレビュー中など）
+            return
+        if self.itemIndexMethod() == QGraphicsScene.ItemIndexMethod.NoIndex:
+            return
+
+        self._drag_moves += 1
+        elapsed = time.perf_counter() - self._drag_start_time
+        if self._drag_moves >= 3 and elapsed > 0 and self._drag_moves / elapsed >= self.index_policy.drag_rate:
+            # 移動のたびにBSPツリーを更新するより、解放時に一度だけ再構築する方が安い
+            self.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
+            self._drag_unindexed = True
+
+    def _endDragIndexTracking(self) -> None:
+        """ドラッグ終了時、外していたインデックスを再構築"""
+        if self._drag_unindexed or self._index_method_stale:
+            self._applyStaticIndexMethod()
+        self._drag_start_time = None
+        self._drag_unindexed = False
+
+    def addItem(self, item: QGraphicsItem) -> None:
+        is_new = item.scene() is not self
+        super().addItem(item)
+        # 補助アイテム（ドラッグ中だけ追加するグループなど）ではアイテム数を数え直さない
+        if is_new and not isinstance(item, HELPER_ITEM_TYPES):
+            self._scheduleIndexMethodUpdate()
+            if self._isIndexable(item):
+                self.spatial_index.insert(item)
+                self.attribute_index.insert(item)
+
+    def removeItem(self, item: QGraphicsItem) -> None:
+        was_member = item.scene() is self
+        super().removeItem(item)
+        if was_member and not isinstance(item, HELPER_ITEM_TYPES):
+            self._scheduleIndexMethodUpdate()
+            self.spatial_index.remove(item)
+            self.attribute_index.remove(item)
+            self.selection_sets.forget(item)
+
+    def clear(self) -> None:
+        super().clear()
+        self.spatial_index.clear()
+        self.attribute_index.clear()
+        self.selection_sets.clear()
+        self.selection_bounds.clear()
+        self._applyStaticIndexMethod()
+
+    @staticmethod
+    def _isIndexable(item: QGraphicsItem) -> bool:
+        """空間インデックスの対象（補助アイテム以外のトップレベルアイテム）かどうか"""
+        # parentItem()はトップレベルのアイテムでラッパーを破棄してしまうため使わない
+        return item.topLevelItem() is item and not isinstance(item, HELPER_ITEM_TYPES)
+
+    def batchSelection(self):
+        """
+        ブロック内の選択変更を1回のselectionChangedにまとめるコンテキストマネージャ
+
+        ブロック中はシーンのシグナルを止めるため、接続先は終了時に1回だけ呼ばれる。
+
+        使用例:
+            with scene.batchSelection():
+                for item in items:
+                    item.setSelected(True)
+        """
+        return batchSelection(self)
+
+    def selectAll(self) -> None:
+        """選択可能なアイテムをすべて選択"""
+        selectAll(self)
+
+    def storeSelectionSet(self, name: str) -> None:
+        """現在の選択を名前付きの選択セットとして保存"""
+        self.selection_sets.store(name)
+
+    def recallSelectionSet(self, name: str, add: bool = False) -> None:
+        """名前付きの選択セットのアイテムを選択（addがTrueの場合は現在の選択に追加）"""
+        self.selection_sets.recall(name, add)
+
+    def cachedSelectedItems(self) -> tuple[QGraphicsItem, ...]:
+        """選択アイテム（selectionChangedまでキャッシュされる。順序も変更があるまで固定）"""
+        return self._selection_cache.items()
+
+    def notifyGeometryChanged(self, items: QGraphicsItem | Iterable[QGraphicsItem]) -> None:
+        """
+        アイテムの位置・形状・変形の変更を空間インデックスと属性の索引に通知
+
+        RegionItem は itemChange() で自身の変更を通知する。それ以外のアイテムを動かした場合は、
+        ツールやアクションなど動かした側がこのメソッドを呼ぶ。
+
+        Args:
+            items: ジオメトリが変わったアイテム
+        """
+        if not isinstance(items, QGraphicsItem):
+            items = list(items)
+        self.spatial_index.markDirty(items)
+        self.attribute_index.markDirty(items)
+        self.selection_bounds.markDirty(items)
+
+    def notifyAttributesChanged(self, items: QGraphicsItem | Iterable[QGraphicsItem]) -> None:
+        """
+        アイテムのラベル・色など（ジオメトリ以外）の変更を属性の索引に通知
+
+        Args:
+            items: 属性が変わったアイテム
+        """
+        self.attribute_index.markDirty(items)
     
     def registerTool(self, key: str, tool: BaseTool | Type[BaseTool]) -> None:
         """
@@ -80,6 +309,59 @@ class CustomScene(QGraphicsScene):
     def getActiveTool(self) -> Optional[BaseTool]:
         """現在アクティブなツールを取得"""
         return self.active_tool
+
+    def addOverlayTool(self, tool: BaseTool, priority: int = 0) -> None:
+        """
+        アクティブなツールより先にイベントを受け取るツールを追加
+
+        パン操作のように、アクティブなツールを切り替えずに重ねて使うツールに使う。
+        イベントは優先度の高い順（同じ優先度では追加順）に渡され、
+        ツールがTrueを返した時点でそれ以降のツールとQGraphicsScene標準の処理は行わない。
+
+        Args:
+            tool: 追加するツールのインスタンス
+            priority: 優先度（大きいほど先にイベントを受け取る）
+        """
+        if not isinstance(tool, BaseTool):
+            raise TypeError("tool must be an instance of BaseTool or its subclass")
+        self.removeOverlayTool(tool)
+        self._overlay_tools.append((priority, self._overlay_seq, tool))
+        self._overlay_seq += 1
+        self._overlay_tools.sort(key=lambda entry: (-entry[0], entry[1]))
+        tool.activate()
+
+    def removeOverlayTool(self, tool: BaseTool) -> None:
+        """
+        重ねて使うツールを削除
+
+        Args:
+            tool: 削除するツールのインスタンス（未追加の場合は何もしない）
+        """
+        for index, (_, _, overlay) in enumerate(self._overlay_tools):
+            if overlay is tool:
+                del self._overlay_tools[index]
+                tool.deactivate()
+                return
+
+    def overlayTools(self) -> list[BaseTool]:
+        """重ねて使うツール（イベントを受け取る順）"""
+        return [tool for _, _, tool in self._overlay_tools]
+
+    def _dispatchToTools(self, handler_name: str, event: QGraphicsSceneMouseEvent | QKeyEvent) -> bool:
+        """
+        重ねたツール、アクティブなツールの順にイベントを渡す
+
+        Returns:
+            いずれかのツールがイベントを処理した場合はTrue（イベントは受理済みになる）
+        """
+        for _, _, tool in self._overlay_tools:
+            if getattr(tool, handler_name)(event):
+                event.accept()
+                return True
+        if self.active_tool and getattr(self.active_tool, handler_name)(event):
+            event.accept()
+            return True
+        return False
     
     def removeTool(self, key: str) -> None:
         """
@@ -102,32 +384,72 @@ class CustomScene(QGraphicsScene):
         # if clicked_item:
         #     self.setActiveItem(clicked_item)
 
-        if self.active_tool:
-            self.active_tool.mousePressEvent(event)
+        if event.button() == Qt.MouseButton.LeftButton:
+            self._beginDragIndexTracking()
+        # ツールが処理した場合は、Qt標準の当たり判定・アイテムへの配送を行わない
+        if self._dispatchToTools('mousePressEvent', event):
+            return
         super().mousePressEvent(event)
     
     def mouseMoveEvent(self, event: QGraphicsSceneMouseEvent) -> None:
         """マウス移動イベントの処理"""
-        if self.active_tool:
-            self.active_tool.mouseMoveEvent(event)
+        if event.buttons() & Qt.MouseButton.LeftButton:
+            self._updateDragIndex()
+        if self._dispatchToTools('mouseMoveEvent', event):
+            return
         super().mouseMoveEvent(event)
+        self._trackDraggedItems()
     
     def mouseReleaseEvent(self, event: QGraphicsSceneMouseEvent) -> None:
         """マウスリリースイベントの処理"""
-        if self.active_tool:
-            self.active_tool.mouseReleaseEvent(event)
-        super().mouseReleaseEvent(event)
+        try:
+            if self._dispatchToTools('mouseReleaseEvent', event):
+                return
+            super().mouseReleaseEvent(event)
+        finally:
+            if event.button() == Qt.MouseButton.LeftButton:
+                self._flushDraggedItems()
+                self._endDragIndexTracking()
+
+    def _trackDraggedItems(self) -> None:
+        """
+        移動可能なアイテムのドラッグが始まった時に、動くアイテムを空間インデックスに一度だけ通知
+
+        動くアイテムは検索のたびに再登録され、マウスのリリース時に各索引へまとめて通知される
+        （移動イベントごとに選択アイテム全体を通知しない）。
+        """
+        if self._dragged_items is not None:
+            return
+        grabber = self.mouseGrabberItem()
+        if grabber is None or not grabber.flags() & QGraphicsItem.GraphicsItemFlag.ItemIsMovable:
+            return
+        items = [grabber]
+        # Qt標準の移動・TransformToolによる変形はどちらも選択アイテムを動かす
+        # （補助アイテムのドラッグで、ツールが選択アイテムを動かさない場合を除く）
+        if not (isinstance(grabber, HELPER_ITEM_TYPES) and self.active_tool and not self.active_tool.moves_selection):
+            items.extend(self.cachedSelectedItems())
+        self._dragged_items = items
+        self.spatial_index.setMoving(items)
+
+    def _flushDraggedItems(self) -> None:
+        """ドラッグで動いたアイテムを各索引に通知"""
+        items = self._dragged_items
+        if items is None:
+            return
+        self._dragged_items = None
+        self.spatial_index.setMoving(())
+        self.notifyGeometryChanged(items)
     
     def keyPressEvent(self, event: QKeyEvent) -> None:
         """キープレスイベントの処理"""
-        if self.active_tool:
-            self.active_tool.keyPressEvent(event)
+        if self._dispatchToTools('keyPressEvent', event):
+            return
         super().keyPressEvent(event)
     
     def keyReleaseEvent(self, event: QKeyEvent) -> None:
         """ーリリースイベントの処理"""
-        if self.active_tool:
-            self.active_tool.keyReleaseEvent(event)
+        if self._dispatchToTools('keyReleaseEvent', event):
+            return
         super().keyReleaseEvent(event)
 
     def importItem(self, item: QGraphicsItem) -> None:
@@ -255,18 +577,110 @@ class CustomScene(QGraphicsScene):
 
 
     def setItemFlags(self, flag: QGraphicsItem.GraphicsItemFlag, enabled: bool) -> None:
-        """シーン内の全アイテムのフラグを設定"""
-        for item in self.items():
-            item.setFlag(flag, enabled)
+        """シーン内の全アイテム（子アイテム・補助アイテムを含む）のフラグを設定"""
+        self.bulkUpdateItems(flags={flag: enabled}, items=self.items())
+
+    def bulkUpdateItems(self,
+                        flags: Dict[QGraphicsItem.GraphicsItemFlag, bool] | None = None,
+                        properties: Dict[str, Any] | None = None,
+                        item_types: type | tuple[type, ...] | None = None,
+                        z_range: tuple[float, float] | None = None,
+                        region: QRectF | None = None,
+                        items: Iterable[QGraphicsItem] | None = None) -> list[QGraphicsItem]:
+        """
+        条件に合うアイテムのフラグ・プロパティをまとめて変更
+
+        対象は補助アイテム（変形矩形・選択範囲）を除くトップレベルアイテム（itemsを指定した場合はそのアイテム）。
+        値が変わらないアイテムには何もせず、選択の変更通知は最後に1回だけ行う。
+
+        Args:
+            flags: 設定するフラグと有効/無効
+            properties: 設定するプロパティ名と値（'opacity' -> opacity()/setOpacity()、
+                'visible' -> isVisible()/setVisible() のように対応するメソッドで取得・設定する。
+                メソッドがない場合はPythonのプロパティ・属性として代入する。
+                どちらも持たない種類のアイテムには設定しない）
+            item_types: 対象とするアイテムのクラス
+            z_range: 対象とするZ値の範囲（両端を含む）
+            region: 対象とするシーン上の範囲（範囲と重なるアイテムを空間インデックスで検索）
+            items: 対象とするアイテム（regionと同時には指定できない）
+
+        Returns:
+            変更されたアイテムのリスト
+        """
+        if items is not None:
+            if region is not None:
+                raise ValueError("region and items cannot be specified together")
+            candidates = list(items)
+        elif region is not None:
+            candidates = self.spatial_index.itemsInRect(region, selectable_only=False)
+        else:
+            candidates = self.spatial_index.items()
+        if item_types is not None:
+            candidates = [item for item in candidates if isinstance(item, item_types)]
+        if z_range is not None:
+            z_min, z_max = z_range
+            candidates = [item for item in candidates if z_min <= item.zValue() <= z_max]
+
+        set_mask = QGraphicsItem.GraphicsItemFlag(0)
+        clear_mask = QGraphicsItem.GraphicsItemFlag(0)
+        for flag, enabled in (flags or {}).items():
+            if enabled:
+                set_mask |= flag
+            else:
+                clear_mask |= flag
+        properties = properties or {}
+        # アイテムの型ごとのプロパティの取得・設定方法（同じ型のアイテムでは1回だけ調べる）
+        accessors: dict[type, list[tuple[str, str | None, str | None, Any]]] = {}
+
+        changed: list[QGraphicsItem] = []
+        # 選択不可・非表示にすると選択が外れるため、選択の変更通知もまとめる
+        # （再描画はQtがイベントループに戻った時点でまとめて1回行う）
+        with batchSelection(self):
+            for item in candidates:
+                item_changed = False
+                current = item.flags()
+                new_flags = (current | set_mask) & ~clear_mask
+                if new_flags != current:
+                    item.setFlags(new_flags)
+                    item_changed = True
+                if properties:
+                    item_accessors = accessors.get(type(item))
+                    if item_accessors is None:
+                        item_accessors = accessors[type(item)] = [
+                            (name, *_propertyAccessor(item, name), value) for name, value in properties.items()]
+                    for name, getter_name, setter_name, value in item_accessors:
+                        if getter_name is None:
+                            # このプロパティを持たない種類のアイテム
+                            continue
+                        if setter_name is None:
+                            # Pythonのプロパティ・属性
+                            if getattr(item, name) != value:
+                                setattr(item, name, value)
+                                item_changed = True
+                        elif getattr(item, getter_name)() != value:
+                            getattr(item, setter_name)(value)
+                            item_changed = True
+                if item_changed:
+                    changed.append(item)
+        if properties and changed:
+            # 位置・変形などのプロパティが変わった可能性があるため空間インデックスに通知
+            self.notifyGeometryChanged(changed)
+        return changed
 
 
 if __name__ == '__main__':
     from PySide6.QtWidgets import (QApplication, QGraphicsView, QMainWindow, 
                                  QListWidget, QHBoxLayout, QWidget)
     from PySide6.QtGui import QPainter
-    from common.src.tools.select_tool import SelectTool
-    from common.src.tools.transform_tool import TransformTool
     from PySide6.QtWidgets import QGraphicsRectItem
+    from .tools.select_tool import SelectTool
+    from .tools.transform_tool import TransformTool
+    from .tools.region_tool import RegionTool
+    from .actions.align_actions import AlignLeftAction, AlignCenterAction, AlignRightAction, AlignTopAction, AlignVerticalCenterAction, AlignBottomAction, DistributeHorizontallyAction, DistributeVerticallyAction, DistributeTiledAction
+    from .actions.delete_action import DeleteAction
+    from .actions.duplicate_action import DuplicateAction
+    from .actions.select_similar_actions import SelectSimilarAction, SelectSameLabelPrefixAction, SelectSameColorAction
+    from .actions.align_size_actions import AlignMinSizeAction, AlignMaxSizeAction, AlignMiddleSizeAction, AlignAverageWidthAction, AlignMinWidthAction, AlignMaxWidthAction, AlignAverageHeightAction, AlignMinHeightAction, AlignMaxHeightAction
 
     class MainWindow(QMainWindow):
         def __init__(self):
@@ -349,6 +763,10 @@ if __name__ == '__main__':
             scene.registerAction(AlignAverageHeightAction)
             scene.registerAction(AlignMinHeightAction)
             scene.registerAction(AlignMaxHeightAction)
+            # 類似選択アクション
+            scene.registerAction(SelectSimilarAction)
+            scene.registerAction(SelectSameLabelPrefixAction)
+            scene.registerAction(SelectSameColorAction)
 
 
 
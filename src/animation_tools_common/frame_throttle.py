@@ -0,0 +1,57 @@
+"""
+入力イベントに応じた処理を1フレームに1回にまとめる仕組み
+
+高頻度のマウスやタブレットは1フレームの間に複数の移動イベントを送るため、
+イベントごとに多数のアイテムを更新すると描画が追いつかなくなる。
+最初の要求はすぐに処理し、その後フレーム間隔が経つまでの要求は最後の1回にまとめて処理する。
+"""
+from typing import Callable
+
+from PySide6.QtCore import QObject, QTimer
+
+
+class FrameThrottle(QObject):
+    """要求された処理を、フレーム間隔あたり最大1回だけ実行する"""
+
+    # 約60fps
+    FRAME_INTERVAL_MS = 16
+
+    def __init__(self, callback: Callable[[], None], interval_ms: int | None = None, parent: QObject | None = None):
+        super().__init__(parent)
+        self._callback = callback
+        self._pending = False
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.FRAME_INTERVAL_MS if interval_ms is None else interval_ms)
+        self._timer.timeout.connect(self._onTimeout)
+
+    def isPending(self) -> bool:
+        """まだ実行していない要求があるか"""
+        return self._pending
+
+    def request(self) -> None:
+        """処理を要求（前回の実行からフレーム間隔が経っていなければ次のフレームまで待つ）"""
+        if self._timer.isActive():
+            self._pending = True
+            return
+        self._callback()
+        self._timer.start()
+
+    def flush(self) -> None:
+        """待っている要求があればすぐに実行"""
+        self._timer.stop()
+        if self._pending:
+            self._pending = False
+            self._callback()
+
+    def cancel(self) -> None:
+        """待っている要求を破棄"""
+        self._timer.stop()
+        self._pending = False
+
+    def _onTimeout(self) -> None:
+        if self._pending:
+            self._pending = False
+            self._callback()
+            # 実行した場合は次のフレームまで再び待つ
+            self._timer.start()
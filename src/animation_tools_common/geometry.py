@@ -0,0 +1,174 @@
+"""
+選択範囲の判定に使う幾何計算
+
+多数のアイテムをまとめて判定するため、座標はNumPy配列で受け取る。
+四角形（quad）は (N, 4, 2) の配列で、各アイテムの四隅を周回順に並べたもの。
+多角形は (M, 2) の頂点配列で、最後の頂点と最初の頂点は自動的に結ばれる。
+矩形は (左, 上, 右, 下) のタプル。
+"""
+import numpy as np
+
+
+def pointsInPolygon(points: np.ndarray, polygon: np.ndarray) -> np.ndarray:
+    """
+    点が多角形の内側にあるかを判定（偶奇規則）
+
+    点をy座標でソートしておき、多角形の各辺についてその辺のy範囲にある点だけを調べるため、
+    計算量は 点数 × 水平線と交わる辺の数 程度になる。
+
+    Args:
+        points: (N, 2) の点の配列
+        polygon: (M, 2) の頂点配列
+
+    Returns:
+        (N,) のbool配列
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    polygon = np.asarray(polygon, dtype=float).reshape(-1, 2)
+    inside = np.zeros(len(points), dtype=bool)
+    if len(points) == 0 or len(polygon) < 3:
+        return inside
+
+    order = np.argsort(points[:, 1], kind='stable')
+    xs = points[order, 0]
+    ys = points[order, 1]
+    starts = polygon
+    ends = np.roll(polygon, -1, axis=0)
+    # 辺と交差する点は min(y) <= y < max(y) の範囲（水平な辺は範囲が空になる）
+    lows = np.searchsorted(ys, np.minimum(starts[:, 1], ends[:, 1]), side='left')
+    highs = np.searchsorted(ys, np.maximum(starts[:, 1], ends[:, 1]), side='left')
+
+    flipped = np.zeros(len(points), dtype=bool)
+    for i in np.nonzero(highs > lows)[0]:
+        lo, hi = lows[i], highs[i]
+        (x0, y0), (x1, y1) = starts[i], ends[i]
+        # 点から右に伸ばした半直線が辺と交わるか
+        x_cross = x0 + (ys[lo:hi] - y0) * (x1 - x0) / (y1 - y0)
+        flipped[lo:hi] ^= xs[lo:hi] < x_cross
+    inside[order] = flipped
+    return inside
+
+
+def quadsInPolygon(quads: np.ndarray, polygon: np.ndarray, contains: bool = False) -> np.ndarray:
+    """
+    四角形が多角形に含まれる（または交わる）かを判定
+
+    Args:
+        quads: (N, 4, 2) の四角形の配列（凸四角形）
+        polygon: (M, 2) の頂点配列
+        contains: Trueの場合は四角形全体が多角形の内側にあるもの、
+            Falseの場合は多角形と少しでも重なるものを対象とする
+
+    Returns:
+        (N,) のbool配列
+    """
+    quads = np.asarray(quads, dtype=float).reshape(-1, 4, 2)
+    polygon = np.asarray(polygon, dtype=float).reshape(-1, 2)
+    if len(quads) == 0 or len(polygon) < 3:
+        return np.zeros(len(quads), dtype=bool)
+
+    corners_inside = pointsInPolygon(quads.reshape(-1, 2), polygon).reshape(-1, 4)
+    if contains:
+        # 四隅が内側にあっても、多角形の輪郭が四角形に入り込んでいれば含まれない
+        result = corners_inside.all(axis=1)
+        candidates = np.nonzero(result)[0]
+        result[candidates] = ~_outlineTouchesQuads(polygon, quads[candidates])
+    else:
+        # 四隅がすべて外側でも、多角形の輪郭が四角形を通っていれば重なる
+        result = corners_inside.any(axis=1)
+        candidates = np.nonzero(~result)[0]
+        result[candidates] = _outlineTouchesQuads(polygon, quads[candidates])
+    return result
+
+
+def _cross(origin: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """origin→a と origin→b の外積（z成分）"""
+    return ((a[..., 0] - origin[..., 0]) * (b[..., 1] - origin[..., 1])
+            - (a[..., 1] - origin[..., 1]) * (b[..., 0] - origin[..., 0]))
+
+
+def _outlineTouchesQuads(polygon: np.ndarray, quads: np.ndarray) -> np.ndarray:
+    """多角形の輪郭（辺）が四角形に触れるかを判定"""
+    touches = np.zeros(len(quads), dtype=bool)
+    if len(quads) == 0:
+        return touches
+
+    quad_min = quads.min(axis=1)
+    quad_max = quads.max(axis=1)
+    # 四角形を上端のy座標でソートし、辺ごとにy範囲が重なりうる四角形だけを調べる
+    order = np.argsort(quad_min[:, 1], kind='stable')
+    sorted_top = quad_min[order, 1]
+    max_height = float((quad_max[:, 1] - quad_min[:, 1]).max())
+
+    starts = polygon
+    ends = np.roll(polygon, -1, axis=0)
+    seg_min = np.minimum(starts, ends)
+    seg_max = np.maximum(starts, ends)
+    lows = np.searchsorted(sorted_top, seg_min[:, 1] - max_height, side='left')
+    highs = np.searchsorted(sorted_top, seg_max[:, 1], side='right')
+
+    for i in np.nonzero(highs > lows)[0]:
+        index = order[lows[i]:highs[i]]
+        index = index[~touches[index]
+                      & (quad_max[index, 1] >= seg_min[i, 1])
+                      & (quad_min[index, 0] <= seg_max[i, 0])
+                      & (quad_max[index, 0] >= seg_min[i, 0])]
+        if len(index):
+            touches[index] = _segmentTouchesQuads(starts[i], ends[i], quads[index])
+    return touches
+
+
+def _segmentTouchesQuads(p: np.ndarray, q: np.ndarray, quads: np.ndarray) -> np.ndarray:
+    """線分pqが各四角形に触れるか（端点が内側にある、または辺と交差する）を判定"""
+    edge_starts = quads
+    edge_ends = np.roll(quads, -1, axis=1)
+
+    side_p = _cross(edge_starts, edge_ends, p)
+    side_q = _cross(edge_starts, edge_ends, q)
+    # 凸四角形の内側の点は、すべての辺に対して同じ側にある
+    p_inside = (side_p >= 0).all(axis=1) | (side_p <= 0).all(axis=1)
+    q_inside = (side_q >= 0).all(axis=1) | (side_q <= 0).all(axis=1)
+
+    side_start = _cross(p, q, edge_starts)
+    side_end = _cross(p, q, edge_ends)
+    # 同一直線上で離れている線分を除くため、外接矩形の重なりも条件にする
+    boxes_overlap = ((np.minimum(edge_starts, edge_ends) <= np.maximum(p, q)).all(axis=2)
+                     & (np.maximum(edge_starts, edge_ends) >= np.minimum(p, q)).all(axis=2))
+    crosses = (side_p * side_q <= 0) & (side_start * side_end <= 0) & boxes_overlap
+    return p_inside | q_inside | crosses.any(axis=1)
+
+
+def quadsInRect(quads: np.ndarray, rect: tuple[float, float, float, float], contains: bool = False) -> np.ndarray:
+    """
+    回転した四角形が軸に平行な矩形に含まれる（または交わる）かを判定
+
+    交差は分離軸定理で判定する。矩形のx軸・y軸と四角形の2辺の法線の4軸すべてで
+    射影が重なる場合に交差とする（接する場合を含む）。
+
+    Args:
+        quads: (N, 4, 2) の四角形の配列（回転・せん断した矩形など平行四辺形であること）
+        rect: 矩形の (左, 上, 右, 下)
+        contains: Trueの場合は四角形全体が矩形の内側にあるもの、
+            Falseの場合は矩形と少しでも重なるものを対象とする
+
+    Returns:
+        (N,) のbool配列
+    """
+    quads = np.asarray(quads, dtype=float).reshape(-1, 4, 2)
+    left, top, right, bottom = rect
+    quad_min = quads.min(axis=1)
+    quad_max = quads.max(axis=1)
+    if contains:
+        return ((quad_min[:, 0] >= left) & (quad_max[:, 0] <= right)
+                & (quad_min[:, 1] >= top) & (quad_max[:, 1] <= bottom))
+
+    result = ((quad_min[:, 0] <= right) & (quad_max[:, 0] >= left)
+              & (quad_min[:, 1] <= bottom) & (quad_max[:, 1] >= top))
+    rect_corners = np.array([(left, top), (right, top), (right, bottom), (left, bottom)], dtype=float)
+    for edge in (quads[:, 1] - quads[:, 0], quads[:, 3] - quads[:, 0]):
+        normal = np.stack((-edge[:, 1], edge[:, 0]), axis=1)
+        quad_proj = np.einsum('nkd,nd->nk', quads, normal)
+        rect_proj = normal @ rect_corners.T
+        result &= ((quad_proj.min(axis=1) <= rect_proj.max(axis=1))
+                   & (rect_proj.min(axis=1) <= quad_proj.max(axis=1)))
+    return result
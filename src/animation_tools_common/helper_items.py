@@ -0,0 +1,13 @@
+"""
+ツールが表示する補助アイテムの種類
+
+変形矩形・選択範囲・変形のプレビューなど、ツールがシーンに追加する補助アイテムは
+選択・整列・当たり判定・記録の対象外とする。シーンやツールに依存しないモジュールとして分けておき、
+当たり判定などのモジュールがシーンのモジュールを読み込まずに参照できるようにする。
+"""
+from .selection_path_item import SelectionPathItem
+from .transform_group_item import TransformGroupItem
+from .transform_preview_item import TransformPreviewItem
+from .transform_rect_item import TransformRectItem
+
+HELPER_ITEM_TYPES = (TransformRectItem, SelectionPathItem, TransformPreviewItem, TransformGroupItem)
@@ -0,0 +1,59 @@
+"""
+クリック位置のアイテムを求める当たり判定
+
+QGraphicsScene.itemAt() はカーソル下の全アイテム（選択範囲や変形矩形などの補助アイテムを含む）を
+重なり順に調べる。ここでは空間インデックスのセルに登録された候補だけを調べ、
+選択可能な補助アイテム以外のアイテムのうち最も手前にあるものを返す。
+
+空間インデックスが持つのはトップレベルアイテムの位置とZ値だけで、stackBefore() による重なり順や
+子アイテムは分からない。候補が1つに決まらない場合（同じZ値で重なっている、子アイテムを持つ）は
+Qtの検索で重なり順を判定する。ただし、親のバウンディング矩形の外にある子アイテムが
+別のアイテムに重なっている場合は検出できない。
+"""
+from typing import Optional
+
+from PySide6.QtCore import QPointF, Qt
+from PySide6.QtGui import QTransform
+from PySide6.QtWidgets import QGraphicsItem, QGraphicsScene, QGraphicsView
+
+from .helper_items import HELPER_ITEM_TYPES
+
+
+def topmostSelectableItemAt(scene: QGraphicsScene, pos: QPointF,
+                            view: Optional[QGraphicsView] = None) -> Optional[QGraphicsItem]:
+    """
+    指定位置で最も手前にある選択可能なアイテムを取得（補助アイテムは除く）
+
+    Args:
+        scene: 対象のシーン
+        pos: シーン座標
+        view: 操作されたビュー（ItemIgnoresTransformationsを持つアイテムの判定に使う）
+
+    Returns:
+        見つからない場合はNone（子アイテムが選択可能な場合は子アイテムを返す）
+    """
+    index = getattr(scene, 'spatial_index', None)
+    if index is not None:
+        candidates = index.itemsAt(pos)
+        if len(candidates) == 1:
+            topmost = candidates[0]
+        elif candidates:
+            top_z = max(item.zValue() for item in candidates)
+            topmost = [item for item in candidates if item.zValue() == top_z]
+            topmost = topmost[0] if len(topmost) == 1 else None
+        else:
+            # 空白部分（親のバウンディング矩形の外にある子アイテムはQtで探す）
+            topmost = None
+        if (topmost is not None and not topmost.childItems()
+                and not topmost.flags() & QGraphicsItem.GraphicsItemFlag.ItemIgnoresTransformations):
+            return topmost
+
+    # 空間インデックスがないシーン、重なり順が決まらない場合、またはビューの変換に依存するアイテムの場合はQtで判定
+    device_transform = view.transform() if view is not None else QTransform()
+    for item in scene.items(pos, Qt.ItemSelectionMode.IntersectsItemShape,
+                            Qt.SortOrder.DescendingOrder, device_transform):
+        if isinstance(item, HELPER_ITEM_TYPES):
+            continue
+        if item.flags() & QGraphicsItem.GraphicsItemFlag.ItemIsSelectable and item.isVisible():
+            return item
+    return None
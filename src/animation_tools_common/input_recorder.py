@@ -0,0 +1,283 @@
+import gzip
+import json
+import time
+from typing import Any, Callable
+
+from PySide6.QtCore import QObject, QEvent, QPointF, QRectF, Qt, QCoreApplication
+from PySide6.QtGui import QKeyEvent, QTransform
+from PySide6.QtWidgets import QGraphicsScene, QGraphicsItem, QGraphicsRectItem, QGraphicsSceneMouseEvent
+
+from .helper_items import HELPER_ITEM_TYPES
+
+FORMAT_VERSION = 1
+
+# 記録対象のイベント種別と、ファイル上での短縮コード
+_MOUSE_EVENT_CODES: dict[QEvent.Type, str] = {
+    QEvent.Type.GraphicsSceneMousePress: 'P',
+    QEvent.Type.GraphicsSceneMouseMove: 'M',
+    QEvent.Type.GraphicsSceneMouseRelease: 'R',
+    QEvent.Type.GraphicsSceneMouseDoubleClick: 'D',
+}
+_KEY_EVENT_CODES: dict[QEvent.Type, str] = {
+    QEvent.Type.KeyPress: 'K',
+    QEvent.Type.KeyRelease: 'k',
+}
+_MOUSE_EVENT_TYPES = {code: event_type for event_type, code in _MOUSE_EVENT_CODES.items()}
+_KEY_EVENT_TYPES = {code: event_type for event_type, code in _KEY_EVENT_CODES.items()}
+
+
+def _stackedTopLevelItems(scene: QGraphicsScene) -> list[QGraphicsItem]:
+    """補助アイテムを除くトップレベルアイテムを重なり順（奥から手前）で取得"""
+    # インデックスなしのシーンでは items(order) は並べ替えないため、範囲を指定して取得する
+    ordered = [item for item in scene.items(scene.itemsBoundingRect(),
+                                            Qt.ItemSelectionMode.IntersectsItemBoundingRect,
+                                            Qt.SortOrder.AscendingOrder)
+               if item.topLevelItem() is item and not isinstance(item, HELPER_ITEM_TYPES)]
+    # 大きさのないアイテムは範囲の検索に含まれないため、追加順で最後に加える
+    found = set(ordered)
+    ordered.extend(item for item in scene.items()
+                   if item.topLevelItem() is item and item not in found
+                   and not isinstance(item, HELPER_ITEM_TYPES))
+    return ordered
+
+
+def snapshot_scene(scene: QGraphicsScene) -> dict[str, Any]:
+    """
+    シーンの初期状態をJSON化可能な辞書として取得
+
+    補助アイテムを除くトップレベルアイテムの位置・矩形・変換行列・Z値・選択状態を保存する。
+    シーンが名前付きの選択セットを持つ場合は、アイテムのインデックスとしてあわせて保存する。
+    """
+    rect = scene.sceneRect()
+    items: list[dict[str, Any]] = []
+    saved_items: list[QGraphicsItem] = []
+    # 重なり順の昇順で保存し、復元時に重なり順を維持する
+    for item in _stackedTopLevelItems(scene):
+        saved_items.append(item)
+        t = item.transform()
+        data: dict[str, Any] = {
+            'type': type(item).__name__,
+            'pos': [item.pos().x(), item.pos().y()],
+            'transform': [t.m11(), t.m12(), t.m13(), t.m21(), t.m22(), t.m23(), t.m31(), t.m32(), t.m33()],
+            'z': item.zValue(),
+            'flags': item.flags().value,
+            'selected': item.isSelected(),
+        }
+        if isinstance(item, QGraphicsRectItem):
+            r = item.rect()
+            data['rect'] = [r.x(), r.y(), r.width(), r.height()]
+        else:
+            r = item.boundingRect()
+            data['rect'] = [r.x(), r.y(), r.width(), r.height()]
+        if hasattr(item, 'get_region_rect'):
+            data['key'] = getattr(item, '_region_key', '')
+            data['label'] = getattr(item, 'label', '')
+        items.append(data)
+    snapshot: dict[str, Any] = {
+        'scene_rect': [rect.x(), rect.y(), rect.width(), rect.height()],
+        'items': items,
+    }
+    if hasattr(scene, 'selection_sets') and len(scene.selection_sets):
+        snapshot['selection_sets'] = scene.selection_sets.save(saved_items)
+    return snapshot
+
+
+class SceneInputRecorder(QObject):
+    """
+    シーンに届くマウス・キーイベントを記録するレコーダー
+
+    CustomScene / TransformScene を含む任意のQGraphicsSceneにイベントフィルタとして取り付け、
+    イベント種別・シーン座標・ボタン・修飾キー・タイムスタンプを記録する。
+    """
+
+    def __init__(self, scene: QGraphicsScene, parent: QObject | None = None):
+        super().__init__(parent)
+        self.scene = scene
+        self.snapshot: dict[str, Any] | None = None
+        self.events: list[list[Any]] = []
+        self.is_recording = False
+        self._start_time = 0.0
+
+    def start(self) -> None:
+        """記録を開始（開始時点のシーンをスナップショットとして保存）"""
+        if self.is_recording:
+            return
+        self.snapshot = snapshot_scene(self.scene)
+        self.events = []
+        self._start_time = time.perf_counter()
+        self.scene.installEventFilter(self)
+        self.is_recording = True
+
+    def stop(self) -> None:
+        """記録を停止"""
+        if not self.is_recording:
+            return
+        self.scene.removeEventFilter(self)
+        self.is_recording = False
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        if watched is self.scene:
+            event_type = event.type()
+            timestamp = round((time.perf_counter() - self._start_time) * 1000.0, 2)
+            if event_type in _MOUSE_EVENT_CODES:
+                pos = event.scenePos()
+                self.events.append([
+                    timestamp,
+                    _MOUSE_EVENT_CODES[event_type],
+                    round(pos.x(), 3),
+                    round(pos.y(), 3),
+                    event.button().value,
+                    event.buttons().value,
+                    event.modifiers().value,
+                ])
+            elif event_type in _KEY_EVENT_CODES:
+                self.events.append([
+                    timestamp,
+                    _KEY_EVENT_CODES[event_type],
+                    event.key(),
+                    event.modifiers().value,
+                    event.text(),
+                    event.isAutoRepeat(),
+                ])
+        # イベントはそのままシーンに流す
+        return False
+
+    def save(self, path: str) -> None:
+        """記録内容をgzip圧縮したJSONとして保存"""
+        data = {
+            'version': FORMAT_VERSION,
+            'snapshot': self.snapshot or snapshot_scene(self.scene),
+            'events': self.events,
+        }
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+
+
+class SceneInputReplayer:
+    """
+    SceneInputRecorderで保存したセッションをシーンに再生するリプレイヤー
+
+    ウィンドウやビューを必要とせず、合成したイベントをシーンへ直接送るため、
+    ヘッドレス環境でのパフォーマンス回帰テストに利用できる。
+    """
+
+    def __init__(self, scene: QGraphicsScene,
+                 item_factories: dict[str, Callable[[dict[str, Any]], QGraphicsItem]] | None = None):
+        """
+        Args:
+            scene: 再生先のシーン
+            item_factories: スナップショットのアイテム種別名から生成関数への対応表
+        """
+        self.scene = scene
+        self.item_factories: dict[str, Callable[[dict[str, Any]], QGraphicsItem]] = {
+            'RegionItem': self._createRegionItem,
+        }
+        if item_factories:
+            self.item_factories.update(item_factories)
+        self.snapshot: dict[str, Any] | None = None
+        self.events: list[list[Any]] = []
+
+    def load(self, path: str) -> None:
+        """保存されたセッションを読み込む"""
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported session format version: {data.get('version')}")
+        self.snapshot = data['snapshot']
+        self.events = data['events']
+
+    def restoreSnapshot(self) -> list[QGraphicsItem]:
+        """
+        スナップショットからシーンを復元
+
+        既存の補助アイテム以外のトップレベルアイテムは削除される。
+
+        Returns:
+            list[QGraphicsItem]: 復元したアイテムのリスト（保存順）
+        """
+        if self.snapshot is None:
+            raise RuntimeError("No session loaded")
+
+        for item in self.scene.items():
+            if item.topLevelItem() is item and not isinstance(item, HELPER_ITEM_TYPES):
+                self.scene.removeItem(item)
+
+        self.scene.setSceneRect(QRectF(*self.snapshot['scene_rect']))
+        restored: list[QGraphicsItem] = []
+        for data in self.snapshot['items']:
+            factory = self.item_factories.get(data['type'], self._createRectItem)
+            item = factory(data)
+            item.setFlags(QGraphicsItem.GraphicsItemFlag(data['flags']))
+            item.setTransform(QTransform(*data['transform']))
+            item.setPos(QPointF(*data['pos']))
+            item.setZValue(data['z'])
+            # importItemは選択フラグを強制するため、復元時はaddItemを使う
+            self.scene.addItem(item)
+            item.setSelected(data['selected'])
+            restored.append(item)
+        if 'selection_sets' in self.snapshot and hasattr(self.scene, 'selection_sets'):
+            self.scene.selection_sets.load(self.snapshot['selection_sets'], restored)
+        return restored
+
+    def replay(self, speed: float | None = None) -> list[float]:
+        """
+        読み込んだイベントを再生
+
+        Args:
+            speed: 再生速度の倍率（1.0で記録時と同じ速度）。Noneの場合は待機せず最大速度で再生
+
+        Returns:
+            list[float]: 各イベントの処理にかかった時間（秒）
+        """
+        durations: list[float] = []
+        button_down_pos: dict[int, QPointF] = {}
+        last_scene_pos = QPointF()
+        start = time.perf_counter()
+
+        for record in self.events:
+            if speed is not None:
+                target = start + record[0] / 1000.0 / speed
+                while True:
+                    remaining = target - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    QCoreApplication.processEvents()
+                    time.sleep(min(remaining, 0.001))
+
+            code = record[1]
+            if code in _MOUSE_EVENT_TYPES:
+                event = QGraphicsSceneMouseEvent(_MOUSE_EVENT_TYPES[code])
+                scene_pos = QPointF(record[2], record[3])
+                button = Qt.MouseButton(record[4])
+                if code in ('P', 'D'):
+                    button_down_pos[record[4]] = scene_pos
+                event.setScenePos(scene_pos)
+                event.setLastScenePos(last_scene_pos if code == 'M' else scene_pos)
+                event.setButton(button)
+                event.setButtons(Qt.MouseButton(record[5]))
+                event.setModifiers(Qt.KeyboardModifier(record[6]))
+                for button_value, down_pos in button_down_pos.items():
+                    event.setButtonDownScenePos(Qt.MouseButton(button_value), down_pos)
+                last_scene_pos = scene_pos
+            else:
+                event = QKeyEvent(_KEY_EVENT_TYPES[code], record[2], Qt.KeyboardModifier(record[3]),
+                                  record[4], record[5])
+
+            event_start = time.perf_counter()
+            QCoreApplication.sendEvent(self.scene, event)
+            QCoreApplication.processEvents()
+            durations.append(time.perf_counter() - event_start)
+
+        return durations
+
+    @staticmethod
+    def _createRectItem(data: dict[str, Any]) -> QGraphicsItem:
+        return QGraphicsRectItem(QRectF(*data['rect']))
+
+    @staticmethod
+    def _createRegionItem(data: dict[str, Any]) -> QGraphicsItem:
+        from .region_item_v2 import RegionItem
+        x, y, w, h = data['rect']
+        item = RegionItem(data.get('key', ''), QRectF(0, 0, w, h), data.get('label', ''))
+        item.setRect(QRectF(x, y, w, h))
+        return item
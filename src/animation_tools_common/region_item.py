@@ -1,8 +1,9 @@
-from PySide6.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem, QWidget, QGraphicsSceneMouseEvent, QGraphicsSceneHoverEvent
+from PySide6.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem, QWidget, QGraphicsSceneMouseEvent, QGraphicsSceneHoverEvent, QGraphicsView
 from PySide6.QtCore import Qt, QRectF, QPointF, Signal, QObject, QSizeF
 from PySide6.QtGui import QFont, QColor, QPen, QBrush, QPainter, QUndoStack
 from .convert import qrectf_to_rectf
 from .obj import RectF
+from .view_lod import eventView, viewLod
 
 class RegionItem(QGraphicsItem, QObject):
     props_changed = Signal(QRectF)
@@ -111,7 +112,7 @@ class RegionItem(QGraphicsItem, QObject):
         if event.button() == Qt.LeftButton:
             self.setCursor(Qt.ClosedHandCursor)
             self.old_rect = self.rect()
-            lod = self.get_lod()
+            lod = self.get_lod(eventView(event))
             scaled_handler_size = 10 / lod
             for i, handler in enumerate(self.handlers):
                 scaled_handler = QRectF(handler.center().x() - scaled_handler_size / 2,
@@ -189,7 +190,7 @@ class RegionItem(QGraphicsItem, QObject):
         super().hoverLeaveEvent(event)
 
     def hoverMoveEvent(self, event: QGraphicsSceneHoverEvent):
-        lod = self.get_lod()
+        lod = self.get_lod(eventView(event))
         scaled_handler_size = 10 / lod
         for handler in self.handlers:
             scaled_handler = QRectF(handler.center().x() - scaled_handler_size / 2,
@@ -201,8 +202,17 @@ class RegionItem(QGraphicsItem, QObject):
         self.setCursor(Qt.OpenHandCursor)
         super().hoverMoveEvent(event)
 
-    def get_lod(self):
-        return self.scene().views()[0].transform().m11() if self.scene() and self.scene().views() else 1
+    def get_lod(self, view: QGraphicsView | None = None) -> float:
+        """
+        LOD（Level of Detail）を取得
+
+        Args:
+            view: 対象のビュー。Noneの場合はシーンの最初のビュー
+                （イベント処理中は、イベントを送ったビューを渡すこと）
+        """
+        if view is None:
+            view = self.scene().views()[0] if self.scene() and self.scene().views() else None
+        return viewLod(self, view) if view is not None else 1.0
 
 # 使用例
 if __name__ == "__main__":
@@ -1,8 +1,9 @@
-from PySide6.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem, QGraphicsRectItem, QWidget, QGraphicsSceneMouseEvent, QGraphicsSceneHoverEvent
+from PySide6.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem, QGraphicsRectItem, QWidget, QGraphicsSceneMouseEvent, QGraphicsSceneHoverEvent, QGraphicsView
 from PySide6.QtCore import Qt, QRectF, QPointF, Signal, QObject, QSizeF
 from PySide6.QtGui import QFont, QColor, QPen, QBrush, QPainter, QUndoStack
 from .convert import qrectf_to_rectf
 from .obj import RectF
+from .view_lod import viewLod
 
 class RegionItem(QGraphicsRectItem):
     def __init__(self, region_key:str, rect:QRectF=QRectF(0, 0, 400, 300), label:str='', undo_stack:QUndoStack|None=None):
@@ -13,6 +14,29 @@ class RegionItem(QGraphicsRectItem):
         self._font = QFont("Arial", 10)
         self._color = Qt.GlobalColor.black
         self.setFlag(QGraphicsItem.ItemIsSelectable, True)
+        self.setFlag(QGraphicsItem.ItemSendsGeometryChanges, True)
+
+    def setRect(self, *args) -> None:
+        super().setRect(*args)
+        self._notifyGeometryChanged()
+
+    def itemChange(self, change: QGraphicsItem.GraphicsItemChange, value):
+        if change in (QGraphicsItem.ItemPositionHasChanged, QGraphicsItem.ItemTransformHasChanged,
+                      QGraphicsItem.ItemRotationHasChanged, QGraphicsItem.ItemScaleHasChanged):
+            self._notifyGeometryChanged()
+        return super().itemChange(change, value)
+
+    def _notifyGeometryChanged(self) -> None:
+        """シーンの空間インデックスにジオメトリの変更を通知"""
+        scene = self.scene()
+        if scene is not None and hasattr(scene, 'notifyGeometryChanged'):
+            scene.notifyGeometryChanged(self)
+
+    def _notifyAttributesChanged(self) -> None:
+        """シーンの属性の索引にラベル・色の変更を通知"""
+        scene = self.scene()
+        if scene is not None and hasattr(scene, 'notifyAttributesChanged'):
+            scene.notifyAttributesChanged(self)
     
     def get_region_rect(self)->dict[str, RectF]:
         return {self._region_key: qrectf_to_rectf(self.rect())}
@@ -24,6 +48,7 @@ class RegionItem(QGraphicsRectItem):
     @label.setter
     def label(self, value:str):
         self._label = value
+        self._notifyAttributesChanged()
         self.update()
 
     @property
@@ -42,6 +67,7 @@ class RegionItem(QGraphicsRectItem):
     @color.setter
     def color(self, value:QColor):
         self._color = value
+        self._notifyAttributesChanged()
         self.update()
 
     def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget: QWidget | None = None):
@@ -84,8 +110,17 @@ class RegionItem(QGraphicsRectItem):
                 painter.drawText(text_pos, self._label)
 
 
-    def get_lod(self):
-        return self.scene().views()[0].transform().m11() if self.scene() and self.scene().views() else 1
+    def get_lod(self, view: QGraphicsView | None = None) -> float:
+        """
+        LOD（Level of Detail）を取得
+
+        Args:
+            view: 対象のビュー。Noneの場合はシーンの最初のビュー
+                （イベント処理中は、イベントを送ったビューを渡すこと）
+        """
+        if view is None:
+            view = self.scene().views()[0] if self.scene() and self.scene().views() else None
+        return viewLod(self, view) if view is not None else 1.0
 
 # 使用例
 if __name__ == "__main__":
@@ -0,0 +1,258 @@
+"""
+シーンの選択状態をまとめて変更するためのユーティリティ
+
+QGraphicsItem.setSelected() はアイテムごとに QGraphicsScene.selectionChanged を発行するため、
+多数のアイテムを選択すると接続先（変形矩形の更新など）がアイテム数だけ呼ばれてしまう。
+batchSelection() の中で行った選択の変更は、終了時に1回の selectionChanged にまとめて通知される。
+Qtが発行する個々の selectionChanged はアイテムから直接発行されて止められないため、
+ブロック中はシーンのシグナルを止める（接続先は特別な処理をしなくても1回だけ呼ばれる）。
+"""
+import math
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Sequence
+
+from PySide6.QtCore import QRectF
+from PySide6.QtWidgets import QGraphicsItem, QGraphicsScene
+
+
+@contextmanager
+def batchSelection(scene: QGraphicsScene, compare: bool = True) -> Iterator[None]:
+    """
+    選択変更の通知をまとめるコンテキストマネージャ
+
+    終了時に選択が変わっていれば selectionChanged を1回だけ発行する。ブロック中はシーンのシグナルを
+    止めるため、ブロック内で発行されたシーンの他のシグナルも接続先に届かない（選択の変更だけを行うこと）。
+    入れ子にした場合は最も外側のブロックの終了時にまとめて発行する。
+
+    Args:
+        scene: 対象のシーン
+        compare: Falseの場合は前後の選択の比較（選択数に比例する）を省略し、終了時に必ず発行する。
+            呼び出し側が選択の変更を確実に行う場合に使う
+    """
+    depth = getattr(scene, '_selection_batch_depth', 0)
+    scene._selection_batch_depth = depth + 1
+    if depth > 0:
+        try:
+            yield
+        finally:
+            scene._selection_batch_depth -= 1
+        return
+
+    before = scene.selectedItems() if compare else None
+    was_blocked = scene.blockSignals(True)
+    try:
+        yield
+    finally:
+        scene._selection_batch_depth -= 1
+        # 呼び出し側がシグナルを止めていた場合は、止めたまま戻す（終了時の通知も届かない）
+        scene.blockSignals(was_blocked)
+        if before is None:
+            scene.selectionChanged.emit()
+        else:
+            after = scene.selectedItems()
+            if len(after) != len(before) or set(after) != set(before):
+                scene.selectionChanged.emit()
+
+
+def selectionBatchActive(scene: QGraphicsScene) -> bool:
+    """
+    batchSelection() の中かどうか
+
+    ブロック中は selectionChanged が届かないため、選択のキャッシュなどはこの間キャッシュを使わない。
+    """
+    return getattr(scene, '_selection_batch_depth', 0) > 0
+
+
+def setItemsSelected(scene: QGraphicsScene, items: Iterable[QGraphicsItem], selected: bool = True) -> None:
+    """
+    複数アイテムの選択状態を1回の通知で変更
+
+    Args:
+        scene: 対象のシーン
+        items: 選択状態を変更するアイテム
+        selected: 選択する場合はTrue、選択を解除する場合はFalse
+    """
+    with batchSelection(scene):
+        for item in items:
+            item.setSelected(selected)
+
+
+def selectAll(scene: QGraphicsScene) -> None:
+    """シーン内の選択可能なアイテムをすべて選択（通知は1回）"""
+    selectable = QGraphicsItem.GraphicsItemFlag.ItemIsSelectable
+    setItemsSelected(scene, (item for item in scene.items()
+                             if item.flags() & selectable and item.isVisible()))
+
+
+class SelectionCache:
+    """
+    シーンの選択アイテムのキャッシュ
+
+    QGraphicsScene.selectedItems() は呼び出しのたびにリストを作り直すため、
+    マウス移動ごとに選択アイテムを参照する処理ではこのキャッシュを使う。
+    キャッシュは selectionChanged で破棄され、次の参照時に作り直される。
+    アイテムの順序はキャッシュが作り直されるまで変わらない。
+    batchSelection() の中では selectionChanged が届かないため、キャッシュを使わずにシーンから取得する。
+    """
+
+    def __init__(self, scene: QGraphicsScene):
+        self._scene = scene
+        self._items: tuple[QGraphicsItem, ...] | None = None
+        self._item_set: frozenset[QGraphicsItem] | None = None
+        scene.selectionChanged.connect(self.invalidate)
+
+    def invalidate(self) -> None:
+        """キャッシュを破棄"""
+        self._items = None
+        self._item_set = None
+
+    def items(self) -> tuple[QGraphicsItem, ...]:
+        """選択アイテムを返す"""
+        if selectionBatchActive(self._scene):
+            self.invalidate()
+            return tuple(self._scene.selectedItems())
+        if self._items is None:
+            self._items = tuple(self._scene.selectedItems())
+        return self._items
+
+    def contains(self, item: QGraphicsItem) -> bool:
+        """アイテムが選択されているかどうか"""
+        if selectionBatchActive(self._scene):
+            return item.isSelected()
+        if self._item_set is None:
+            self._item_set = frozenset(self.items())
+        return item in self._item_set
+
+
+# 変形行列の回転角度がこの値（度）を超えるアイテムを回転しているとみなす
+ROTATION_TOLERANCE = 0.1
+
+Box = tuple[float, float, float, float]  # (左, 上, 右, 下)
+
+
+def _isRotated(item: QGraphicsItem) -> bool:
+    transform = item.transform()
+    return abs(math.degrees(math.atan2(transform.m12(), transform.m11()))) > ROTATION_TOLERANCE
+
+
+class SelectionBounds:
+    """
+    選択アイテム全体のシーン上のバウンディング矩形と、回転しているアイテムの数
+
+    選択の変更時は、前回から選択に加わったアイテムと外れたアイテムだけの矩形を求める。
+    アイテムの位置・形状・変形が変わった場合は markDirty() で通知する（次の参照時に求め直す）。
+    選択アイテム全体を同じだけ移動した場合は translate() で通知すると、
+    アイテムごとの矩形は変えずに全体のオフセットだけを更新する。
+    """
+
+    def __init__(self, scene: QGraphicsScene):
+        self._scene = scene
+        self._synced: Sequence[QGraphicsItem] | None = None  # 最後に反映した選択（cachedSelectedItems()の戻り値）
+        self._boxes: dict[QGraphicsItem, Box] = {}  # オフセットを除いたシーン上のバウンディング矩形
+        self._rotated: set[QGraphicsItem] = set()
+        self._dirty: set[QGraphicsItem] = set()
+        self._union: Box | None = None  # オフセットを除いた全体の矩形（Noneの場合は求め直す）
+        self._offset_x = 0.0
+        self._offset_y = 0.0
+
+    def clear(self) -> None:
+        self._synced = None
+        self._boxes.clear()
+        self._rotated.clear()
+        self._dirty.clear()
+        self._union = None
+        self._offset_x = self._offset_y = 0.0
+
+    def markDirty(self, items: QGraphicsItem | Iterable[QGraphicsItem]) -> None:
+        """
+        ジオメトリが変わったアイテムを通知
+
+        Args:
+            items: 位置・形状・変形が変わったアイテム（選択されていないアイテムは無視される）
+        """
+        if isinstance(items, QGraphicsItem):
+            items = (items,)
+        boxes = self._boxes
+        self._dirty.update(item for item in items if item in boxes)
+
+    def translate(self, dx: float, dy: float) -> None:
+        """選択アイテム全体を (dx, dy) だけ移動したことを通知"""
+        self._sync()
+        self._offset_x += dx
+        self._offset_y += dy
+
+    def rect(self) -> QRectF:
+        """選択アイテム全体のバウンディング矩形（選択がない場合は空の矩形）"""
+        self._sync()
+        self._flush()
+        if self._union is None:
+            if not self._boxes:
+                return QRectF()
+            boxes = self._boxes.values()
+            self._union = (min(box[0] for box in boxes), min(box[1] for box in boxes),
+                           max(box[2] for box in boxes), max(box[3] for box in boxes))
+        left, top, right, bottom = self._union
+        return QRectF(left + self._offset_x, top + self._offset_y, right - left, bottom - top)
+
+    def rotatedCount(self) -> int:
+        """回転している選択アイテムの数"""
+        self._sync()
+        self._flush()
+        return len(self._rotated)
+
+    def hasRotation(self) -> bool:
+        """回転している選択アイテムがあるか"""
+        return self.rotatedCount() > 0
+
+    def _selectedItems(self) -> Sequence[QGraphicsItem]:
+        if hasattr(self._scene, 'cachedSelectedItems'):
+            return self._scene.cachedSelectedItems()
+        return self._scene.selectedItems()
+
+    def _sync(self) -> None:
+        """前回から選択に加わったアイテムと外れたアイテムを反映"""
+        selected = self._selectedItems()
+        if selected is self._synced:
+            return
+        self._synced = selected
+        boxes = self._boxes
+        current = set(selected)
+        for item in [item for item in boxes if item not in current]:
+            self._removeBox(item)
+        for item in current.difference(boxes):
+            self._addBox(item)
+
+    def _flush(self) -> None:
+        """markDirty() されたアイテムの矩形を求め直す"""
+        if not self._dirty:
+            return
+        dirty = self._dirty
+        self._dirty = set()
+        for item in dirty:
+            if item in self._boxes:
+                self._removeBox(item)
+                self._addBox(item)
+
+    def _addBox(self, item: QGraphicsItem) -> None:
+        rect = item.sceneBoundingRect()
+        box = (rect.left() - self._offset_x, rect.top() - self._offset_y,
+               rect.right() - self._offset_x, rect.bottom() - self._offset_y)
+        self._boxes[item] = box
+        if _isRotated(item):
+            self._rotated.add(item)
+        union = self._union
+        if union is not None:
+            self._union = (min(union[0], box[0]), min(union[1], box[1]),
+                           max(union[2], box[2]), max(union[3], box[3]))
+        elif len(self._boxes) == 1:
+            self._union = box
+
+    def _removeBox(self, item: QGraphicsItem) -> None:
+        box = self._boxes.pop(item)
+        self._rotated.discard(item)
+        self._dirty.discard(item)
+        union = self._union
+        # 全体の矩形の境界に接していたアイテムが外れた場合だけ、全体の矩形を求め直す
+        if union is not None and (box[0] <= union[0] or box[1] <= union[1]
+                                  or box[2] >= union[2] or box[3] >= union[3]):
+            self._union = None
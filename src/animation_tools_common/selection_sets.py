@@ -0,0 +1,150 @@
+"""
+名前付きの選択セット
+
+よく使うアイテムの組み合わせを名前を付けて保存し、1回の選択変更通知で呼び出すための仕組み。
+セットはアイテムそのものではなく、シーン内で割り当てた整数IDの集合として保持する。
+和・積・差の演算はIDの集合だけで行うため、セットに含まれないアイテムには触れない。
+
+シーンから削除されたアイテムのIDは呼び出し時に無視される
+（同じアイテムを再び追加した場合は新しいIDが割り当てられ、既存のセットには含まれない）。
+"""
+from typing import Iterable
+
+from PySide6.QtWidgets import QGraphicsItem, QGraphicsScene
+
+from .selection import batchSelection
+
+
+class SelectionSets:
+    """シーンの名前付き選択セット"""
+
+    def __init__(self, scene: QGraphicsScene):
+        self._scene = scene
+        self._sets: dict[str, frozenset[int]] = {}
+        self._ids: dict[QGraphicsItem, int] = {}
+        self._items: dict[int, QGraphicsItem] = {}
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._sets)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._sets
+
+    def names(self) -> list[str]:
+        """保存されているセットの名前（保存順）"""
+        return list(self._sets)
+
+    def store(self, name: str, items: Iterable[QGraphicsItem] | None = None) -> None:
+        """
+        アイテムの組み合わせをセットとして保存（同名のセットは上書き）
+
+        Args:
+            name: セットの名前
+            items: 保存するアイテム。Noneの場合は現在の選択アイテム
+        """
+        if items is None:
+            if hasattr(self._scene, 'cachedSelectedItems'):
+                items = self._scene.cachedSelectedItems()
+            else:
+                items = self._scene.selectedItems()
+        self._sets[name] = frozenset(self._idOf(item) for item in items)
+
+    def remove(self, name: str) -> None:
+        """セットを削除（存在しない場合は何もしない）"""
+        self._sets.pop(name, None)
+
+    def items(self, name: str) -> list[QGraphicsItem]:
+        """
+        セットに含まれるアイテムのうち、シーンに残っているもの
+
+        Raises:
+            KeyError: セットが存在しない場合
+        """
+        found = self._items
+        return [found[item_id] for item_id in self._sets[name] if item_id in found]
+
+    def recall(self, name: str, add: bool = False) -> None:
+        """
+        セットのアイテムを選択（selectionChangedは1回だけ発行される）
+
+        現在の選択との差分だけ選択状態を切り替えるため、
+        計算量はセットと現在の選択の件数に比例し、シーン全体のアイテム数には依存しない。
+
+        Args:
+            name: セットの名前
+            add: Trueの場合は現在の選択に追加、Falseの場合は選択をセットに置き換える
+        """
+        targets = self.items(name)
+        if hasattr(self._scene, 'cachedSelectedItems'):
+            current = set(self._scene.cachedSelectedItems())
+        else:
+            current = set(self._scene.selectedItems())
+        selected = [item for item in targets if item not in current]
+        deselected = [] if add else current.difference(targets)
+        if not selected and not deselected:
+            return
+        # 変更があることは分かっているので、前後の選択の比較は省略する
+        with batchSelection(self._scene, compare=False):
+            for item in deselected:
+                item.setSelected(False)
+            for item in selected:
+                item.setSelected(True)
+
+    def union(self, name: str, *others: str) -> None:
+        """nameのセットを、nameとothersのセットの和に置き換える"""
+        self._sets[name] = self._sets.get(name, frozenset()).union(*(self._sets[other] for other in others))
+
+    def intersect(self, name: str, *others: str) -> None:
+        """nameのセットを、nameとothersのセットの積に置き換える"""
+        self._sets[name] = self._sets[name].intersection(*(self._sets[other] for other in others))
+
+    def subtract(self, name: str, *others: str) -> None:
+        """nameのセットから、othersのセットに含まれるアイテムを除く"""
+        self._sets[name] = self._sets[name].difference(*(self._sets[other] for other in others))
+
+    def forget(self, item: QGraphicsItem) -> None:
+        """シーンから削除されたアイテムのIDを解放（セットに残ったIDは呼び出し時に無視される）"""
+        item_id = self._ids.pop(item, None)
+        if item_id is not None:
+            del self._items[item_id]
+
+    def clear(self) -> None:
+        """すべてのセットとIDを削除"""
+        self._sets.clear()
+        self._ids.clear()
+        self._items.clear()
+
+    def save(self, items: list[QGraphicsItem]) -> dict[str, list[int]]:
+        """
+        セットを保存用の辞書に変換
+
+        Args:
+            items: 保存するアイテムの並び（スナップショットのアイテムの順序）
+
+        Returns:
+            セットの名前 -> itemsでのインデックスのリスト
+        """
+        positions = {self._ids[item]: i for i, item in enumerate(items) if item in self._ids}
+        return {name: sorted(positions[item_id] for item_id in ids if item_id in positions)
+                for name, ids in self._sets.items()}
+
+    def load(self, data: dict[str, list[int]], items: list[QGraphicsItem]) -> None:
+        """
+        save()で保存したセットを読み込む（同名のセットは上書き）
+
+        Args:
+            data: save()の戻り値
+            items: 保存時と同じ順序で並んだアイテム
+        """
+        for name, positions in data.items():
+            self.store(name, (items[i] for i in positions))
+
+    def _idOf(self, item: QGraphicsItem) -> int:
+        item_id = self._ids.get(item)
+        if item_id is None:
+            item_id = self._next_id
+            self._next_id += 1
+            self._ids[item] = item_id
+            self._items[item_id] = item
+        return item_id
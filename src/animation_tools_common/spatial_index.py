@@ -0,0 +1,340 @@
+"""
+選択可能なトップレベルアイテム用の空間インデックス
+
+シーンを一定サイズのセルに分割した均一グリッドで、アイテムのシーン上のバウンディング矩形が
+重なるセルにアイテムを登録する。範囲検索・点検索は検索範囲に重なるセルだけを調べるため、
+シーン全体のアイテム数ではなく検索範囲付近のアイテム数に比例する。
+
+アイテムのジオメトリが変わった場合は markDirty() で通知する。再登録は次の検索時にまとめて行う。
+ドラッグ中のように同じアイテムが動き続ける場合は、開始時に setMoving() で一度だけ通知する。
+移動中のアイテムは検索のたびに再登録し、setMoving() に空の集合を渡した時点で最後に一度再登録する。
+
+形状で判定するモードでは、バウンディング矩形が検索範囲の境界にかかるアイテムだけを形状で調べる。
+形状が矩形そのものであるアイテム（QGraphicsRectItemで shape/boundingRect を変更していないもの）は、
+回転していても四隅の座標をまとめてNumPyで判定する。このときペンの線の角（BevelJoinで欠ける部分、
+ペンの幅の半分未満）は矩形の角として扱う。
+"""
+import math
+from typing import Iterable
+
+from PySide6.QtCore import QPointF, QRectF, Qt
+from PySide6.QtGui import QPainterPath
+from PySide6.QtWidgets import QGraphicsItem, QGraphicsRectItem
+
+CellRange = tuple[int, int, int, int]
+# シーン変換行列の (m11, m12, m21, m22, dx, dy) とローカルのバウンディング矩形の (左, 上, 右, 下)
+BoxGeometry = tuple[float, float, float, float, float, float, float, float, float, float]
+
+# アイテムの型 -> 形状がバウンディング矩形と一致するか
+_BOX_SHAPED_TYPES: dict[type, bool] = {}
+
+
+def _isBoxShaped(item: QGraphicsItem) -> bool:
+    """形状がバウンディング矩形（を回転・変形したもの）と一致するアイテムかどうか"""
+    item_type = type(item)
+    box_shaped = _BOX_SHAPED_TYPES.get(item_type)
+    if box_shaped is None:
+        box_shaped = (issubclass(item_type, QGraphicsRectItem)
+                      and item_type.shape == QGraphicsRectItem.shape
+                      and item_type.boundingRect == QGraphicsRectItem.boundingRect)
+        _BOX_SHAPED_TYPES[item_type] = box_shaped
+    return box_shaped
+
+
+class SpatialIndex:
+    """均一グリッドによるアイテムの空間インデックス"""
+
+    # 1アイテムが登録されるセル数の上限（これを超える大きなアイテムは別枠で管理）
+    MAX_CELLS_PER_ITEM = 256
+    # 境界にかかる矩形アイテムがこの数以上ならNumPyでまとめて判定する
+    VECTORIZE_MIN_ITEMS = 16
+
+    def __init__(self, cell_size: float = 256.0):
+        if cell_size <= 0:
+            raise ValueError(f"cell_size must be positive: {cell_size}")
+        self.cell_size = cell_size
+        self._cells: dict[tuple[int, int], set[QGraphicsItem]] = {}
+        self._large_items: set[QGraphicsItem] = set()
+        self._bounds: dict[QGraphicsItem, QRectF] = {}
+        self._ranges: dict[QGraphicsItem, CellRange | None] = {}
+        self._order: dict[QGraphicsItem, int] = {}
+        self._boxes: dict[QGraphicsItem, BoxGeometry | None] = {}  # 矩形アイテムの変換と矩形（検索時に求める）
+        self._dirty: set[QGraphicsItem] = set()
+        self._moving: set[QGraphicsItem] = set()  # 検索のたびに再登録するアイテム（ドラッグ中）
+        self._next_order = 0
+
+    def __len__(self) -> int:
+        return len(self._bounds)
+
+    def __contains__(self, item: QGraphicsItem) -> bool:
+        return item in self._bounds
+
+    def insert(self, item: QGraphicsItem) -> None:
+        """アイテムを登録（登録済みの場合は位置を更新）"""
+        if item in self._bounds:
+            self._rebin(item)
+            return
+        self._order[item] = self._next_order
+        self._next_order += 1
+        self._ranges[item] = None
+        self._rebin(item)
+
+    def remove(self, item: QGraphicsItem) -> None:
+        """アイテムの登録を解除（未登録の場合は何もしない）"""
+        if item not in self._bounds:
+            return
+        self._unbin(item)
+        del self._bounds[item]
+        del self._ranges[item]
+        del self._order[item]
+        self._boxes.pop(item, None)
+        self._dirty.discard(item)
+        self._moving.discard(item)
+
+    def clear(self) -> None:
+        """全アイテムの登録を解除"""
+        self._cells.clear()
+        self._large_items.clear()
+        self._bounds.clear()
+        self._ranges.clear()
+        self._order.clear()
+        self._boxes.clear()
+        self._dirty.clear()
+        self._moving.clear()
+
+    def markDirty(self, items: QGraphicsItem | Iterable[QGraphicsItem]) -> None:
+        """
+        ジオメトリが変わったアイテムを通知
+
+        Args:
+            items: 位置・形状・変形が変わったアイテム（未登録のアイテムは無視される）
+        """
+        if isinstance(items, QGraphicsItem):
+            items = (items,)
+        bounds = self._bounds
+        self._dirty.update(item for item in items if item in bounds)
+
+    def setMoving(self, items: Iterable[QGraphicsItem]) -> None:
+        """
+        動き続けるアイテムを設定（前回設定したアイテムは次の検索時に一度だけ再登録される）
+
+        Args:
+            items: 移動中のアイテム（検索のたびに再登録される。未登録のアイテムは無視される）
+        """
+        self._dirty.update(self._moving)
+        bounds = self._bounds
+        self._moving = {item for item in items if item in bounds}
+
+    def bounds(self, item: QGraphicsItem) -> QRectF | None:
+        """登録済みアイテムのシーン上のバウンディング矩形（未登録の場合はNone）"""
+        if item in self._dirty or item in self._moving:
+            self._rebin(item)
+            self._dirty.discard(item)
+        return self._bounds.get(item)
+
+    def itemsInRect(self, rect: QRectF,
+                    mode: Qt.ItemSelectionMode = Qt.ItemSelectionMode.IntersectsItemShape,
+                    selectable_only: bool = True) -> list[QGraphicsItem]:
+        """
+        矩形範囲内の選択可能なアイテムを取得
+
+        Args:
+            rect: シーン座標の検索範囲
+            mode: QGraphicsScene.items()と同じ判定モード
+            selectable_only: Falseの場合は選択不可・非表示のアイテムも含める
+
+        Returns:
+            登録順に並んだアイテムのリスト
+        """
+        self._flush()
+        contains = mode in (Qt.ItemSelectionMode.ContainsItemShape,
+                            Qt.ItemSelectionMode.ContainsItemBoundingRect)
+        path: QPainterPath | None = None
+        hits = []
+        boxes = []  # 境界にかかる矩形アイテム
+        for item in self._candidates(rect):
+            item_rect = self._bounds[item]
+            if not rect.intersects(item_rect) or (selectable_only and not self._isSelectable(item)):
+                continue
+            if rect.contains(item_rect):
+                hits.append(item)
+            elif contains:
+                # QGraphicsSceneと同様、包含判定はバウンディング矩形が範囲内にあることを条件とする
+                continue
+            elif mode == Qt.ItemSelectionMode.IntersectsItemBoundingRect:
+                hits.append(item)
+            elif _isBoxShaped(item):
+                boxes.append(item)
+            else:
+                # バウンディング矩形が範囲をはみ出す場合のみ形状で判定
+                if path is None:
+                    path = QPainterPath()
+                    path.addRect(rect)
+                if item.collidesWithPath(item.mapFromScene(path), mode):
+                    hits.append(item)
+        if boxes:
+            hits.extend(self._boxesIntersectingRect(boxes, rect))
+        hits.sort(key=self._order.__getitem__)
+        return hits
+
+    def _boxesIntersectingRect(self, items: list[QGraphicsItem], rect: QRectF) -> list[QGraphicsItem]:
+        """矩形アイテムのうち、回転を考慮した四隅の矩形が範囲と交わるものを返す"""
+        if len(items) < self.VECTORIZE_MIN_ITEMS:
+            return self._pathHits(items, rect)
+        boxes: list[QGraphicsItem] = []
+        geometries: list[BoxGeometry] = []
+        projective: list[QGraphicsItem] = []  # 射影変換されたアイテムは形状で判定
+        for item in items:
+            geometry = self._boxGeometry(item)
+            if geometry is None:
+                projective.append(item)
+            else:
+                boxes.append(item)
+                geometries.append(geometry)
+        return self._vectorizedBoxHits(boxes, geometries, rect) + self._pathHits(projective, rect)
+
+    @staticmethod
+    def _pathHits(items: list[QGraphicsItem], rect: QRectF) -> list[QGraphicsItem]:
+        """形状が範囲と交わるアイテム（Qtによる判定）"""
+        if not items:
+            return []
+        path = QPainterPath()
+        path.addRect(rect)
+        return [item for item in items if item.collidesWithPath(item.mapFromScene(path))]
+
+    @staticmethod
+    def _vectorizedBoxHits(items: list[QGraphicsItem], geometries: list[BoxGeometry],
+                           rect: QRectF) -> list[QGraphicsItem]:
+        """四隅をNumPyでまとめて求め、範囲と交わるアイテムを返す"""
+        if not items:
+            return []
+        # NumPyの読み込みは多数のアイテムを判定するときまで遅らせる
+        import numpy as np
+        from .geometry import quadsInRect
+
+        m11, m12, m21, m22, dx, dy, left, top, right, bottom = np.array(geometries, dtype=float).T
+        xs = np.stack((left, right, right, left), axis=1)
+        ys = np.stack((top, top, bottom, bottom), axis=1)
+        quads = np.stack((m11[:, None] * xs + m21[:, None] * ys + dx[:, None],
+                          m12[:, None] * xs + m22[:, None] * ys + dy[:, None]), axis=2)
+        hits = quadsInRect(quads, (rect.left(), rect.top(), rect.right(), rect.bottom()))
+        return [items[i] for i in np.nonzero(hits)[0]]
+
+    def _boxGeometry(self, item: QGraphicsItem) -> BoxGeometry | None:
+        """矩形アイテムのシーン変換と矩形（射影変換されている場合はNone）。再登録まで使い回す"""
+        if item in self._boxes:
+            return self._boxes[item]
+        transform = item.sceneTransform()
+        if transform.isAffine():
+            r = item.boundingRect()
+            geometry = (transform.m11(), transform.m12(), transform.m21(), transform.m22(),
+                        transform.dx(), transform.dy(), r.left(), r.top(), r.right(), r.bottom())
+        else:
+            geometry = None
+        self._boxes[item] = geometry
+        return geometry
+
+    def itemsAt(self, point: QPointF) -> list[QGraphicsItem]:
+        """
+        指定位置にある選択可能なアイテムを取得
+
+        Args:
+            point: シーン座標
+
+        Returns:
+            登録順に並んだアイテムのリスト
+        """
+        self._flush()
+        cx, cy = self._cellOf(point.x(), point.y())
+        candidates = self._cells.get((cx, cy), set()) | self._large_items
+        hits = [item for item in candidates
+                if self._bounds[item].contains(point)
+                and self._isSelectable(item)
+                and item.contains(item.mapFromScene(point))]
+        hits.sort(key=self._order.__getitem__)
+        return hits
+
+    def items(self) -> list[QGraphicsItem]:
+        """登録済みの全アイテム（登録順）"""
+        return list(self._bounds)
+
+    def order(self, item: QGraphicsItem) -> int:
+        """アイテムの登録順（登録順が早いほど小さい値）"""
+        return self._order[item]
+
+    @staticmethod
+    def _isSelectable(item: QGraphicsItem) -> bool:
+        return bool(item.flags() & QGraphicsItem.GraphicsItemFlag.ItemIsSelectable) and item.isVisible()
+
+    def _cellOf(self, x: float, y: float) -> tuple[int, int]:
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def _cellRange(self, rect: QRectF) -> CellRange:
+        x0, y0 = self._cellOf(rect.left(), rect.top())
+        x1, y1 = self._cellOf(rect.right(), rect.bottom())
+        return x0, y0, x1, y1
+
+    def _candidates(self, rect: QRectF) -> set[QGraphicsItem] | Iterable[QGraphicsItem]:
+        """検索範囲に重なるセルに登録されたアイテム"""
+        x0, y0, x1, y1 = self._cellRange(rect)
+        cell_count = (x1 - x0 + 1) * (y1 - y0 + 1)
+        if cell_count > len(self._cells):
+            # 検索範囲がシーンに対して大きい場合は全件を調べる方が速い
+            return self._bounds.keys()
+        candidates = set(self._large_items)
+        cells = self._cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = cells.get((cx, cy))
+                if cell:
+                    candidates |= cell
+        return candidates
+
+    def _flush(self) -> None:
+        """通知されたアイテムと移動中のアイテムを再登録"""
+        if self._dirty:
+            for item in self._dirty:
+                self._rebin(item)
+            self._dirty.clear()
+        for item in self._moving:
+            self._rebin(item)
+
+    def _rebin(self, item: QGraphicsItem) -> None:
+        self._boxes.pop(item, None)
+        rect = item.sceneBoundingRect()
+        self._bounds[item] = rect
+        cell_range = self._cellRange(rect)
+        if cell_range == self._ranges[item]:
+            return
+        self._unbin(item)
+        x0, y0, x1, y1 = cell_range
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > self.MAX_CELLS_PER_ITEM:
+            self._large_items.add(item)
+        else:
+            cells = self._cells
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    cell = cells.get((cx, cy))
+                    if cell is None:
+                        cells[(cx, cy)] = {item}
+                    else:
+                        cell.add(item)
+        self._ranges[item] = cell_range
+
+    def _unbin(self, item: QGraphicsItem) -> None:
+        cell_range = self._ranges.get(item)
+        if cell_range is None:
+            return
+        self._ranges[item] = None
+        if item in self._large_items:
+            self._large_items.discard(item)
+            return
+        x0, y0, x1, y1 = cell_range
+        cells = self._cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = cells.get((cx, cy))
+                if cell is not None:
+                    cell.discard(item)
+                    if not cell:
+                        del cells[(cx, cy)]
@@ -0,0 +1 @@
+"""シーン用ツール"""
@@ -1,5 +1,6 @@
+from typing import Sequence
 from PySide6.QtCore import QObject
-from PySide6.QtWidgets import QGraphicsScene, QGraphicsSceneMouseEvent
+from PySide6.QtWidgets import QGraphicsItem, QGraphicsScene, QGraphicsSceneMouseEvent
 from PySide6.QtGui import QKeyEvent, QIcon, QKeySequence
 
 class BaseTool(QObject):
@@ -10,6 +11,7 @@ class BaseTool(QObject):
     tool_icon: QIcon | None = None
     tool_tooltip: str = ""
     tool_shortcut: QKeySequence | str = ""
+    moves_selection: bool = False  # ドラッグで選択中のアイテムを動かすツールかどうか
     
     def __init__(self, scene: QGraphicsScene):
         super().__init__()
@@ -39,6 +41,12 @@ class BaseTool(QObject):
         """ツールのセットアップ処理"""
         raise NotImplementedError
     
+    def _selectedItems(self) -> Sequence[QGraphicsItem]:
+        """シーンの選択アイテム（シーンにキャッシュがある場合はキャッシュを使う）"""
+        if hasattr(self.scene, 'cachedSelectedItems'):
+            return self.scene.cachedSelectedItems()
+        return self.scene.selectedItems()
+    
     def mousePressEvent(self, event: QGraphicsSceneMouseEvent) -> bool:
         return False
     
@@ -0,0 +1,67 @@
+from PySide6.QtCore import Qt, QPointF
+from PySide6.QtGui import QKeyEvent
+from PySide6.QtWidgets import QGraphicsScene, QGraphicsSceneMouseEvent, QGraphicsView
+
+from ..view_lod import eventView
+from .base_tool import BaseTool
+
+class PanTool(BaseTool):
+    """
+    ドラッグでビューをスクロールするツール
+
+    CustomScene.addOverlayTool() で重ねて使うことを想定しており、
+    指定したボタン（既定は中ボタン）のドラッグだけを処理して、それ以外はアクティブなツールに任せる。
+    """
+
+    tool_name = "パン"
+    tool_tooltip = "ドラッグで表示位置を移動"
+
+    def __init__(self, scene: QGraphicsScene, button: Qt.MouseButton = Qt.MouseButton.MiddleButton):
+        super().__init__(scene)
+        self.button = button
+        self._view: QGraphicsView | None = None
+        self._last_screen_pos: QPointF | None = None
+
+    def setup(self) -> None:
+        """ツールのセットアップ処理"""
+        pass
+
+    def cleanup(self) -> None:
+        """ツールの状態をクリアする処理"""
+        self._view = None
+        self._last_screen_pos = None
+
+    def mousePressEvent(self, event: QGraphicsSceneMouseEvent) -> bool:
+        if event.button() != self.button:
+            return False
+        view = eventView(event)
+        if view is None:
+            return False
+        self._view = view
+        self._last_screen_pos = QPointF(event.screenPos())
+        return True
+
+    def mouseMoveEvent(self, event: QGraphicsSceneMouseEvent) -> bool:
+        if self._view is None or not event.buttons() & self.button:
+            return False
+        screen_pos = QPointF(event.screenPos())
+        delta = screen_pos - self._last_screen_pos
+        self._last_screen_pos = screen_pos
+        h_bar = self._view.horizontalScrollBar()
+        v_bar = self._view.verticalScrollBar()
+        h_bar.setValue(h_bar.value() - round(delta.x()))
+        v_bar.setValue(v_bar.value() - round(delta.y()))
+        return True
+
+    def mouseReleaseEvent(self, event: QGraphicsSceneMouseEvent) -> bool:
+        if self._view is None or event.button() != self.button:
+            return False
+        self._view = None
+        self._last_screen_pos = None
+        return True
+
+    def keyPressEvent(self, event: QKeyEvent) -> bool:
+        return False
+
+    def keyReleaseEvent(self, event: QKeyEvent) -> bool:
+        return False
@@ -2,13 +2,21 @@ from PySide6.QtCore import Qt, QRectF, QPointF
 from PySide6.QtGui import QKeyEvent
 from PySide6.QtWidgets import QGraphicsScene, QGraphicsSceneMouseEvent
 from .base_tool import BaseTool
+from ..hit_test import topmostSelectableItemAt
 from ..region_item_v2 import RegionItem
+from ..view_lod import eventView
 
 class RegionTool(BaseTool):
     """領域作成機能を提供するツール"""
     
-    def __init__(self, scene: QGraphicsScene):
+    def __init__(self, scene: QGraphicsScene, select_existing: bool = False):
+        """
+        Args:
+            scene: 対象のシーン
+            select_existing: Trueの場合、既存の領域の上を押すと新しい領域を作らずにその領域を選択する
+        """
         super().__init__(scene)
+        self.select_existing = select_existing
         self.start_pos: QPointF | None = None
         self.current_region: RegionItem | None = None
         self._region_count = 0
@@ -27,6 +35,11 @@ class RegionTool(BaseTool):
     def mousePressEvent(self, event: QGraphicsSceneMouseEvent) -> bool:
         """マウスプレスイベントの処理"""
         if event.button() == Qt.MouseButton.LeftButton:
+            # 既存の領域をクリックした場合は新しい領域を作らず、Qt標準の処理で選択させる
+            # （空間インデックスのあるシーンではインデックスで判定する）
+            if self.select_existing and isinstance(
+                    topmostSelectableItemAt(self.scene, event.scenePos(), eventView(event)), RegionItem):
+                return False
             self.start_pos = event.scenePos()
             
             # 初期サイズ0の領域を作成
@@ -1,14 +1,26 @@
 from typing import Optional
 from PySide6.QtCore import Qt, QRectF, QPointF
-from PySide6.QtGui import QPainterPath, QKeyEvent
+from PySide6.QtGui import QPainterPath, QPolygonF, QKeyEvent
 from PySide6.QtWidgets import (QGraphicsItem, QGraphicsScene, 
                               QGraphicsSceneMouseEvent)
 
+from ..helper_items import HELPER_ITEM_TYPES
+from ..hit_test import topmostSelectableItemAt
+from ..view_lod import eventView
+from ..selection import batchSelection
 from ..selection_path_item import SelectionPathItem
 from .base_tool import BaseTool
 
 class SelectTool(BaseTool):
-    """選択機能を提供するツール"""
+    """
+    選択機能を提供するツール
+
+    selection_shape が 'rect' の場合は矩形、'lasso' の場合は投げ縄でドラッグ選択する。
+    Altキーを押しながらドラッグした場合も投げ縄になる。
+    """
+
+    # 投げ縄の頂点を追加する最小の移動距離（シーン座標）
+    LASSO_MIN_SPACING = 2.0
     
     def __init__(self, scene: QGraphicsScene):
         super().__init__(scene)
@@ -16,6 +28,17 @@ class SelectTool(BaseTool):
         self.selection_path_item = SelectionPathItem()
         # self._last_added_items: set[QGraphicsItem] = set()
         self._click_pos: Optional[QPointF] = None  # クリック位置を保存
+        self._press_handled = False  # マウスプレスをツールで処理したか（Falseの場合はQt標準の処理に任せた）
+        # ドラッグ選択で前回の移動時に範囲内にあったアイテム（Noneの場合は未計算）
+        self._rubber_band_hits: Optional[set[QGraphicsItem]] = None
+        self._rubber_band_exact = False  # 現在の選択が前回の範囲内アイテムと一致しているか
+        self.selection_shape = 'rect'  # 'rect' または 'lasso'
+        # 範囲内と見なす条件（ContainsItemShape/ContainsItemBoundingRectの場合は範囲に完全に含まれるもの）
+        self.item_selection_mode = Qt.ItemSelectionMode.IntersectsItemShape
+        self._lasso_points: Optional[list[QPointF]] = None  # 投げ縄選択中の頂点
+        self._lasso_query_rect: Optional[QRectF] = None  # 候補を取得した範囲
+        self._lasso_candidates: list[QGraphicsItem] = []  # 投げ縄の候補アイテム
+        self._lasso_quads = None  # 候補アイテムの四隅（NumPy配列）
     
     def setup(self) -> None:
         """ツールがアクティブになった時の処理"""
@@ -32,33 +55,46 @@ class SelectTool(BaseTool):
             if self.selection_path_item.scene() == self.scene:
                 self.scene.removeItem(self.selection_path_item)
         self.selection_start_pos = None
+        self._clearLasso()
     
     def mousePressEvent(self, event: QGraphicsSceneMouseEvent) -> bool:
-        """マウスプレスイベントの処理"""
+        """
+        マウスプレスイベントの処理
+
+        アイテム上のプレスはQt標準の処理に任せる（選択、Ctrlでの選択の切り替え、移動可能なアイテムのドラッグ）。
+        ツールで処理するのは空白部分からのドラッグ選択・投げ縄選択のみ。
+        """
         if event.button() == Qt.MouseButton.LeftButton:
+            self._rubber_band_hits = None
+            self._rubber_band_exact = False
+            self._clearLasso()
+
+            # クリックされたアイテムを取得
+            clicked_item = topmostSelectableItemAt(self.scene, event.scenePos(), eventView(event))
+
+            if clicked_item and clicked_item.flags() & QGraphicsItem.GraphicsItemFlag.ItemIsMovable:
+                # Qtがアイテムを選択してドラッグで移動する
+                self._click_pos = None
+                self.selection_start_pos = None
+                self._press_handled = False
+                return False
+
             self._click_pos = event.scenePos()
             self.selection_start_pos = event.scenePos()
-            
-            # クリックされたアイテムを取得
-            clicked_item = self.scene.itemAt(event.scenePos(), self.scene.views()[0].transform())
-            
-            if clicked_item and clicked_item != self.selection_path_item:
-                # Ctrlキーが押されていない場合は既存の選択をクリア
-                if not event.modifiers() & Qt.KeyboardModifier.ControlModifier:
-                    self.scene.clearSelection()
-                
-                # アイテムを選択状態に
-                clicked_item.setSelected(True)
-                
-                # シーンにsetActiveItemメソッドが存在する場合のみ呼び出し
-                # if hasattr(self.scene, 'setActiveItem'):
-                #     self.scene.setActiveItem(clicked_item)
-            elif not event.modifiers() & Qt.KeyboardModifier.ControlModifier:
-                # 空白部分をクリックした場合で、Ctrlキーが押されていない場合
+            if self.selection_shape == 'lasso' or event.modifiers() & Qt.KeyboardModifier.AltModifier:
+                self._lasso_points = [event.scenePos()]
+
+            if clicked_item:
+                # 移動できないアイテムの選択はQtに任せ、ドラッグした場合はそこからドラッグ選択を行う
+                self._press_handled = False
+                return False
+
+            # 空白部分をクリックした場合で、Ctrlキーが押されていない場合
+            if not event.modifiers() & Qt.KeyboardModifier.ControlModifier:
                 self.scene.clearSelection()
                 # if hasattr(self.scene, 'setActiveItem'):
                 #     self.scene.setActiveItem(None)
-            
+            self._press_handled = True
             return True
         return False
     
@@ -70,6 +106,9 @@ class SelectTool(BaseTool):
             
             # 一定距離以上動いた場合のみドラッグ選択を開始
             if move_distance > 3:  # 3ピクセル以上の移動でドラッグ選択開始
+                if self._lasso_points is not None:
+                    self._updateLasso(event)
+                    return True
                 rect = QRectF(self.selection_start_pos, event.scenePos()).normalized()
                 path = QPainterPath()
                 path.addRect(rect)
@@ -77,19 +116,10 @@ class SelectTool(BaseTool):
                 self.selection_path_item.setVisible(True)
                 
                 # 選択範囲内のアイテムを取得
-                items = [item for item in self.scene.items(rect) 
-                        if item != self.selection_path_item]# and item.isSelectable()]
+                items = self._selectableItemsInRect(rect, self.item_selection_mode)
                 
-                # Ctrlキーが押されていない場合は既存の選択をクリア
-                if not event.modifiers() & Qt.KeyboardModifier.ControlModifier:
-                    self.scene.clearSelection()
-                    # self._last_added_items.clear()
-                
-                # 選択範囲内の全アイテムを選択状態に
-                for item in items:
-                    # if not item.isSelected():
-                        # self._last_added_items.add(item)
-                    item.setSelected(True)
+                self._updateRubberBandSelection(
+                    items, replace=not event.modifiers() & Qt.KeyboardModifier.ControlModifier)
                 
                 # # 最後に追加されたアイテムをアクティブに
                 # if self._last_added_items and hasattr(self.scene, 'setActiveItem'):
@@ -105,9 +135,133 @@ class SelectTool(BaseTool):
             self.selection_path_item.setPath(QPainterPath())
             self.selection_start_pos = None
             self._click_pos = None
+            self._rubber_band_hits = None
+            self._rubber_band_exact = False
+            self._clearLasso()
             # self._last_added_items.clear()
-            return True
+            # Qt標準の処理に任せたプレスは、リリースもQtに渡してマウスのグラブを解除させる
+            handled = self._press_handled
+            self._press_handled = False
+            return handled
         return False
+
+    def _updateLasso(self, event: QGraphicsSceneMouseEvent) -> None:
+        """投げ縄に頂点を追加し、範囲内のアイテムを選択"""
+        pos = event.scenePos()
+        if (pos - self._lasso_points[-1]).manhattanLength() < self.LASSO_MIN_SPACING:
+            return
+        self._lasso_points.append(pos)
+        polygon = QPolygonF(self._lasso_points)
+        path = QPainterPath()
+        path.addPolygon(polygon)
+        path.closeSubpath()
+        self.selection_path_item.setPath(path)
+        self.selection_path_item.setVisible(True)
+
+        self._updateRubberBandSelection(
+            self._itemsInLasso(polygon), replace=not event.modifiers() & Qt.KeyboardModifier.ControlModifier)
+
+    def _itemsInLasso(self, polygon: QPolygonF) -> list[QGraphicsItem]:
+        """
+        投げ縄の範囲内にあるアイテムを取得
+
+        投げ縄の外接矩形で候補を絞り込んだ後、各アイテムのバウンディング矩形の四隅で
+        多角形との包含・交差をまとめて判定する。
+        """
+        if len(self._lasso_points) < 3:
+            return []
+        # NumPyの読み込みは投げ縄選択を使うときまで遅らせる
+        import numpy as np
+        from ..geometry import quadsInPolygon
+
+        bounds = polygon.boundingRect()
+        if self._lasso_query_rect is None or not self._lasso_query_rect.contains(bounds):
+            # 頂点を追加しても外接矩形は広がるだけなので、余裕を持たせた範囲で候補を取り直し、
+            # 範囲を超えるまでは候補と四隅の座標を使い回す
+            margin = max(bounds.width(), bounds.height()) / 2
+            self._lasso_query_rect = bounds.adjusted(-margin, -margin, margin, margin)
+            self._lasso_candidates = self._lassoCandidates(self._lasso_query_rect)
+            corners = []
+            for item in self._lasso_candidates:
+                # 返される多角形は閉じている（5点目が始点と同じ）
+                quad = item.mapToScene(item.boundingRect())
+                corners.extend((quad[i].x(), quad[i].y()) for i in range(4))
+            self._lasso_quads = np.array(corners, dtype=float).reshape(-1, 4, 2)
+        if not self._lasso_candidates:
+            return []
+
+        contains = self.item_selection_mode in (Qt.ItemSelectionMode.ContainsItemShape,
+                                                Qt.ItemSelectionMode.ContainsItemBoundingRect)
+        hits = quadsInPolygon(self._lasso_quads,
+                              np.array([(point.x(), point.y()) for point in self._lasso_points]),
+                              contains)
+        candidates = self._lasso_candidates
+        return [candidates[i] for i in np.nonzero(hits)[0]]
+
+    def _lassoCandidates(self, rect: QRectF) -> list[QGraphicsItem]:
+        """バウンディング矩形が範囲に重なる選択可能なアイテム"""
+        return self._selectableItemsInRect(rect, Qt.ItemSelectionMode.IntersectsItemBoundingRect)
+
+    def _selectableItemsInRect(self, rect: QRectF, mode: Qt.ItemSelectionMode) -> list[QGraphicsItem]:
+        """
+        範囲内の選択可能なアイテム（補助アイテムは除く）
+
+        空間インデックスはトップレベルアイテムだけを持つため、範囲に子アイテムを持つアイテムが
+        ある場合は、選択可能な子アイテムも含めてQtで検索する（親のバウンディング矩形の外にある
+        子アイテムは、親が範囲に重なる場合だけ見つかる）。
+        """
+        index = getattr(self.scene, 'spatial_index', None)
+        if index is not None:
+            nearby = index.itemsInRect(rect, Qt.ItemSelectionMode.IntersectsItemBoundingRect, selectable_only=False)
+            if not any(item.childItems() for item in nearby):
+                return index.itemsInRect(rect, mode)
+        return [item for item in self.scene.items(rect, mode)
+                if not isinstance(item, HELPER_ITEM_TYPES)
+                and item.flags() & QGraphicsItem.GraphicsItemFlag.ItemIsSelectable]
+
+    def _clearLasso(self) -> None:
+        """投げ縄選択の状態をクリア"""
+        self._lasso_points = None
+        self._lasso_query_rect = None
+        self._lasso_candidates = []
+        self._lasso_quads = None
+
+    def _updateRubberBandSelection(self, items: list[QGraphicsItem], replace: bool) -> None:
+        """
+        ドラッグ選択の範囲内アイテムの差分だけ選択状態を切り替える
+
+        Args:
+            items: 選択範囲内のアイテム
+            replace: Trueの場合は選択を範囲内のアイテムに置き換え、Falseの場合は既存の選択に追加
+        """
+        hits = set(items)
+        previous = self._rubber_band_hits
+        if replace:
+            if previous is None or not self._rubber_band_exact:
+                # 初回（またはCtrlを離した直後）は現在の選択との差分を取る
+                previous = set(self.scene.selectedItems())
+            deselected = previous - hits
+            selected = [item for item in items if item not in previous]
+            self._rubber_band_hits = hits
+            self._rubber_band_exact = True
+        else:
+            # 追加選択では範囲外に出たアイテムも選択したままにする
+            if previous is None:
+                previous = set()
+            deselected = ()
+            selected = [item for item in items if item not in previous]
+            previous.update(hits)
+            self._rubber_band_hits = previous
+            self._rubber_band_exact = False
+
+        if not deselected and not selected:
+            return
+        # 変更があることは分かっているので、前後の選択の比較は省略して1回だけ通知する
+        with batchSelection(self.scene, compare=False):
+            for item in deselected:
+                item.setSelected(False)
+            for item in selected:
+                item.setSelected(True)
     
     def keyPressEvent(self, event: QKeyEvent) -> bool:
         """キープレスイベントの処理"""
@@ -3,11 +3,15 @@ from PySide6.QtWidgets import (QGraphicsItem, QGraphicsRectItem, QGraphicsScene,
                               QGraphicsSceneMouseEvent)
 from PySide6.QtGui import QTransform, QKeyEvent
 import math
-from ..custom_scene import BaseTool
+from typing import Sequence
+from .base_tool import BaseTool
+from ..transform_drag import TransformDragMixin
 from ..transform_rect_item import TransformRectItem
 
-class TransformTool(BaseTool):
-    """変形機能を提供するツール"""
+class TransformTool(TransformDragMixin, BaseTool):
+    """変形機能を提供するツール（ドラッグ中の反映は TransformDragMixin を参照）"""
+    
+    moves_selection = True
     
     # シグナルの定義
     itemsTransformed = Signal(list)
@@ -17,7 +21,9 @@ class TransformTool(BaseTool):
     
     def __init__(self, scene: QGraphicsScene, movable: bool = True, 
                  resizable: bool = True, rotatable: bool = True, 
-                 keep_aspect_ratio: bool = False):
+                 keep_aspect_ratio: bool = False, coalesce_updates: bool = False,
+                 preview_min_items: int | None = None, absolute_transforms: bool = False,
+                 group_min_items: int | None = None):
         super().__init__(scene)
         # 変形用の矩形アイテムを初期化
         self.transform_rect_item = TransformRectItem(
@@ -31,12 +37,9 @@ class TransformTool(BaseTool):
         self.transform_rect_item.setZValue(1000)
         # self.scene.addItem(self.transform_rect_item)
         
-        # 状態管理用の変数
-        self.last_transform_rect = None
-        self.last_transform_pos = None
-        self.last_transform_angle = None
         self.original_keep_aspect_ratio = keep_aspect_ratio
-        self.updated_items = []
+        self._initTransformDrag(coalesce_updates=coalesce_updates, absolute_transforms=absolute_transforms,
+                                group_min_items=group_min_items, preview_min_items=preview_min_items)
         
         # シーンの選択変更を監視
         self.scene.selectionChanged.connect(self.onSelectionChanged)
@@ -52,19 +55,28 @@ class TransformTool(BaseTool):
             self.transform_rect_item.setRect(QRectF())
             if self.transform_rect_item.scene() == self.scene:
                 self.scene.removeItem(self.transform_rect_item)
-        self.last_transform_rect = None
-        self.last_transform_pos = None
-        self.last_transform_angle = None
-        self.updated_items = []
+        self._resetTransformDrag()
     
     def onSelectionChanged(self):
         """選択変更時の処理"""
         if self.is_active:
-            self.updateTransformRect()
+            # 選択の増減はシーンの選択範囲の矩形が差分で反映する
+            self.updateTransformRect(remeasure=False)
     
-    def updateTransformRect(self):
-        """変形用矩形の更新"""
-        selected_items = self.scene.selectedItems()
+    def updateTransformRect(self, remeasure: bool = True):
+        """
+        変形用矩形の更新
+
+        Args:
+            remeasure: シーンの選択範囲の矩形をすべて求め直すか（選択の変更時はFalse）
+        """
+        selected_items = self._selectedItems()
+        bounds = getattr(self.scene, 'selection_bounds', None)
+        if remeasure and bounds is not None:
+            # 通知なしに動かされたアイテムがあっても正しい矩形にする
+            bounds.clear()
+        # 選択が変わったため、まだ反映していない変形は破棄する
+        self._resetTransformDrag()
         
         if not selected_items:
             self.transform_rect_item.setVisible(False)
@@ -81,9 +93,6 @@ class TransformTool(BaseTool):
         
         self.transform_rect_item.updateHandlesPos()
         self.transform_rect_item.setVisible(True)
-        self.last_transform_rect = None
-        self.last_transform_pos = None
-        self.last_transform_angle = None
     
     def _updateSingleItemTransform(self, item: QGraphicsItem):
         """単一アイテムの変形矩形更新"""
@@ -172,16 +181,22 @@ class TransformTool(BaseTool):
     
     def _updateMultiItemTransform(self, items: list[QGraphicsItem]):
         """複数アイテムの変形矩形更新"""
-        # 全アイテムを含む矩形を計算
-        rect = items[0].sceneBoundingRect()
-        for item in items[1:]:
-            rect = rect.united(item.sceneBoundingRect())
-        
-        # 回転の有無を確認
-        has_rotation = any(
-            abs(math.degrees(math.atan2(item.transform().m12(), item.transform().m11()))) > 0.1
-            for item in items
-        )
+        bounds = getattr(self.scene, 'selection_bounds', None)
+        if bounds is not None:
+            # シーンが選択の変更・ジオメトリの変更の分だけ更新している矩形と回転の有無を使う
+            rect = bounds.rect()
+            has_rotation = bounds.hasRotation()
+        else:
+            # 全アイテムを含む矩形を計算
+            rect = items[0].sceneBoundingRect()
+            for item in items[1:]:
+                rect = rect.united(item.sceneBoundingRect())
+            
+            # 回転の有無を確認
+            has_rotation = any(
+                abs(math.degrees(math.atan2(item.transform().m12(), item.transform().m11()))) > 0.1
+                for item in items
+            )
         
         # 回転がある場合はアスペクト比を固定
         if has_rotation:
@@ -196,11 +211,9 @@ class TransformTool(BaseTool):
         #     return False
         
         if event.button() == Qt.MouseButton.LeftButton and self.transform_rect_item.isVisible():
-            self.last_transform_rect = self.transform_rect_item.rect()
-            self.last_transform_pos = self.transform_rect_item.pos()
-            self.last_transform_angle = self.transform_rect_item.rotationAngle
-            self.updated_items = []
-            return True
+            self._beginTransformDrag(event.scenePos())
+        # 変形矩形の移動・リサイズ・回転はアイテム自身のマウス処理で行うため、
+        # 処理済みにせずシーン標準のアイテムへの配送を続けさせる
         return False
     
     def mouseMoveEvent(self, event: QGraphicsSceneMouseEvent) -> bool:
@@ -208,42 +221,29 @@ class TransformTool(BaseTool):
         #     return False
         
         if event.buttons() & Qt.MouseButton.LeftButton and self.transform_rect_item.isVisible():
-            current_rect = self.transform_rect_item.rect()
-            current_pos = self.transform_rect_item.pos()
-            current_angle = self.transform_rect_item.rotationAngle
-            
-            self.updated_items = []
-            
-            if self.last_transform_rect and current_rect != self.last_transform_rect:
-                self.updated_items = self._handleTransformRectChanged(
-                    self.last_transform_rect, current_rect)
-            
-            if self.last_transform_pos and current_pos != self.last_transform_pos:
-                self.updated_items = self._handleTransformPosChanged(
-                    self.last_transform_pos, current_pos)
-            
-            if self.last_transform_angle and current_angle != self.last_transform_angle:
-                self.updated_items = self._handleTransformAngleChanged(
-                    self.last_transform_angle, current_angle)
-            
-            self.last_transform_rect = current_rect
-            self.last_transform_pos = current_pos
-            self.last_transform_angle = current_angle
-            return True
+            self._moveTransformDrag()
         return False
+
+    def _dragScene(self) -> QGraphicsScene:
+        return self.scene
+
+    def _dragSelectedItems(self) -> Sequence[QGraphicsItem]:
+        return self._selectedItems()
+
+    def _setSelectionMoving(self, moving: bool) -> None:
+        self.moves_selection = type(self).moves_selection if moving else False
     
     def mouseReleaseEvent(self, event: QGraphicsSceneMouseEvent) -> bool:
         # if not self.transform_rect_item.isUnderMouse():
         #     return False
         
         if event.button() == Qt.MouseButton.LeftButton and self.transform_rect_item.isVisible():
-            if self.updated_items:
-                self.itemsTransformedFinished.emit(self.updated_items)
-            self.last_transform_rect = None
-            self.last_transform_pos = None
-            self.last_transform_angle = None
-            self.updated_items = []
-            return True
+            updated_items = self._finishTransformDrag()
+            if updated_items:
+                # リリース時に動かしたアイテムはシーンのドラッグ中の通知に含まれないため、ここで通知する
+                if hasattr(self.scene, 'notifyGeometryChanged'):
+                    self.scene.notifyGeometryChanged(updated_items)
+                self.itemsTransformedFinished.emit(updated_items)
         return False
     
     def _handleTransformRectChanged(self, old_rect: QRectF, new_rect: QRectF) -> list[QGraphicsItem]:
@@ -257,13 +257,17 @@ class TransformTool(BaseTool):
             self.transform_rect_item.getOppositeHandlePos()
         )
         
-        updated_items: list[QGraphicsItem] = []
-        for item in self.scene.selectedItems():
+        selected_items = self._selectedItems()
+        batch, others = self._transformBatch(selected_items)
+        if batch is not None:
+            batch.scale(scale_x, scale_y, origin)
+            batch.apply()
+        for item in others:
             if isinstance(item, QGraphicsRectItem):
                 self._transformRectItem(item, scale_x, scale_y, origin)
             else:
                 self._transformGenericItem(item, scale_x, scale_y, origin)
-            updated_items.append(item)
+        updated_items: list[QGraphicsItem] = list(selected_items)
         
         if len(updated_items) > 0:
             self.itemsTransformed.emit(updated_items)
@@ -271,17 +275,20 @@ class TransformTool(BaseTool):
     
     def _handleTransformPosChanged(self, old_pos: QPointF, new_pos: QPointF) -> list[QGraphicsItem]:
         """位置変更時の処理"""
-        selected_items = self.scene.selectedItems()
+        selected_items = self._selectedItems()
         if not selected_items:
             return []
 
         global_translate_x = new_pos.x() - old_pos.x()
         global_translate_y = new_pos.y() - old_pos.y()
 
-        updated_items: list[QGraphicsItem] = []
-        for item in selected_items:
+        batch, others = self._transformBatch(selected_items)
+        if batch is not None:
+            batch.translate(global_translate_x, global_translate_y)
+            batch.apply()
+        for item in others:
             item.setPos(item.pos() + QPointF(global_translate_x, global_translate_y))
-            updated_items.append(item)
+        updated_items: list[QGraphicsItem] = list(selected_items)
         
         if len(updated_items) > 0:
             self.itemsMoved.emit(updated_items)
@@ -291,25 +298,31 @@ class TransformTool(BaseTool):
         """回転時の処理"""
         angle_diff = new_angle - old_angle
         transform_center = self.transform_rect_item.transformCenterScenePos()
-        updated_items: list[QGraphicsItem] = []
-        
-        for item in self.scene.selectedItems():
-            item_center = item.mapFromScene(transform_center)
-            rotation_transform = QTransform()
-            rotation_transform.translate(item_center.x(), item_center.y())
-            rotation_transform.rotate(angle_diff)
-            rotation_transform.translate(-item_center.x(), -item_center.y())
-            
-            item.setTransform(item.transform() * rotation_transform)
-            offset = transform_center - item.mapToScene(item_center)
-            item.setPos(item.pos() + offset)
-            
-            updated_items.append(item)
+        selected_items = self._selectedItems()
+        batch, others = self._transformBatch(selected_items)
+        if batch is not None:
+            batch.rotate(angle_diff, transform_center)
+            batch.apply()
+        for item in others:
+            self._rotateItem(item, angle_diff, transform_center)
+        updated_items: list[QGraphicsItem] = list(selected_items)
         
         if len(updated_items) > 0:
             self.itemsRotated.emit(updated_items)
         return updated_items
-    
+
+    def _rotateItem(self, item: QGraphicsItem, angle: float, transform_center: QPointF):
+        """アイテムの回転処理"""
+        item_center = item.mapFromScene(transform_center)
+        rotation_transform = QTransform()
+        rotation_transform.translate(item_center.x(), item_center.y())
+        rotation_transform.rotate(angle)
+        rotation_transform.translate(-item_center.x(), -item_center.y())
+        
+        item.setTransform(item.transform() * rotation_transform)
+        offset = transform_center - item.mapToScene(item_center)
+        item.setPos(item.pos() + offset)
+
     def _transformRectItem(self, item: QGraphicsRectItem, scale_x: float, scale_y: float, origin: QPointF):
         """矩形アイテムの変形処理"""
         current_rect = item.rect()
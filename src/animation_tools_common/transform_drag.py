@@ -0,0 +1,322 @@
+"""
+変形矩形のドラッグを選択アイテムに反映する処理（TransformTool と TransformScene で共通）
+
+ドラッグ中の変形は、設定に応じて次のいずれかの方法で選択アイテムに反映する。
+
+- preview_min_items: 輪郭のプレビューだけを変形し、リリース時にまとめて反映する
+- group_min_items: 選択アイテムを一時的なグループの子にして、グループの変換だけを変更する
+- absolute_transforms: 押した時のアイテムの状態に、押した時からの変形をまとめて適用する
+- 上記以外: 前回反映した時からの変形を差分で適用する
+
+どの方法でも、選択数が KERNEL_MIN_ITEMS 以上の場合は TransformBatch でまとめて変形する。
+"""
+from typing import TYPE_CHECKING, Sequence
+
+from PySide6.QtCore import QPointF, QRectF
+from PySide6.QtGui import QTransform
+from PySide6.QtWidgets import QGraphicsItem, QGraphicsRectItem, QGraphicsScene
+
+from .frame_throttle import FrameThrottle
+from .selection import SelectionBounds
+from .transform_group_item import TransformGroupItem
+from .transform_preview_item import TransformPreviewItem, dragTransform
+
+if TYPE_CHECKING:
+    from .transform_kernel import TransformBatch
+    from .transform_rect_item import TransformRectItem
+
+
+class TransformDragMixin:
+    """
+    変形矩形のドラッグの状態と、選択アイテムへの反映
+
+    QObjectのサブクラスと組み合わせて使う。使用するクラスは transform_rect_item を持ち、
+    _dragScene()・_dragSelectedItems() と、変形矩形の変化を選択アイテムに適用する
+    _handleTransformRectChanged()・_handleTransformPosChanged()・_handleTransformAngleChanged() を実装する。
+    """
+
+    # 選択アイテムがこの数以上の場合、NumPyでまとめて変形する（Noneの場合は常に1つずつ変形）
+    KERNEL_MIN_ITEMS: int | None = 32
+
+    transform_rect_item: 'TransformRectItem'
+
+    def _initTransformDrag(self, coalesce_updates: bool = False, absolute_transforms: bool = False,
+                           group_min_items: int | None = None, preview_min_items: int | None = None) -> None:
+        """ドラッグの状態を初期化（__init__() から呼ぶ）"""
+        self.last_transform_rect: QRectF | None = None
+        self.last_transform_pos: QPointF | None = None
+        self.last_transform_angle: float | None = None
+        self.updated_items: list[QGraphicsItem] = []
+        # Trueの場合、ドラッグ中の変形は1フレームに1回だけ選択アイテムに反映する（リリース時に最終状態を反映）
+        self.coalesce_updates = coalesce_updates
+        self._update_throttle = FrameThrottle(self._onDragMoved, parent=self)
+        # 選択アイテムがこの数以上の場合、ドラッグ中はプレビューだけを変形してリリース時にまとめて反映する
+        # （Noneの場合は常にアイテムを直接変形する）
+        self.preview_min_items = preview_min_items
+        self.preview_item = TransformPreviewItem()
+        self._preview_start: tuple[QTransform, QRectF] | None = None
+        # ドラッグ中に使い回す選択アイテムの配列（_transformBatch()を参照）
+        self._batch: 'TransformBatch | None' = None
+        self._batch_source: Sequence[QGraphicsItem] | None = None
+        self._batch_others: list[QGraphicsItem] = []
+        # Trueの場合、ドラッグ中は押した時のアイテムの状態に押した時からの変形をまとめて適用する
+        # （移動イベントごとの差分を積み重ねないため、イベント数によって計算量と誤差が増えない）
+        self.absolute_transforms = absolute_transforms
+        # 押した時の変形矩形の状態と、TransformBatchで変形しないアイテムの状態
+        self._press_state: tuple[QRectF, QPointF, float] | None = None
+        self._item_snapshot: dict[QGraphicsItem, tuple[QPointF, QTransform, QRectF | None]] = {}
+        # 選択アイテムがこの数以上の場合、ドラッグ中は一時的なグループの変換だけを変更し、
+        # リリース時にグループを解除してアイテムごとに反映する（Noneの場合はグループにしない）
+        self.group_min_items = group_min_items
+        self.group_item = TransformGroupItem()
+        self._group_start: tuple[QTransform, QRectF] | None = None
+
+    # 使用するクラスが実装するメソッド
+
+    def _dragScene(self) -> QGraphicsScene:
+        """変形矩形と選択アイテムのあるシーン"""
+        raise NotImplementedError
+
+    def _dragSelectedItems(self) -> Sequence[QGraphicsItem]:
+        """変形する選択アイテム（ドラッグ中は同じ配列を返すこと）"""
+        raise NotImplementedError
+
+    def _dragSelectionBounds(self) -> SelectionBounds | None:
+        """
+        ドラッグ中の変形を差分で反映する選択アイテム全体の矩形
+
+        変形の適用で選択アイテム全体の矩形を更新しているクラスだけが返す（押した時の状態に戻した分を反映する）。
+        """
+        return None
+
+    def _setSelectionMoving(self, moving: bool) -> None:
+        """ドラッグ中に選択アイテム自身を動かすかどうかの変更（プレビュー中・グループ化中はFalse）"""
+
+    def _handleTransformRectChanged(self, old_rect: QRectF, new_rect: QRectF) -> list[QGraphicsItem]:
+        raise NotImplementedError
+
+    def _handleTransformPosChanged(self, old_pos: QPointF, new_pos: QPointF) -> list[QGraphicsItem]:
+        raise NotImplementedError
+
+    def _handleTransformAngleChanged(self, old_angle: float, new_angle: float) -> list[QGraphicsItem]:
+        raise NotImplementedError
+
+    # ドラッグの開始・移動・終了
+
+    def _beginTransformDrag(self, scene_pos: QPointF) -> None:
+        """
+        変形矩形を押した場合、押した時の状態を保存し、設定に応じてプレビュー・グループ・スナップショットを準備
+
+        変形矩形の外を押した場合（別のアイテムを選択するクリックなど）は何もしない。
+        """
+        item = self.transform_rect_item
+        if not item.isVisible() or not item.contains(item.mapFromScene(scene_pos)):
+            return
+        self.last_transform_rect = self.transform_rect_item.rect()
+        self.last_transform_pos = self.transform_rect_item.pos()
+        self.last_transform_angle = self.transform_rect_item.rotationAngle
+        self.updated_items = []
+        # 前回のドラッグ以降にアイテムが変更されている可能性があるため、配列は集め直す
+        self._batch = None
+        selected_items = self._dragSelectedItems()
+        if self.preview_min_items is not None and len(selected_items) >= self.preview_min_items:
+            self._beginPreview(selected_items)
+        elif (self.group_min_items is not None and len(selected_items) >= self.group_min_items
+              and TransformGroupItem.supports(selected_items)):
+            self._beginGroup(selected_items)
+        elif self.absolute_transforms:
+            self._takeSnapshot(selected_items)
+
+    def _moveTransformDrag(self) -> None:
+        """ドラッグ中の変形矩形の変化を反映（coalesce_updatesの場合は次のフレームにまとめる）"""
+        if self.last_transform_rect is None:
+            # 変形矩形を押していない
+            return
+        if self.coalesce_updates:
+            self._update_throttle.request()
+        else:
+            self._onDragMoved()
+
+    def _finishTransformDrag(self) -> list[QGraphicsItem]:
+        """
+        ドラッグを終了し、反映していない変形を選択アイテムに反映
+
+        移動イベントはアイテムより先に処理するため、最後の移動による変形はここで反映する
+        （プレビュー中・グループ化中は押した時からの変形をまとめて反映する）。
+
+        Returns:
+            ドラッグで変形したアイテム
+        """
+        self._update_throttle.cancel()
+        self._endPreview()
+        self._endGroup()
+        if self.last_transform_rect is not None:
+            self._applyTransformChanges()
+        updated_items = self.updated_items
+        self._resetTransformDrag()
+        return updated_items
+
+    def _resetTransformDrag(self) -> None:
+        """反映していない変形を破棄してドラッグの状態を戻す（選択の変更時など）"""
+        self._update_throttle.cancel()
+        self._endPreview()
+        self._endGroup()
+        self._batch = None
+        self._clearSnapshot()
+        self.last_transform_rect = None
+        self.last_transform_pos = None
+        self.last_transform_angle = None
+        self.updated_items = []
+
+    def _onDragMoved(self) -> None:
+        """ドラッグ中の変形矩形の変化を、プレビュー・グループ・選択アイテムのいずれかに反映"""
+        if self._preview_start is not None:
+            start_transform, start_rect = self._preview_start
+            self.preview_item.setPreviewTransform(start_transform, start_rect,
+                                                  self.transform_rect_item.sceneTransform(),
+                                                  self.transform_rect_item.rect())
+        elif self._group_start is not None:
+            start_transform, start_rect = self._group_start
+            transform = dragTransform(start_transform, start_rect,
+                                      self.transform_rect_item.sceneTransform(), self.transform_rect_item.rect())
+            if transform is not None:
+                self.group_item.setTransform(transform)
+        else:
+            self._applyTransformChanges()
+
+    # プレビュー・グループ
+
+    def _beginPreview(self, items: Sequence[QGraphicsItem]) -> None:
+        """選択アイテムの輪郭からプレビューを作成して表示"""
+        self.preview_item.setSourceItems(items)
+        self._preview_start = (self.transform_rect_item.sceneTransform(), self.transform_rect_item.rect())
+        # プレビュー中は選択アイテムを動かさないため、シーンに移動の通知を省かせる
+        self._setSelectionMoving(False)
+        scene = self._dragScene()
+        if self.preview_item.scene() is not scene:
+            scene.addItem(self.preview_item)
+
+    def _endPreview(self) -> None:
+        """プレビューを非表示にする（選択アイテムへの反映は呼び出し側で行う）"""
+        if self._preview_start is None:
+            return
+        self._preview_start = None
+        self._setSelectionMoving(True)
+        if self.preview_item.scene() is not None:
+            self.preview_item.scene().removeItem(self.preview_item)
+
+    def _beginGroup(self, items: Sequence[QGraphicsItem]) -> None:
+        """選択アイテムを一時的なグループの子にする"""
+        scene = self._dragScene()
+        if self.group_item.scene() is not scene:
+            scene.addItem(self.group_item)
+        self.group_item.collect(items)
+        self._group_start = (self.transform_rect_item.sceneTransform(), self.transform_rect_item.rect())
+        # ドラッグ中はグループだけが動くため、シーンに選択アイテムの移動の通知を省かせる
+        self._setSelectionMoving(False)
+
+    def _endGroup(self) -> None:
+        """グループを解除してアイテムを押した時の状態に戻す（押した時からの変形の反映は呼び出し側で行う）"""
+        if self._group_start is None:
+            return
+        self._group_start = None
+        self._setSelectionMoving(True)
+        self.group_item.release()
+        if self.group_item.scene() is not None:
+            self.group_item.scene().removeItem(self.group_item)
+
+    # 選択アイテムへの反映
+
+    def _takeSnapshot(self, items: Sequence[QGraphicsItem]) -> None:
+        """押した時の変形矩形とアイテムの状態を保存"""
+        self._press_state = (self.last_transform_rect, self.last_transform_pos, self.last_transform_angle)
+        _, others = self._transformBatch(items)
+        self._item_snapshot = {
+            item: (item.pos(), item.transform(), item.rect() if isinstance(item, QGraphicsRectItem) else None)
+            for item in others
+        }
+
+    def _clearSnapshot(self) -> None:
+        self._press_state = None
+        self._item_snapshot = {}
+
+    def _applyAbsoluteTransform(self) -> None:
+        """押した時のアイテムの状態に、押した時からの変形矩形の変化をまとめて適用"""
+        press_rect, press_pos, press_angle = self._press_state
+        selected_items = self._dragSelectedItems()
+        batch, others = self._transformBatch(selected_items)
+        if batch is not None:
+            batch.reset()
+        for item in others:
+            state = self._item_snapshot.get(item)
+            if state is None:
+                continue
+            pos, transform, rect = state
+            if rect is not None:
+                item.setRect(rect)
+            item.setTransform(transform)
+            item.setPos(pos)
+        # 押した時の状態に戻したことを選択アイテム全体の矩形に反映
+        bounds = self._dragSelectionBounds()
+        if bounds is not None:
+            if self.last_transform_pos is not None and self.last_transform_pos != press_pos:
+                bounds.translate(press_pos.x() - self.last_transform_pos.x(),
+                                 press_pos.y() - self.last_transform_pos.y())
+            if self.last_transform_rect != press_rect or self.last_transform_angle != press_angle:
+                bounds.markDirty(selected_items)
+
+        current_rect = self.transform_rect_item.rect()
+        current_pos = self.transform_rect_item.pos()
+        current_angle = self.transform_rect_item.rotationAngle
+        updated_items = None
+        if current_rect != press_rect:
+            updated_items = self._handleTransformRectChanged(press_rect, current_rect)
+        if current_pos != press_pos:
+            updated_items = self._handleTransformPosChanged(press_pos, current_pos)
+        if current_angle != press_angle:
+            updated_items = self._handleTransformAngleChanged(press_angle, current_angle)
+        if updated_items is None:
+            # 押した時の状態に戻った
+            if batch is not None:
+                batch.apply()
+            updated_items = list(selected_items) if self.updated_items else []
+        self.updated_items = updated_items
+        self.last_transform_rect = current_rect
+        self.last_transform_pos = current_pos
+        self.last_transform_angle = current_angle
+
+    def _applyTransformChanges(self) -> None:
+        """前回反映した時からの変形矩形の変化を選択アイテムに反映"""
+        if self._press_state is not None:
+            self._applyAbsoluteTransform()
+            return
+        current_rect = self.transform_rect_item.rect()
+        current_pos = self.transform_rect_item.pos()
+        current_angle = self.transform_rect_item.rotationAngle
+        if self.last_transform_rect is not None and current_rect != self.last_transform_rect:
+            self.updated_items = self._handleTransformRectChanged(self.last_transform_rect, current_rect)
+        if self.last_transform_pos is not None and current_pos != self.last_transform_pos:
+            self.updated_items = self._handleTransformPosChanged(self.last_transform_pos, current_pos)
+        if self.last_transform_angle is not None and current_angle != self.last_transform_angle:
+            self.updated_items = self._handleTransformAngleChanged(self.last_transform_angle, current_angle)
+        self.last_transform_rect = current_rect
+        self.last_transform_pos = current_pos
+        self.last_transform_angle = current_angle
+
+    def _transformBatch(self, items: Sequence[QGraphicsItem]) -> tuple['TransformBatch | None', Sequence[QGraphicsItem]]:
+        """
+        選択アイテムをまとめて変形するためのTransformBatchを取得
+
+        ドラッグ中は同じ選択に対して使い回し、押した時・離した時・選択の変更時に破棄する。
+
+        Returns:
+            (TransformBatch, 1つずつ変形するアイテム)。選択数がKERNEL_MIN_ITEMS未満の場合は (None, items)
+        """
+        if self.KERNEL_MIN_ITEMS is None or len(items) < self.KERNEL_MIN_ITEMS:
+            return None, items
+        # 選択のキャッシュがないシーンでは毎回別のリストになるため、内容も比較する
+        if self._batch is None or (self._batch_source is not items and tuple(self._batch_source) != tuple(items)):
+            from .transform_kernel import TransformBatch
+            self._batch, self._batch_others = TransformBatch.split(items)
+            self._batch_source = items
+        return self._batch, self._batch_others
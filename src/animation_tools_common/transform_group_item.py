@@ -0,0 +1,135 @@
+"""
+複数アイテムを変形する際の一時的なグループ
+
+ドラッグ中に選択アイテムを1つずつ変形すると、移動イベントごとにアイテム数に比例したPythonの処理が発生する。
+押した時に選択アイテムをこのグループの子にしておけば、ドラッグ中はグループの変換行列を1つ変えるだけで、
+子の変換の合成はQtが行う。リリース時にグループを解除してアイテムを元の状態に戻してから、
+押した時からの変形を従来通りアイテムごとに1回だけ反映する。
+"""
+from typing import Sequence
+
+from PySide6.QtCore import QRectF, Qt
+from PySide6.QtGui import QTransform
+from PySide6.QtWidgets import QGraphicsItem, QGraphicsItemGroup
+
+
+class TransformGroupItem(QGraphicsItemGroup):
+    """ドラッグ中だけ選択アイテムを子として持つグループ"""
+
+    def __init__(self):
+        super().__init__()
+        self._members: list[QGraphicsItem] = []
+        # グループの解除後に重なり順を戻すため、各メンバーの直後にあった選択外のアイテム
+        self._following: list[QGraphicsItem | None] = []
+
+    @staticmethod
+    def supports(items: Sequence[QGraphicsItem]) -> bool:
+        """
+        グループにまとめられるか
+
+        親を持つアイテムは親子関係を変えられないため対象外。
+        グループはメンバーの最大のZ値で最前面に描かれるため、重なり順でメンバーの間にある選択外のアイテムが
+        メンバーと重なっている場合も、ドラッグ中だけ重なり順が変わってしまうため対象外とする。
+        """
+        if not all(item.topLevelItem() is item for item in items):
+            return False
+        scene = items[0].scene() if items else None
+        if scene is None:
+            return True
+        members = set(items)
+        bottom_z = min(item.zValue() for item in items)
+        top_z = max(item.zValue() for item in items)
+        bounds = _unitedBounds(items)
+        index = getattr(scene, 'spatial_index', None)
+        if index is not None:
+            # Z値がメンバーの範囲外のアイテムは、重なり順によらずグループの奥か手前に描かれる
+            # （空間インデックスの候補だけで判定できれば、重なり順の取得は省く）
+            if not any(bottom_z <= item.zValue() <= top_z and item not in members
+                       for item in index.itemsInRect(bounds, Qt.ItemSelectionMode.IntersectsItemBoundingRect,
+                                                     selectable_only=False)):
+                return True
+        # 最も奥のメンバーより手前にあり、グループより奥に描かれることになる選択外のアイテムを探す
+        found_member = False
+        for item in _stackedItemsIn(scene, bounds):
+            if item in members:
+                found_member = True
+            elif found_member and item.zValue() <= top_z:
+                return False
+        return True
+
+    def members(self) -> list[QGraphicsItem]:
+        return list(self._members)
+
+    def collect(self, items: Sequence[QGraphicsItem]) -> None:
+        """
+        アイテムをグループの子にする
+
+        グループは変換なしで原点にあるため、アイテムの位置と変換行列はそのまま変わらない。
+        シーンに追加してから呼ぶこと。
+        """
+        self.setTransform(QTransform())
+        self.setPos(0, 0)
+        members = set(items)
+        # 重なり順（昇順）で並べ、各メンバーの直後の選択外のアイテムを記録
+        # （メンバーと重なるアイテムの間の順序だけが見た目に影響するため、メンバーの範囲だけを調べる）
+        ordered: list[QGraphicsItem] = []
+        following: list[QGraphicsItem | None] = []
+        pending = 0
+        for item in _stackedItemsIn(self.scene(), _unitedBounds(items)):
+            if item in members:
+                ordered.append(item)
+                following.append(None)
+                pending += 1
+            elif pending:
+                following[-pending:] = [item] * pending
+                pending = 0
+        # 大きさのないアイテムは範囲の検索に含まれないため、最後に追加する
+        found = set(ordered)
+        for item in items:
+            if item not in found:
+                ordered.append(item)
+                following.append(None)
+        self._members = ordered
+        self._following = following
+        self.setZValue(max(item.zValue() for item in ordered) if ordered else 0)
+        for item in ordered:
+            item.setParentItem(self)
+
+    def release(self) -> list[QGraphicsItem]:
+        """
+        グループの変換を戻し、アイテムをトップレベルに戻す
+
+        Returns:
+            グループに含めていたアイテム（位置と変換行列は collect() した時と同じ）
+        """
+        self.setTransform(QTransform())
+        members = self._members
+        for item in members:
+            item.setParentItem(None)
+        # トップレベルに戻したアイテムは最前面に追加されるため、元の重なり順に戻す
+        for item, following in zip(members, self._following):
+            if following is not None and following.scene() is item.scene():
+                item.stackBefore(following)
+        self._members = []
+        self._following = []
+        return members
+
+
+def _unitedBounds(items: Sequence[QGraphicsItem]) -> QRectF:
+    """アイテム全体のシーン上のバウンディング矩形"""
+    bounds = QRectF()
+    for item in items:
+        bounds = bounds.united(item.sceneBoundingRect())
+    return bounds
+
+
+def _stackedItemsIn(scene, rect: QRectF) -> list[QGraphicsItem]:
+    """
+    範囲に重なるトップレベルアイテムを重なり順（昇順）で取得（グループ自身は除く）
+
+    空間インデックスは stackBefore() による重なり順を持たないため、Qtのアイテムインデックスで範囲を検索する
+    （インデックスなしのシーンでは items(order) は並べ替えないため、範囲を指定して取得する）。
+    """
+    return [item for item in scene.items(rect, Qt.ItemSelectionMode.IntersectsItemBoundingRect,
+                                         Qt.SortOrder.AscendingOrder)
+            if item.topLevelItem() is item and not isinstance(item, TransformGroupItem)]
@@ -0,0 +1,192 @@
+"""
+選択アイテムの変形をまとめて計算するカーネル
+
+TransformTool/TransformScene はドラッグ中の移動イベントごとに、アイテム1つずつ
+mapFromScene や QTransform の生成・合成を行っていた。
+ここではドラッグの開始時に位置・矩形・変換行列をNumPy配列に一度だけ集め、
+拡大縮小・回転・移動の結果を全アイテム分まとめて計算してからアイテムに書き戻す。
+
+計算は TransformTool._transformRectItem / _transformGenericItem / _handleTransformAngleChanged と同じ式で、
+結果は浮動小数点の誤差の範囲で一致する。
+
+変換行列はQtと同じ行ベクトルの規約の (N, 3, 3) の配列で、
+[[m11, m12, 0], [m21, m22, 0], [dx, dy, 1]] の形で持つ。
+"""
+from typing import Iterable
+
+import numpy as np
+from PySide6.QtCore import QPointF, QRectF
+from PySide6.QtGui import QTransform
+from PySide6.QtWidgets import QGraphicsItem, QGraphicsRectItem
+
+
+def _translations(offsets: np.ndarray) -> np.ndarray:
+    """(N, 2) の移動量から (N, 3, 3) の平行移動の行列を作る"""
+    matrices = np.zeros((len(offsets), 3, 3))
+    matrices[:, 0, 0] = matrices[:, 1, 1] = matrices[:, 2, 2] = 1.0
+    matrices[:, 2, :2] = offsets
+    return matrices
+
+
+def _mapPoint(point: QPointF, matrices: np.ndarray) -> np.ndarray:
+    """1つの点を各行列で写した (N, 2) の配列"""
+    return (np.array([point.x(), point.y(), 1.0]) @ matrices)[:, :2]
+
+
+class TransformBatch:
+    """
+    選択アイテムの位置・矩形・変換行列をまとめた配列
+
+    対象は親を持たず、変換行列が射影変換でなく逆行列を持つアイテムだけ。
+    それ以外のアイテムは split() で分けて、従来通り1つずつ変形すること。
+    配列は変形のたびに更新されるため、ドラッグ中は同じインスタンスを使い続けられる
+    （ドラッグ中にツール以外がアイテムを変更する場合は作り直すこと）。
+    """
+
+    def __init__(self, items: Iterable[QGraphicsItem]):
+        self.items = list(items)
+        n = len(self.items)
+        self.is_rect = np.zeros(n, dtype=bool)
+        self.pos = np.zeros((n, 2))
+        self.size = np.zeros((n, 2))
+        self.rotation = np.zeros(n)
+        self.transform = np.zeros((n, 3, 3))
+        scene_transform = np.zeros((n, 3, 3))
+        for i, item in enumerate(self.items):
+            t = item.transform()
+            st = item.sceneTransform()
+            p = item.pos()
+            self.transform[i] = ((t.m11(), t.m12(), 0.0), (t.m21(), t.m22(), 0.0), (t.dx(), t.dy(), 1.0))
+            scene_transform[i] = ((st.m11(), st.m12(), 0.0), (st.m21(), st.m22(), 0.0), (st.dx(), st.dy(), 1.0))
+            self.pos[i] = (p.x(), p.y())
+            self.rotation[i] = item.rotation()
+            if isinstance(item, QGraphicsRectItem):
+                r = item.rect()
+                self.is_rect[i] = True
+                self.size[i] = (r.width(), r.height())
+        # sceneTransform = (rotation()/scale()による変換) × transform × 位置への平行移動
+        # のうち、ドラッグ中に変わらない先頭の部分を求めておく
+        self._properties = scene_transform @ _translations(-self.pos) @ np.linalg.inv(self.transform)
+        self._rects_changed = False
+        self._transforms_changed = False
+        # reset() で戻す作成時の状態
+        self._initial = (self.pos.copy(), self.size.copy(), self.transform.copy())
+
+    @staticmethod
+    def supports(item: QGraphicsItem) -> bool:
+        """配列でまとめて変形できるアイテムか"""
+        if item.topLevelItem() is not item:
+            return False
+        t = item.transform()
+        return t.isAffine() and t.determinant() != 0 and item.sceneTransform().isAffine()
+
+    @classmethod
+    def split(cls, items: Iterable[QGraphicsItem]) -> tuple['TransformBatch', list[QGraphicsItem]]:
+        """
+        アイテムを、まとめて変形できるものとそれ以外に分ける
+
+        Returns:
+            (まとめて変形するアイテムのTransformBatch, 1つずつ変形するアイテムのリスト)
+        """
+        batched: list[QGraphicsItem] = []
+        others: list[QGraphicsItem] = []
+        for item in items:
+            (batched if cls.supports(item) else others).append(item)
+        return cls(batched), others
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def _sceneTransforms(self) -> np.ndarray:
+        return self._properties @ self.transform @ _translations(self.pos)
+
+    def scale(self, scale_x: float, scale_y: float, origin: QPointF) -> None:
+        """
+        シーン座標のoriginを基準に拡大縮小
+
+        矩形アイテムは矩形の大きさと位置、それ以外のアイテムは変換行列を変更する。
+        """
+        if not len(self.items):
+            return
+        local = _mapPoint(origin, np.linalg.inv(self._sceneTransforms()))
+        factors = np.array([scale_x, scale_y])
+
+        rect = self.is_rect
+        if rect.any():
+            self.size[rect] *= factors
+            angle = np.arctan2(self.transform[rect, 0, 1], self.transform[rect, 0, 0])
+            cos, sin = np.cos(angle), np.sin(angle)
+            delta = local[rect] * (factors - 1)
+            self.pos[rect, 0] -= delta[:, 0] * cos - delta[:, 1] * sin
+            self.pos[rect, 1] -= delta[:, 0] * sin + delta[:, 1] * cos
+            self._rects_changed = True
+
+        generic = ~rect
+        if generic.any():
+            radians = np.radians(self.rotation[generic])
+            cos, sin = np.cos(radians), np.sin(radians)
+            # アイテムの回転に合わせた拡大率（_transformGenericItemと同じ式）
+            item_scale = np.stack((scale_x * cos - scale_y * sin, scale_x * sin + scale_y * cos), axis=1)
+            scaling = np.zeros((len(item_scale), 3, 3))
+            scaling[:, 0, 0] = item_scale[:, 0]
+            scaling[:, 1, 1] = item_scale[:, 1]
+            scaling[:, 2, :2] = local[generic] * (1 - item_scale)
+            scaling[:, 2, 2] = 1.0
+            self.transform[generic] = scaling @ self.transform[generic]
+            self._transforms_changed = True
+
+    def rotate(self, angle: float, center: QPointF) -> None:
+        """シーン座標のcenterを中心に、angle度回転"""
+        if not len(self.items):
+            return
+        local = _mapPoint(center, np.linalg.inv(self._sceneTransforms()))
+        radians = np.radians(angle)
+        cos, sin = np.cos(radians), np.sin(radians)
+        rotation = np.array([[cos, sin, 0.0], [-sin, cos, 0.0], [0.0, 0.0, 1.0]])
+        # ローカル座標のcenterを中心とした回転を、現在の変換行列の後に掛ける
+        self.transform = self.transform @ (_translations(-local) @ rotation @ _translations(local))
+        self._transforms_changed = True
+        # 回転後もcenterがシーン上の同じ位置に来るよう、位置をずらす
+        moved = (np.concatenate((local, np.ones((len(local), 1))), axis=1)[:, None, :]
+                 @ self._sceneTransforms())[:, 0, :2]
+        self.pos += np.array([center.x(), center.y()]) - moved
+
+    def reset(self) -> None:
+        """
+        配列を作成時の状態に戻す
+
+        押した時の状態に、押した時からの変形をまとめて適用する場合に使う。
+        アイテムへの書き戻しは apply() で行う。
+        """
+        pos, size, transform = self._initial
+        if not np.array_equal(self.size, size):
+            self._rects_changed = True
+        if not np.array_equal(self.transform, transform):
+            self._transforms_changed = True
+        self.pos[:] = pos
+        self.size[:] = size
+        self.transform[:] = transform
+
+    def translate(self, dx: float, dy: float) -> None:
+        """位置を移動"""
+        self.pos += (dx, dy)
+
+    def apply(self) -> list[QGraphicsItem]:
+        """
+        計算結果をアイテムに書き戻す
+
+        Returns:
+            変形したアイテム
+        """
+        if self._rects_changed:
+            rect_items = [item for item, is_rect in zip(self.items, self.is_rect.tolist()) if is_rect]
+            for item, (width, height) in zip(rect_items, self.size[self.is_rect].tolist()):
+                item.setRect(QRectF(0, 0, width, height))
+        if self._transforms_changed:
+            for item, ((m11, m12, _), (m21, m22, _), (dx, dy, _)) in zip(self.items, self.transform.tolist()):
+                item.setTransform(QTransform(m11, m12, m21, m22, dx, dy))
+        for item, (x, y) in zip(self.items, self.pos.tolist()):
+            item.setPos(x, y)
+        self._rects_changed = False
+        self._transforms_changed = False
+        return list(self.items)
@@ -0,0 +1,77 @@
+"""
+多数のアイテムを変形する際のプレビュー
+
+ドラッグ中に数百のアイテムを毎回変形すると、インデックスの更新と再描画がアイテム数に比例して発生する。
+プレビュー中は選択アイテムの輪郭を1つのパスにまとめたアイテムだけを変形し、
+実際のアイテムはリリース時に1回だけ変形する。
+"""
+from typing import Iterable
+
+from PySide6.QtCore import QRectF, Qt
+from PySide6.QtGui import QColor, QPainterPath, QPen, QTransform
+from PySide6.QtWidgets import QGraphicsItem, QGraphicsPathItem
+
+
+def dragTransform(start_transform: QTransform, start_rect: QRectF,
+                  current_transform: QTransform, current_rect: QRectF) -> QTransform | None:
+    """
+    変形矩形の開始時から現在までの変形（シーン座標）
+
+    Args:
+        start_transform: 開始時の変形矩形のsceneTransform()
+        start_rect: 開始時の変形矩形のrect()
+        current_transform: 現在の変形矩形のsceneTransform()
+        current_rect: 現在の変形矩形のrect()
+
+    Returns:
+        開始時の変形矩形が逆変換できない場合はNone
+    """
+    # 変形矩形のローカル座標で、開始時の矩形を現在の矩形に写す
+    rect_map = QTransform()
+    if start_rect.width() != 0 and start_rect.height() != 0:
+        rect_map = (QTransform.fromTranslate(-start_rect.left(), -start_rect.top())
+                    * QTransform.fromScale(current_rect.width() / start_rect.width(),
+                                           current_rect.height() / start_rect.height())
+                    * QTransform.fromTranslate(current_rect.left(), current_rect.top()))
+    inverse, invertible = start_transform.inverted()
+    if not invertible:
+        return None
+    # シーン座標 -> 開始時のローカル座標 -> 現在のローカル座標 -> シーン座標
+    return inverse * rect_map * current_transform
+
+
+class TransformPreviewItem(QGraphicsPathItem):
+    """選択アイテムの輪郭をまとめたプレビュー用のアイテム"""
+
+    def __init__(self):
+        super().__init__()
+        pen = QPen(QColor(0, 120, 215), 1, Qt.PenStyle.DashLine)
+        pen.setCosmetic(True)
+        self.setPen(pen)
+        self.setBrush(QColor(0, 120, 215, 30))
+        # 変形中は描画済みの画像を変形して表示し、輪郭を描き直さない
+        self.setCacheMode(QGraphicsItem.CacheMode.ItemCoordinateCache)
+        self.setZValue(999)  # 変形矩形のすぐ下に表示
+
+    def setSourceItems(self, items: Iterable[QGraphicsItem]) -> None:
+        """アイテムの現在の輪郭（シーン座標）からプレビューを作成"""
+        path = QPainterPath()
+        for item in items:
+            path.addPolygon(item.mapToScene(item.boundingRect()))
+        self.setPath(path)
+        self.setTransform(QTransform())
+
+    def setPreviewTransform(self, start_transform: QTransform, start_rect: QRectF,
+                            current_transform: QTransform, current_rect: QRectF) -> None:
+        """
+        変形矩形の開始時から現在までの変形をプレビューに適用
+
+        Args:
+            start_transform: 開始時の変形矩形のsceneTransform()
+            start_rect: 開始時の変形矩形のrect()
+            current_transform: 現在の変形矩形のsceneTransform()
+            current_rect: 現在の変形矩形のrect()
+        """
+        transform = dragTransform(start_transform, start_rect, current_transform, current_rect)
+        if transform is not None:
+            self.setTransform(transform)
@@ -1,11 +1,45 @@
 import sys
 from typing import Any
-from PySide6.QtCore import Qt, QRectF, QPointF, QLineF 
-from PySide6.QtGui import QBrush, QPainterPath, QPainter, QColor, QPen, QPixmap, QTransform
-from PySide6.QtWidgets import (QGraphicsRectItem, QApplication, QGraphicsView, QGraphicsSceneHoverEvent,
+from PySide6.QtCore import Qt, QRectF, QPointF
+from PySide6.QtGui import QBrush, QPainterPath, QPainter, QColor, QPen, QPixmap, QPixmapCache, QTransform
+from PySide6.QtWidgets import (QGraphicsRectItem, QApplication, QGraphicsView, QGraphicsSceneHoverEvent, QGraphicsSceneEvent,
                                QGraphicsSceneMouseEvent, QGraphicsScene, QGraphicsItem, QStyleOptionGraphicsItem, QWidget, QVBoxLayout, QPushButton, QCheckBox)
 import math
 
+from .view_lod import eventLod, viewLod
+
+_pen_cache: dict[tuple[int, float], QPen] = {}
+_brush_cache: dict[int, QBrush] = {}
+
+
+def _cachedPen(color: QColor, width: float) -> QPen:
+    """色と太さごとに使い回すペン"""
+    key = (color.rgba(), width)
+    pen = _pen_cache.get(key)
+    if pen is None:
+        if len(_pen_cache) > 256:
+            _pen_cache.clear()
+        pen = _pen_cache[key] = QPen(color, width)
+    return pen
+
+
+def _cachedBrush(color: QColor) -> QBrush:
+    """色ごとに使い回すブラシ"""
+    brush = _brush_cache.get(color.rgba())
+    if brush is None:
+        brush = _brush_cache[color.rgba()] = QBrush(color)
+    return brush
+
+
+def _pixelPhase(value: float) -> tuple[int, int]:
+    """座標を整数ピクセルと1/4ピクセル単位の端数（0〜3）に分ける"""
+    pixel = math.floor(value)
+    phase = round((value - pixel) * 4)
+    if phase == 4:
+        return pixel + 1, 0
+    return pixel, phase
+
+
 class TransformRectItem(QGraphicsRectItem):
     handleTopLeft      = 1
     handleTopMiddle    = 2
@@ -18,9 +52,21 @@ class TransformRectItem(QGraphicsRectItem):
     handleTransformCenter     = 9
     handleRotate = 10
 
+    _resize_handles = (handleTopLeft, handleTopMiddle, handleTopRight, handleMiddleLeft, handleMiddleRight,
+                       handleBottomLeft, handleBottomMiddle, handleBottomRight)
+    _rotate_handles = (handleRotate, handleTransformCenter)
+    _middle_handles = (handleTopMiddle, handleMiddleLeft, handleMiddleRight, handleBottomMiddle)
+
     handleSize  = +8.0
     handleSpace = -4.0
 
+    # ハンドルを描画済みのグリフ（QPixmapCache）で描画するか
+    use_glyph_cache = True
+    # グリフにする最大の直径（デバイスピクセル）。これより大きい回転ハンドルの円は直接描画する
+    GLYPH_MAX_SIZE = 256
+    # 保存しておくLODごとのハンドルの配置の数（ビューの数程度あれば十分）
+    MAX_HANDLE_LAYOUTS = 8
+
     handleCursors: dict[int, Qt.CursorShape] = {
         handleTopLeft:      Qt.CursorShape.SizeFDiagCursor,
         handleTopMiddle:    Qt.CursorShape.SizeVerCursor,
@@ -50,14 +96,29 @@ class TransformRectItem(QGraphicsRectItem):
     def __init__(self, *args: Any, movable: bool = True, resizable: bool = True, rotatable: bool = True, 
                  keep_aspect_ratio: bool = False, bound_rect: QRectF | None = None):
         super().__init__(*args)
+        # boundingRect()/shape() のキャッシュ（矩形・回転中心・LOD・操作可否が変わった時に破棄）
+        self._bounding_rect_cache: QRectF | None = None
+        self._shape_cache: QPainterPath | None = None
+        self._transform_center_offset = QPointF(0, 0)
+        # handleAt() 用の当たり判定の表（ハンドルの位置・LOD・操作可否が変わった時に破棄）
+        self._handle_table: list[tuple] | None = None
+        self._handle_lod: float | None = None  # ハンドルの位置を計算した時のLOD
+        # LODごとのハンドルの配置 (LOD, handles, handleAt() の表, shape())。ビューごとにLODが異なる場合に使い回す
+        self._handle_layouts: dict[float, tuple] = {}
+        self._hover_cursor: Qt.CursorShape | None = None  # ホバー中に最後に設定したカーソル
+        # paint() で使い回す線の色・ペン・塗りつぶし
+        self._paint_style_key: tuple | None = None
+        self._paint_style: tuple[QColor, QPen, QBrush] | None = None
         self.handles: dict[int, QRectF] = {}
         self.handleSelected: int | None = None
         self.mousePressPos: QPointF | None = None
         self.mousePressRect: QRectF | None = None
+        # 押した時の変換行列と回転角度（interactiveRotate() は押した時からの回転をまとめて適用する）
+        self.mousePressTransform: QTransform | None = None
+        self.mousePressAngle: float = 0
         self.setAcceptHoverEvents(True)
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, movable)
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemSendsGeometryChanges, True)
-        self.transformCenterOffset = QPointF(0, 0)
         self.rotationAngle = 0
         self.tolerance = 2
         self.adjust_size = 3
@@ -67,73 +128,117 @@ class TransformRectItem(QGraphicsRectItem):
         self.resizable = resizable
         self.rotatable = rotatable
         self.keep_aspect_ratio = keep_aspect_ratio
-        self._last_lod = 1.0  # 最後のLOD値を保存する変数を追加
         self.bound_rect = bound_rect  # 制限範囲を保存
     
+    @property
+    def transformCenterOffset(self) -> QPointF:
+        """矩形の中心から回転中心までのオフセット"""
+        return self._transform_center_offset
+
+    @transformCenterOffset.setter
+    def transformCenterOffset(self, offset: QPointF):
+        if offset == self._transform_center_offset:
+            return
+        # 回転ハンドルの位置が変わるため、バウンディング矩形も変わる
+        self.prepareGeometryChange()
+        self._transform_center_offset = QPointF(offset)
+        self._invalidateGeometryCache()
+
+    def setRect(self, *args) -> None:
+        super().setRect(*args)
+        self._invalidateGeometryCache()
+
+    def _invalidateGeometryCache(self) -> None:
+        """boundingRect()/shape()/handleAt() のキャッシュを破棄"""
+        self._bounding_rect_cache = None
+        self._shape_cache = None
+        self._handle_table = None
+        self._handle_layouts.clear()
+
     def setMovable(self, movable: bool):
         self.movable = movable
+        self._invalidateGeometryCache()
         self.update()
     
     def setResizable(self, resizable: bool):
         self.resizable = resizable
+        self._invalidateGeometryCache()
         self.update()
     
     def setRotatable(self, rotatable: bool):
         self.rotatable = rotatable
+        self._invalidateGeometryCache()
         self.update()
     
     def setKeepAspectRatio(self, keep_aspect_ratio: bool):
         self.keep_aspect_ratio = keep_aspect_ratio
+        self._invalidateGeometryCache()
         self.update()
 
     def handleAt(self, point: QPointF):
+        x, y = point.x(), point.y()
+        for handle, left, top, right, bottom, radius, tolerance in self._handleHitTable():
+            if radius is None:
+                # 矩形のハンドル
+                if left <= x <= right and top <= y <= bottom:
+                    return handle
+            else:
+                # 回転ハンドルの場合、円周上の判定を行う（left, top は円の中心）
+                if abs(math.hypot(x - left, y - top) - radius) <= tolerance:
+                    return handle
+        return None
+
+    def _handleHitTable(self) -> list[tuple]:
+        """
+        有効なハンドルの当たり判定の表
+
+        ハンドルの位置・LOD・操作可否が変わるまで使い回す。
+        矩形のハンドルは (ハンドル, 左, 上, 右, 下, None, None)、
+        回転ハンドルは (ハンドル, 中心x, 中心y, 0, 0, 半径, 許容誤差) の形式。
+        """
+        if self._handle_table is not None:
+            return self._handle_table
+        table = []
         for k, v in self.handles.items():
-            # 移動不可かつスケール不可の場合のみ、リサイズハンドルを無効化
-            if not self.movable and not self.resizable and k not in [self.handleRotate, self.handleTransformCenter]:
-                continue
-                
-            # スケール不可の場合はリサイズハンドルを無効化
-            if not self.resizable and k in [
-                self.handleTopLeft, self.handleTopMiddle, self.handleTopRight,
-                self.handleMiddleLeft, self.handleMiddleRight,
-                self.handleBottomLeft, self.handleBottomMiddle, self.handleBottomRight
-            ]:
+            if not self._handleEnabled(k):
                 continue
-                
-            # 回転不可の場合は回転関連ハンドルを無効化
-            if not self.rotatable and k in [self.handleRotate, self.handleTransformCenter]:
-                continue
-                
-            # アスペクト比維持モードの場合、中間ハンドルの検出をスキップ
-            if self.keep_aspect_ratio and k in [
-                self.handleTopMiddle, self.handleMiddleLeft, 
-                self.handleMiddleRight, self.handleBottomMiddle
-            ]:
-                continue
-            
+
             if k == self.handleRotate:
-                # 回転ハンドルの場合、円周上の判定を行う
-                lod = self.get_lod()
                 center = v.center()
-                radius = v.width() / 2
-                distance = QLineF(center, point).length()
-                tolerance = self.tolerance / lod
-                if abs(distance - radius) <= tolerance:
-                    return k
+                table.append((k, center.x(), center.y(), 0.0, 0.0, v.width() / 2, self.tolerance / self._handle_lod))
             else:
-                # その他のハンドルの場合、矩形の判定を行う
                 enlarged = v.adjusted(-self.adjust_size, -self.adjust_size, self.adjust_size, self.adjust_size)
-                if enlarged.contains(point):
-                    return k
-        return None
+                table.append((k, enlarged.left(), enlarged.top(), enlarged.right(), enlarged.bottom(), None, None))
+        self._handle_table = table
+        return table
+
+    def _handleEnabled(self, handle: int) -> bool:
+        """ハンドルが操作可否・アスペクト比の設定で有効か（当たり判定と shape() で共通）"""
+        # 移動不可かつスケール不可の場合のみ、リサイズハンドルを無効化
+        if not self.movable and not self.resizable and handle not in self._rotate_handles:
+            return False
+        # スケール不可の場合はリサイズハンドルを無効化
+        if not self.resizable and handle in self._resize_handles:
+            return False
+        # 回転不可の場合は回転関連ハンドルを無効化
+        if not self.rotatable and handle in self._rotate_handles:
+            return False
+        # アスペクト比維持モードの場合、中間ハンドルを無効化
+        if self.keep_aspect_ratio and handle in self._middle_handles:
+            return False
+        return True
 
     def hoverMoveEvent(self, event: QGraphicsSceneHoverEvent):
+        self._useEventLod(event)
         handle = self.handleAt(event.pos())
         if handle is None:
-            self.setCursor(Qt.CursorShape.SizeAllCursor)  # 十字矢印のカーソル
+            cursor = Qt.CursorShape.SizeAllCursor  # 十字矢印のカーソル
         else:
             cursor = self.handleCursors[handle]
+        # カーソルの設定はウィジェットまで伝わるため、変わった時だけ設定する
+        if cursor != self._hover_cursor:
             self.setCursor(cursor)
+            self._hover_cursor = cursor
         super().hoverMoveEvent(event)
 
     def hoverEnterEvent(self, event: QGraphicsSceneHoverEvent):
@@ -141,13 +246,17 @@ class TransformRectItem(QGraphicsRectItem):
 
     def hoverLeaveEvent(self, event: QGraphicsSceneHoverEvent):
         self.setCursor(Qt.CursorShape.ArrowCursor)
+        self._hover_cursor = Qt.CursorShape.ArrowCursor
         super().hoverLeaveEvent(event)
 
     def mousePressEvent(self, event: QGraphicsSceneMouseEvent):
+        self._useEventLod(event)
         self.handleSelected = self.handleAt(event.pos())
         if self.handleSelected:
             self.mousePressPos  = event.pos()
             self.mousePressRect = self.rect() #self.boundingRect()
+            self.mousePressTransform = self.transform()
+            self.mousePressAngle = self.rotationAngle
         super().mousePressEvent(event)
 
     def mouseMoveEvent(self, event: QGraphicsSceneMouseEvent):
@@ -180,9 +289,16 @@ class TransformRectItem(QGraphicsRectItem):
         self.handleSelected = None
         self.mousePressPos  = None
         self.mousePressRect = None
+        self.mousePressTransform = None
         self.update()
 
     def boundingRect(self):
+        # interactiveResize() などが戻り値を書き換えるため、キャッシュのコピーを返す
+        if self._bounding_rect_cache is None:
+            self._bounding_rect_cache = self._computeBoundingRect()
+        return QRectF(self._bounding_rect_cache)
+
+    def _computeBoundingRect(self) -> QRectF:
         o = self.handleSize + self.handleSpace
         r = self.rect()
         br = QRectF(r.left() - o, r.top() - o,
@@ -205,12 +321,44 @@ class TransformRectItem(QGraphicsRectItem):
         return br
 
     def updateHandlesPos(self, keep_transform_center: bool = False):
-        # LODを取得
-        lod = self.get_lod()
-        
+        # 矩形や回転中心が変わったため、他のLODの配置も破棄して現在のLODで計算し直す
+        self._handle_layouts.clear()
+        self._layoutHandles(self.get_lod(), keep_transform_center)
+
+    def _useLod(self, lod: float):
+        """
+        ハンドルの配置を指定のLODのものに切り替える
+
+        複数のビューを交互に描画しても計算し直さないよう、切り替える前の配置はLODごとに保存しておく。
+        """
+        current = self._handle_lod
+        if current is not None:
+            if abs(lod - current) <= 0.001:
+                return
+            if len(self._handle_layouts) >= self.MAX_HANDLE_LAYOUTS:
+                self._handle_layouts.clear()
+            self._handle_layouts[round(current, 3)] = (current, self.handles, self._handle_table, self._shape_cache)
+        layout = self._handle_layouts.get(round(lod, 3))
+        if layout is None:
+            self._layoutHandles(lod)
+        else:
+            self._handle_lod, self.handles, self._handle_table, self._shape_cache = layout
+
+    def _useEventLod(self, event: QGraphicsSceneEvent):
+        """イベントを送ったビューのLODでハンドルを配置する"""
+        lod = eventLod(self, event)
+        if lod is not None:
+            self._useLod(lod)
+
+    def _layoutHandles(self, lod: float, keep_transform_center: bool = False):
+        """指定のLODでハンドルの位置を計算"""
         # LODに応じてハンドルサイズを調整
         s = self.handleSize / lod
         r = self.rect()
+        # 保存済みの配置を書き換えないよう、新しい辞書に計算する
+        previous = self.handles
+        self.handles = {}
+        self._handle_lod = lod
         
         self.handles[self.handleTopLeft]      = QRectF(r.left() - s / 2, r.top() - s / 2, s, s)
         self.handles[self.handleTopMiddle]    = QRectF(r.center().x() - s / 2, r.top() - s / 2, s, s)
@@ -223,7 +371,7 @@ class TransformRectItem(QGraphicsRectItem):
         
         # 回転中心ハンドルの位置を更新
         if keep_transform_center:
-            old_center = self.handles[self.handleTransformCenter].center()
+            old_center = previous[self.handleTransformCenter].center()
             new_center = r.center()
             self.transformCenterOffset = old_center - new_center
             transformCenterPos = new_center + self.transformCenterOffset
@@ -244,6 +392,8 @@ class TransformRectItem(QGraphicsRectItem):
             transformCenterPos.y() - radius / 2,
             radius, radius
         )
+        self._shape_cache = None
+        self._handle_table = None
         self.updateHandleCursors()
 
     def updateHandleCursors(self):
@@ -422,33 +572,19 @@ class TransformRectItem(QGraphicsRectItem):
         self.updateHandlesPos(keep_transform_center=keep_transform_center)
 
     def shape(self):
+        # QPainterPathは暗黙共有のため、コピーしても要素は複製されない
+        if self._shape_cache is None:
+            self._shape_cache = self._computeShape()
+        return QPainterPath(self._shape_cache)
+
+    def _computeShape(self) -> QPainterPath:
         path = QPainterPath()
         path.addRect(self.rect())
         
         # ハンドル用のサブパスを作成
         handles_path = QPainterPath()
         for handle, rect in self.handles.items():
-            # 移動不可かつスケール不可の場合のみ、リサイズハンドルを無効化
-            if not self.movable and not self.resizable and handle not in [self.handleRotate, self.handleTransformCenter]:
-                continue
-                
-            # スケール不可の場合はリサイズハンドルを無効化
-            if not self.resizable and handle in [
-                self.handleTopLeft, self.handleTopMiddle, self.handleTopRight,
-                self.handleMiddleLeft, self.handleMiddleRight,
-                self.handleBottomLeft, self.handleBottomMiddle, self.handleBottomRight
-            ]:
-                continue
-                
-            # 回転不可の場合は回転関連ハンドルを無効化
-            if not self.rotatable and handle in [self.handleRotate, self.handleTransformCenter]:
-                continue
-                
-            # アスペクト比維持モードの場合、中間ハンドルをスキップ
-            if self.keep_aspect_ratio and handle in [
-                self.handleTopMiddle, self.handleMiddleLeft, 
-                self.handleMiddleRight, self.handleBottomMiddle
-            ]:
+            if not self._handleEnabled(handle):
                 continue
 
             if handle == self.handleRotate:
@@ -468,61 +604,143 @@ class TransformRectItem(QGraphicsRectItem):
         return path
 
     def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget: QWidget | None = None):
-        # 現在のLODを取得
-        current_lod = self.get_lod()
-        
-        # LODが変化した場合、ハンドルの位置を更新
-        if abs(current_lod - self._last_lod) > 0.001:
-            self.updateHandlesPos()
-            self._last_lod = current_lod
+        # 描画中のビューのLODを取得し、LODが変化した場合はハンドルの配置を切り替える
+        current_lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        self._useLod(current_lod)
+        current_lod = self._handle_lod
 
         # デバッグモードの場合は赤い半透明の塗りつぶし、それ以外は透明
-        if self.debug_mode:
-            painter.setBrush(QBrush(QColor(255, 0, 0, 100)))
-        else:
-            painter.setBrush(Qt.BrushStyle.NoBrush)
-
         # 矩形の線の色を設定（デバッグモードでない場合は青系の色を使用）
-        line_color = QColor(0, 0, 0) if self.debug_mode else QColor(0, 120, 215)
-        line_width = self.tolerance / current_lod
-        painter.setPen(QPen(line_color, line_width, Qt.PenStyle.SolidLine))
+        line_color, line_pen, fill_brush = self._paintStyle(current_lod)
+        line_width = line_pen.widthF()
+        painter.setBrush(fill_brush)
+        painter.setPen(line_pen)
         painter.drawRect(self.rect())
 
         if self.resizable or self.rotatable:
             painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            glyph_scale = self._glyphScale(painter) if self.use_glyph_cache else None
+            blits: list[tuple[int, int, QPixmap]] = []
             for handle, rect in self.handles.items():
                 # アスペクト比維持モードの場合、中間ハンドルをスキップ
-                if self.keep_aspect_ratio and handle in [self.handleTopMiddle, self.handleMiddleLeft, 
-                                                       self.handleMiddleRight, self.handleBottomMiddle]:
+                if self.keep_aspect_ratio and handle in self._middle_handles:
                     continue
                 
                 # 回転不可の場合、回転関連ハンドルをスキップ
-                if not self.rotatable and handle in [self.handleRotate, self.handleTransformCenter]:
+                if not self.rotatable and handle in self._rotate_handles:
                     continue
 
                 if self.handleSelected is None or handle == self.handleSelected:
+                    # デバッグモードでない場合は矩形と同じ色を使用
+                    handle_color = self.handleColors[handle] if self.debug_mode else line_color
                     if handle == self.handleRotate and self.rotatable:
-                        painter.setBrush(Qt.BrushStyle.NoBrush)
-                        # デバッグモードでない場合は矩形と同じ色を使用
-                        handle_color = self.handleColors[handle] if self.debug_mode else line_color
-                        painter.setPen(QPen(handle_color, line_width))
-                        painter.drawEllipse(rect)
+                        # 円周のみ（塗りつぶしなし）
+                        pen_color, brush_color = handle_color, None
                     elif handle == self.handleTransformCenter and self.rotatable:
-                        # デバッグモードでない場合は矩形と同じ色を使用
-                        handle_color = self.handleColors[handle] if self.debug_mode else line_color
-                        painter.setBrush(QBrush(handle_color))
-                        painter.drawEllipse(rect)
-                    elif handle not in [self.handleRotate, self.handleTransformCenter] and self.resizable:
-                        # デバッグモードでない場合は矩形と同じ色を使用
-                        handle_color = self.handleColors[handle] if self.debug_mode else line_color
-                        painter.setBrush(QBrush(handle_color))
-                        painter.drawEllipse(rect)
+                        pen_color, brush_color = line_color, handle_color
+                    elif handle not in self._rotate_handles and self.resizable:
+                        pen_color, brush_color = line_color, handle_color
+                    else:
+                        continue
+
+                    # 後続の描画（デバッグ表示のshape）が同じ状態になるよう、グリフを使う場合もペンとブラシは設定する
+                    if brush_color is None:
+                        painter.setBrush(Qt.BrushStyle.NoBrush)
+                        painter.setPen(_cachedPen(pen_color, line_width))
+                    else:
+                        painter.setBrush(_cachedBrush(brush_color))
+                    if glyph_scale is not None:
+                        blit = self._glyph(painter, rect, glyph_scale, line_width, pen_color, brush_color)
+                        if blit is not None:
+                            blits.append(blit)
+                            continue
+                    # グリフが使えない場合はその場で描画する（重なり順を保つため、先に溜めたグリフを描画）
+                    self._drawGlyphs(painter, blits)
+                    blits.clear()
+                    painter.drawEllipse(rect)
+            self._drawGlyphs(painter, blits)
 
         # デバッグモードが有効の場合のみshapeを表示
         if self.debug_mode:
             painter.setPen(QPen(QColor(0, 255, 0, 100), 1, Qt.PenStyle.DashLine))
             painter.drawPath(self.shape())
 
+    def _paintStyle(self, lod: float) -> tuple[QColor, QPen, QBrush]:
+        """矩形の線の色・ペン・塗りつぶし（デバッグモードとLODが変わるまで使い回す）"""
+        key = (self.debug_mode, lod, self.tolerance)
+        if self._paint_style_key != key:
+            line_color = QColor(0, 0, 0) if self.debug_mode else QColor(0, 120, 215)
+            fill_brush = QBrush(QColor(255, 0, 0, 100)) if self.debug_mode else QBrush(Qt.BrushStyle.NoBrush)
+            self._paint_style = (line_color, QPen(line_color, self.tolerance / lod, Qt.PenStyle.SolidLine), fill_brush)
+            self._paint_style_key = key
+        return self._paint_style
+
+    @staticmethod
+    def _glyphScale(painter: QPainter) -> float | None:
+        """
+        グリフを使えるか判定し、アイテム座標からデバイス座標への拡大率を返す
+
+        円のグリフは回転しても見た目が変わらないため、回転と等方的な拡大縮小だけの変換で使える。
+        せん断や縦横で異なる拡大率を含む場合はNoneを返す。
+        """
+        t = painter.worldTransform()
+        if not t.isAffine():
+            return None
+        sx = math.hypot(t.m11(), t.m12())
+        sy = math.hypot(t.m21(), t.m22())
+        if sx == 0 or abs(sx - sy) > 1e-6 * sx or abs(t.m11() * t.m21() + t.m12() * t.m22()) > 1e-6 * sx * sy:
+            return None
+        return sx
+
+    def _glyph(self, painter: QPainter, rect: QRectF, scale: float, line_width: float,
+               pen_color: QColor, brush_color: QColor | None) -> tuple[int, int, QPixmap] | None:
+        """
+        ハンドルのグリフとデバイス座標での描画位置を取得
+
+        グリフはデバイス上の大きさ・色・デバイスピクセル比ごとにQPixmapCacheに保存する。
+        描画位置は整数ピクセルに揃え、端数は1/4ピクセル単位でグリフ側に反映する。
+
+        Returns:
+            (x, y, ピクセルマップ)。グリフにするには大きすぎる場合はNone
+        """
+        size = rect.width() * scale
+        if size > self.GLYPH_MAX_SIZE:
+            return None
+        pen_width = line_width * scale
+        half = size / 2 + pen_width / 2 + 1
+        center = painter.worldTransform().map(rect.center())
+        x, phase_x = _pixelPhase(center.x() - half)
+        y, phase_y = _pixelPhase(center.y() - half)
+        device = painter.device()
+        dpr = device.devicePixelRatioF() if device is not None else 1.0
+        key = (f"TransformRectItem/{size:.2f}/{pen_width:.2f}/{pen_color.rgba()}/"
+               f"{brush_color.rgba() if brush_color is not None else '-'}/{dpr}/{phase_x}/{phase_y}")
+        pixmap = QPixmapCache.find(key)
+        if pixmap is None:
+            extent = math.ceil(2 * half) + 1
+            pixmap = QPixmap(math.ceil(extent * dpr), math.ceil(extent * dpr))
+            pixmap.setDevicePixelRatio(dpr)
+            pixmap.fill(Qt.GlobalColor.transparent)
+            glyph_painter = QPainter(pixmap)
+            glyph_painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            glyph_painter.setPen(QPen(pen_color, pen_width))
+            glyph_painter.setBrush(Qt.BrushStyle.NoBrush if brush_color is None else QBrush(brush_color))
+            glyph_painter.drawEllipse(QPointF(half + phase_x / 4, half + phase_y / 4), size / 2, size / 2)
+            glyph_painter.end()
+            QPixmapCache.insert(key, pixmap)
+        return x, y, pixmap
+
+    @staticmethod
+    def _drawGlyphs(painter: QPainter, blits: list[tuple[int, int, QPixmap]]):
+        """グリフをデバイス座標で描画"""
+        if not blits:
+            return
+        painter.save()
+        painter.resetTransform()
+        for x, y, pixmap in blits:
+            painter.drawPixmap(x, y, pixmap)
+        painter.restore()
+
     def updateTransformCenterPos(self, mousePos: QPointF):
         # 矩形の中心からの差を計算
         center = self.rect().center()
@@ -535,24 +753,28 @@ class TransformRectItem(QGraphicsRectItem):
             return
 
         center = self.rect().center() + self.transformCenterOffset
-        startVector = self.mousePressPos - center
-        currentVector = mousePos - center
+        if self.mousePressTransform is None:
+            self.mousePressTransform = self.transform()
+            self.mousePressAngle = self.rotationAngle
+        # 押した時からの回転角度を、回転しない親の座標系で求める
+        # （移動イベントごとの回転を積み重ねないため、イベント数によって誤差が増えない）
+        press_transform = self.mousePressTransform
+        center_pos = press_transform.map(center)
+        startVector = press_transform.map(self.mousePressPos) - center_pos
+        currentVector = self.transform().map(mousePos) - center_pos
         angle = math.degrees(math.atan2(currentVector.y(), currentVector.x()) - 
                              math.atan2(startVector.y(), startVector.x()))
-        
-        # 現在の回転をリセット
-        # self.setRotation(0)
 
-        # 回転中心を基準に矩形を回転
+        # 押した時の変換に、回転中心を基準にした回転を適用
         transform = QTransform()
         transform.translate(center.x(), center.y())
         transform.rotate(angle)
         transform.translate(-center.x(), -center.y())
         
-        self.setTransform(transform, True)
+        self.setTransform(transform * press_transform)
         
         # 回転角度を更新
-        self.rotationAngle = (self.rotationAngle + angle) % 360
+        self.rotationAngle = (self.mousePressAngle + angle) % 360
         
         self.updateHandlesPos()
         self.update()
@@ -618,10 +840,20 @@ class TransformRectItem(QGraphicsRectItem):
         # 対角のハンドルの位置を返す
         return self.handles[opposite_handle].center()
 
-    def get_lod(self) -> float:
-        """現在のLOD（Level of Detail）を取得"""
+    def get_lod(self, view: QGraphicsView | None = None) -> float:
+        """
+        LOD（Level of Detail）を取得
+
+        Args:
+            view: 対象のビュー。Noneの場合は現在のハンドルの配置に使っているLOD
+                （まだ配置していない場合はシーンの最初のビューのLOD）
+        """
+        if view is not None:
+            return viewLod(self, view)
+        if self._handle_lod is not None:
+            return self._handle_lod
         if self.scene() and self.scene().views():
-            return self.scene().views()[0].transform().m11()
+            return viewLod(self, self.scene().views()[0])
         return 1.0
 
     def setBoundRect(self, rect: QRectF | None):
@@ -3,27 +3,34 @@ from PySide6.QtGui import QBrush, QPen, QColor, QPainter, QTransform, QMouseEven
 from PySide6.QtWidgets import QGraphicsScene, QGraphicsItem, QGraphicsView, QRubberBand, QGraphicsRectItem, QGraphicsSceneMouseEvent
 from .transform_rect_item import TransformRectItem  # GraphicsRectItemをインポート
 from .selection_path_item import SelectionPathItem  # SelectionRectItemからSelectionPathItemに変更
+from .selection import SelectionBounds, SelectionCache, batchSelection, selectAll
+from .transform_drag import TransformDragMixin
 import math
+from typing import Iterable, Sequence
 
 
-class TransformScene(QGraphicsScene):
+class TransformScene(TransformDragMixin, QGraphicsScene):
     itemsTransformed = Signal(list)  # 変換されたアイテムのリストを送信
     itemsMoved = Signal(list)        # 移動されたアイテムのリストを送信
     itemsRotated = Signal(list)      # 回転されたアイテムのリストを送信
     itemsTransformedFinished = Signal(list)  # 変換が完了したアイテムのリストを送信
 
-    def __init__(self, parent: QObject | None = None, movable: bool = True, resizable: bool = True, rotatable: bool = True, keep_aspect_ratio: bool = False):
+    def __init__(self, parent: QObject | None = None, movable: bool = True, resizable: bool = True, rotatable: bool = True, keep_aspect_ratio: bool = False,
+                 coalesce_updates: bool = False, absolute_transforms: bool = False, group_min_items: int | None = None):
         super().__init__(parent)
         self._tool = 'select'  # デフォルトは'select'
         self.transform_rect_item = TransformRectItem(QRectF(), movable=movable, resizable=resizable, rotatable=rotatable, keep_aspect_ratio=keep_aspect_ratio)
         self.transform_rect_item.setVisible(False)
         self.transform_rect_item.setZValue(1000)  # 他のアイテムより上に表示
         self.addItem(self.transform_rect_item)
+        self._selection_cache = SelectionCache(self)  # onSelectionChangedより先にキャッシュが破棄されるよう先に接続
+        # 選択アイテム全体の矩形（変形矩形の表示用）。変形矩形以外でアイテムを動かした場合は notifyGeometryChanged() で通知する
+        self.selection_bounds = SelectionBounds(self)
         self.selectionChanged.connect(self.onSelectionChanged)
-        self.last_transform_rect: QRectF | None = None
-        self.last_transform_pos: QPointF | None = None
-        self.last_transform_angle: float | None = None
         self.original_keep_aspect_ratio = keep_aspect_ratio
+        # ドラッグ中の反映の設定（TransformToolと同じ。TransformDragMixinを参照）
+        self._initTransformDrag(coalesce_updates=coalesce_updates, absolute_transforms=absolute_transforms,
+                                group_min_items=group_min_items)
         # self.itemsTransformedFinished.connect(self.onItemsTransformedFinished)
         
         # 選択範囲表示用のパスアイテムを追加
@@ -56,17 +63,51 @@ class TransformScene(QGraphicsScene):
         self.original_keep_aspect_ratio = keep_aspect_ratio
         self.transform_rect_item.setKeepAspectRatio(keep_aspect_ratio)
     
+    def batchSelection(self):
+        """ブロック内の選択変更を1回のselectionChangedにまとめるコンテキストマネージャ"""
+        return batchSelection(self)
+
+    def selectAll(self) -> None:
+        """選択可能なアイテムをすべて選択"""
+        selectAll(self)
+
+    def cachedSelectedItems(self) -> tuple[QGraphicsItem, ...]:
+        """選択アイテム（selectionChangedまでキャッシュされる。順序も変更があるまで固定）"""
+        return self._selection_cache.items()
+
+    def notifyGeometryChanged(self, items: QGraphicsItem | Iterable[QGraphicsItem]) -> None:
+        """
+        アイテムの位置・形状・変形の変更を通知（CustomSceneと同じ）
+
+        Args:
+            items: ジオメトリが変わったアイテム
+        """
+        self.selection_bounds.markDirty(items)
+
     def onSelectionChanged(self):
         if self.tool == 'transform':
-            self.updateTransformRect()
+            # 選択の増減は選択範囲の矩形が差分で反映する
+            self.updateTransformRect(remeasure=False)
         else:
             self.transform_rect_item.setVisible(False)
     
     # def onItemsTransformedFinished(self, items: list[QGraphicsItem]):
     #     print(f"変換が完了したアイテム: {items}")
 
-    def updateTransformRect(self):
-        selected_items = self.selectedItems()
+    def updateTransformRect(self, remeasure: bool = True):
+        """
+        変形矩形を選択アイテムに合わせる
+
+        Args:
+            remeasure: 選択アイテムの矩形をすべて求め直すか。notifyGeometryChanged() を通さずに
+                アイテムを動かした後でも正しい矩形になる。選択の変更やキー操作での移動のように
+                選択範囲の矩形に差分を通知済みの場合はFalseにして求め直しを省く
+        """
+        selected_items = self.cachedSelectedItems()
+        if remeasure:
+            self.selection_bounds.clear()
+        # 選択が変わったため、まだ反映していない変形は破棄する
+        self._resetTransformDrag()
 
         if selected_items:
             self.transform_rect_item.setPos(QPointF(0, 0))
@@ -167,15 +208,9 @@ class TransformScene(QGraphicsScene):
 
                 self.transform_rect_item.setPos(pos)
             else:
-                rect = selected_items[0].sceneBoundingRect()
-                for item in selected_items[1:]:
-                    rect = rect.united(item.sceneBoundingRect())
-
-                # 選択されたアイテムの中に回転が適用されているものがあるか確認
-                has_rotation = any(
-                    abs(math.degrees(math.atan2(item.transform().m12(), item.transform().m11()))) > 0.1
-                    for item in selected_items
-                )
+                # 選択の変更・アイテムの変形の分だけ更新している、全アイテムを含む矩形と回転の有無
+                rect = self.selection_bounds.rect()
+                has_rotation = self.selection_bounds.hasRotation()
                 
                 # 回転が存在する場合、一時的にアスペクト比を固定
                 if has_rotation:
@@ -186,9 +221,6 @@ class TransformScene(QGraphicsScene):
                 self.transform_rect_item.setRect(rect)
             self.transform_rect_item.updateHandlesPos()
             self.transform_rect_item.setVisible(True)
-            self.last_transform_rect = None
-            self.last_transform_pos = None
-            self.last_transform_angle = None
         else:
             self.transform_rect_item.setVisible(False)
 
@@ -204,10 +236,7 @@ class TransformScene(QGraphicsScene):
             self.selection_path_item.startAnimation()
         elif self.tool == 'transform' and event.button() == Qt.MouseButton.LeftButton:
             if self.transform_rect_item.isVisible():
-                self.last_transform_rect = self.transform_rect_item.rect()
-                self.last_transform_pos = self.transform_rect_item.pos()
-                self.last_transform_angle = self.transform_rect_item.rotationAngle
-                self.updated_items = []
+                self._beginTransformDrag(event.scenePos())
         super().mousePressEvent(event)
 
     def mouseMoveEvent(self, event: QGraphicsSceneMouseEvent):
@@ -219,20 +248,32 @@ class TransformScene(QGraphicsScene):
             self.selection_path_item.setPath(path)
         elif self.tool == 'transform' and event.buttons() & Qt.MouseButton.LeftButton:
             if self.transform_rect_item.isVisible():
-                current_rect = self.transform_rect_item.rect()
-                current_pos = self.transform_rect_item.pos()
-                current_angle = self.transform_rect_item.rotationAngle
-                self.updated_items = []
-                if self.last_transform_rect is not None and current_rect != self.last_transform_rect:
-                    self.updated_items = self.onTransformRectChanged(self.last_transform_rect, current_rect)
-                if self.last_transform_pos is not None and current_pos != self.last_transform_pos:
-                    self.updated_items = self.onTransformRectPosChanged(self.last_transform_pos, current_pos)
-                if self.last_transform_angle is not None and current_angle != self.last_transform_angle:
-                    self.updated_items = self.onTransformRectAngleChanged(self.last_transform_angle, current_angle)
-                self.last_transform_rect = current_rect
-                self.last_transform_pos = current_pos
-                self.last_transform_angle = current_angle
+                self._moveTransformDrag()
         super().mouseMoveEvent(event)
+        grabber = self.mouseGrabberItem()
+        if (grabber is not None and grabber is not self.transform_rect_item
+                and grabber.flags() & QGraphicsItem.GraphicsItemFlag.ItemIsMovable):
+            # Qt標準のドラッグで選択アイテムが動いた
+            self.selection_bounds.markDirty(self.cachedSelectedItems())
+
+    def _dragScene(self) -> QGraphicsScene:
+        return self
+
+    def _dragSelectedItems(self) -> Sequence[QGraphicsItem]:
+        return self.cachedSelectedItems()
+
+    def _dragSelectionBounds(self) -> SelectionBounds | None:
+        # onTransformRect*Changed() が選択アイテム全体の矩形を差分で更新している
+        return self.selection_bounds
+
+    def _handleTransformRectChanged(self, old_rect: QRectF, new_rect: QRectF) -> list[QGraphicsItem]:
+        return self.onTransformRectChanged(old_rect, new_rect)
+
+    def _handleTransformPosChanged(self, old_pos: QPointF, new_pos: QPointF) -> list[QGraphicsItem]:
+        return self.onTransformRectPosChanged(old_pos, new_pos)
+
+    def _handleTransformAngleChanged(self, old_angle: float, new_angle: float) -> list[QGraphicsItem]:
+        return self.onTransformRectAngleChanged(old_angle, new_angle)
 
     def mouseReleaseEvent(self, event: QGraphicsSceneMouseEvent):
         if self.tool == 'select' and event.button() == Qt.MouseButton.LeftButton:
@@ -250,16 +291,13 @@ class TransformScene(QGraphicsScene):
                 self.selection_start_pos = None
         elif self.tool == 'transform' and event.button() == Qt.MouseButton.LeftButton:
             if self.transform_rect_item.isVisible():
-                if self.updated_items:
-                    self.itemsTransformedFinished.emit(self.updated_items)
-                self.last_transform_rect = None
-                self.last_transform_pos = None
-                self.last_transform_angle = None
-                self.updated_items = []
+                updated_items = self._finishTransformDrag()
+                if updated_items:
+                    self.itemsTransformedFinished.emit(updated_items)
         super().mouseReleaseEvent(event)
 
     def onTransformRectChanged(self, old_rect: QRectF, new_rect: QRectF) -> list[QGraphicsItem]:
-        selected_items = self.selectedItems()
+        selected_items = self.cachedSelectedItems()
         if not selected_items:
             return []
 
@@ -274,8 +312,11 @@ class TransformScene(QGraphicsScene):
             self.transform_rect_item.getOppositeHandlePos()
         )
 
-        updated_items: list[QGraphicsItem] = []
-        for item in selected_items:
+        batch, others = self._transformBatch(selected_items)
+        if batch is not None:
+            batch.scale(scale_x, scale_y, origin)
+            batch.apply()
+        for item in others:
             if isinstance(item, QGraphicsRectItem):
                 # QGraphicsRectItemの場合は直接rectを更新
                 current_rect = item.rect()
@@ -320,26 +361,31 @@ class TransformScene(QGraphicsScene):
                 transform.translate(-item_origin.x(), -item_origin.y())
                 item.setTransform(transform, True)
 
-            updated_items.append(item)
+        updated_items: list[QGraphicsItem] = list(selected_items)
+        self.selection_bounds.markDirty(updated_items)
         # 変換が完了した後にシグナルを発信
         self.itemsTransformed.emit(updated_items)
 
         return updated_items
 
     def onTransformRectPosChanged(self, old_pos: QPointF, new_pos: QPointF) -> list[QGraphicsItem]:
-        selected_items = self.selectedItems()
+        selected_items = self.cachedSelectedItems()
         if not selected_items:
             return []
 
         global_translate_x = new_pos.x() - old_pos.x()
         global_translate_y = new_pos.y() - old_pos.y()
 
-        updated_items: list[QGraphicsItem] = []
-        for item in selected_items:
+        batch, others = self._transformBatch(selected_items)
+        if batch is not None:
+            batch.translate(global_translate_x, global_translate_y)
+            batch.apply()
+        for item in others:
             old_item_pos = item.pos()
             new_item_pos = old_item_pos + QPointF(global_translate_x, global_translate_y)
             item.setPos(new_item_pos)
-            updated_items.append(item)
+        updated_items: list[QGraphicsItem] = list(selected_items)
+        self.selection_bounds.translate(global_translate_x, global_translate_y)
         # 移動が完了した後にシグナルを発信
         self.itemsMoved.emit(updated_items)
 
@@ -369,15 +415,18 @@ class TransformScene(QGraphicsScene):
         return QPointF(origin_x, origin_y)
 
     def onTransformRectAngleChanged(self, old_angle: float, new_angle: float) -> list[QGraphicsItem]:
-        selected_items = self.selectedItems()
+        selected_items = self.cachedSelectedItems()
         if not selected_items:
             return []
 
         angle_diff = new_angle - old_angle
         transform_center = self.transform_rect_item.transformCenterScenePos()
 
-        updated_items: list[QGraphicsItem] = []
-        for item in selected_items:
+        batch, others = self._transformBatch(selected_items)
+        if batch is not None:
+            batch.rotate(angle_diff, transform_center)
+            batch.apply()
+        for item in others:
             # アイテムの現在の変換を保持
             current_transform = item.transform()
             
@@ -400,7 +449,8 @@ class TransformScene(QGraphicsScene):
             offset = transform_center - item.mapToScene(item_center)
             item.setPos(item.pos() + offset)
 
-            updated_items.append(item)
+        updated_items: list[QGraphicsItem] = list(selected_items)
+        self.selection_bounds.markDirty(updated_items)
         # 回転が完了した後にシグナルを発信
         self.itemsRotated.emit(updated_items)
 
@@ -455,7 +505,8 @@ class TransformScene(QGraphicsScene):
         else:
             super().keyPressEvent(event)
         
-        self.updateTransformRect()
+        # 矢印キーでの移動は selection_bounds.translate() で反映済み
+        self.updateTransformRect(remeasure=False)
 
 class CustomRubberBand(QRubberBand):
     def __init__(self, shape, parent=None):
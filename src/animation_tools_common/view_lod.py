@@ -0,0 +1,44 @@
+"""
+ビューごとのLOD（Level of Detail）
+
+同じシーンを複数のビュー（分割表示や全体表示など）で表示すると、LODはビューごとに異なる。
+ハンドルの大きさや当たり判定の許容誤差は、描画時は描画中のビュー、
+イベント処理時はイベントを送ったビューのLODに合わせる。
+"""
+from typing import Optional
+
+from PySide6.QtWidgets import QGraphicsItem, QGraphicsSceneEvent, QGraphicsView, QStyleOptionGraphicsItem
+
+
+def eventView(event: QGraphicsSceneEvent) -> Optional[QGraphicsView]:
+    """
+    シーンイベントの発生元のビューを取得
+
+    シーンに複数のビューがある場合でも、操作されたビューを返す。
+    イベントがビュー以外から送られた場合はNone。
+    """
+    widget = event.widget()
+    # イベントはビューのビューポートから送られる
+    view = widget.parentWidget() if widget is not None else None
+    return view if isinstance(view, QGraphicsView) else None
+
+
+def viewLod(item: QGraphicsItem, view: QGraphicsView) -> float:
+    """
+    ビューに表示されたアイテムのLOD
+
+    描画時に QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform()) で
+    求める値と同じ（アイテム自身の変換も含む）。
+    """
+    return QStyleOptionGraphicsItem.levelOfDetailFromTransform(item.deviceTransform(view.viewportTransform()))
+
+
+def eventLod(item: QGraphicsItem, event: QGraphicsSceneEvent) -> Optional[float]:
+    """
+    イベントを送ったビューでのアイテムのLOD
+
+    Returns:
+        イベントがビュー以外から送られた場合はNone
+    """
+    view = eventView(event)
+    return viewLod(item, view) if view is not None else None
@@ -0,0 +1,43 @@
+"""テストで共通に使うマウスイベントの生成・送信"""
+from PySide6.QtCore import QCoreApplication, QEvent, QPointF, Qt
+from PySide6.QtWidgets import QGraphicsScene, QGraphicsSceneMouseEvent
+
+
+def mouse_event(event_type: QEvent.Type, pos: QPointF, down_pos: QPointF | None = None,
+                last_pos: QPointF | None = None, buttons: Qt.MouseButton | None = None,
+                modifiers: Qt.KeyboardModifier = Qt.KeyboardModifier.NoModifier) -> QGraphicsSceneMouseEvent:
+    """
+    左ボタンによるマウスイベントを作成
+
+    Args:
+        event_type: GraphicsSceneMousePress / GraphicsSceneMouseMove / GraphicsSceneMouseRelease
+        pos: シーン座標
+        down_pos: 左ボタンを押した位置（Noneの場合は設定しない）
+        last_pos: 前回のイベントの位置（Noneの場合は設定しない）
+        buttons: 押されているボタン（Noneの場合はリリース以外で左ボタン）
+        modifiers: 修飾キー
+    """
+    event = QGraphicsSceneMouseEvent(event_type)
+    event.setScenePos(pos)
+    if last_pos is not None:
+        event.setLastScenePos(last_pos)
+    if down_pos is not None:
+        event.setButtonDownScenePos(Qt.MouseButton.LeftButton, down_pos)
+    # 移動イベントは状態が変わったボタンを持たない
+    event.setButton(Qt.MouseButton.NoButton if event_type == QEvent.Type.GraphicsSceneMouseMove
+                    else Qt.MouseButton.LeftButton)
+    if buttons is None:
+        buttons = (Qt.MouseButton.NoButton if event_type == QEvent.Type.GraphicsSceneMouseRelease
+                   else Qt.MouseButton.LeftButton)
+    event.setButtons(buttons)
+    event.setModifiers(modifiers)
+    return event
+
+
+def send_mouse(scene: QGraphicsScene, event_type: QEvent.Type, pos: QPointF, down_pos: QPointF | None = None,
+               last_pos: QPointF | None = None, buttons: Qt.MouseButton | None = None,
+               modifiers: Qt.KeyboardModifier = Qt.KeyboardModifier.NoModifier) -> QGraphicsSceneMouseEvent:
+    """mouse_event() で作成したイベントをシーンに送信し、送信したイベントを返す"""
+    event = mouse_event(event_type, pos, down_pos, last_pos, buttons, modifiers)
+    QCoreApplication.sendEvent(scene, event)
+    return event
@@ -0,0 +1,106 @@
+import os
+import random
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QRectF, Qt
+from PySide6.QtGui import QTransform
+from PySide6.QtWidgets import QApplication, QGraphicsEllipseItem, QGraphicsRectItem
+
+from animation_tools_common.actions.select_similar_actions import SelectSameLabelPrefixAction, SelectSimilarAction
+from animation_tools_common.attribute_index import attributeKey
+from animation_tools_common.custom_scene import CustomScene
+from animation_tools_common.region_item_v2 import RegionItem
+
+app = QApplication.instance() or QApplication([])
+
+
+class TestAttributeIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = random.Random(0)
+        self.scene = CustomScene()
+        for i in range(300):
+            size = self.rng.choice([20, 40, 80])
+            if i % 4 == 0:
+                item = QGraphicsEllipseItem(0, 0, size, size)
+            else:
+                item = RegionItem(f'r{i}', QRectF(0, 0, size, size), label=f"{self.rng.choice('ABC')}-{i}")
+                item.color = self.rng.choice([Qt.GlobalColor.black, Qt.GlobalColor.red])
+            item.setRotation(self.rng.choice([0, 90]))
+            self.scene.importItem(item)
+        self.index = self.scene.attribute_index
+
+    def expected(self, reference, attributes) -> list:
+        keys = [(a, key) for a in attributes if (key := attributeKey(reference, a)) is not None]
+        if not keys:
+            return []
+        return [item for item in self.index._by_order.values()
+                if all(attributeKey(item, a) == key for a, key in keys)]
+
+    def assertMatchesScan(self):
+        for reference in list(self.index._by_order.values())[::17]:
+            for attributes in (('type', 'size'), ('label_prefix',), ('color', 'rotation'), ('label',)):
+                self.assertEqual(self.index.similarItems(reference, attributes), self.expected(reference, attributes))
+
+    def test_queries_match_scan(self):
+        self.assertMatchesScan()
+        prefixed = self.index.itemsWithLabelPrefix('B-')
+        self.assertEqual(set(prefixed), {item for item in self.index._by_order.values()
+                                         if isinstance(item, RegionItem) and item.label.startswith('B-')})
+
+    def test_index_updates_incrementally(self):
+        items = list(self.index._by_order.values())
+        for item in items[:60]:
+            if isinstance(item, RegionItem):
+                item.label = f"D-{self.rng.randint(0, 9)}"
+                item.color = Qt.GlobalColor.blue
+                item.setRect(0, 0, 40, 40)
+            item.setRotation(45)
+        self.scene.notifyGeometryChanged(items[:60])
+        for item in items[60:80]:
+            self.scene.removeItem(item)
+        self.assertMatchesScan()
+
+    def test_select_similar_actions(self):
+        reference = next(item for item in self.index._by_order.values() if isinstance(item, RegionItem))
+        reference.setSelected(True)
+        SelectSimilarAction(self.scene).execute()
+        self.assertEqual(set(self.scene.selectedItems()), set(self.expected(reference, ('type', 'size'))))
+
+        self.scene.clearSelection()
+        reference.setSelected(True)
+        SelectSameLabelPrefixAction(self.scene).execute()
+        self.assertEqual(set(self.scene.selectedItems()), set(self.expected(reference, ('type', 'label_prefix'))))
+
+    def test_rotation_includes_transform(self):
+        items = list(self.index._by_order.values())
+        rotated = items[:10]
+        for item in rotated:
+            item.setRotation(0)
+            item.setTransform(QTransform().rotate(30).scale(2, 1))
+        items[10].setRotation(10)
+        items[10].setTransform(QTransform().rotate(20))
+        self.scene.notifyGeometryChanged(items[:11])
+        self.assertEqual(attributeKey(rotated[0], 'rotation'), 30)
+        self.assertEqual(attributeKey(items[10], 'rotation'), 30)
+        self.assertEqual(self.index.itemsWith('rotation', 30), items[:11])
+        self.assertMatchesScan()
+
+    def test_select_similar_queries_once_per_key(self):
+        queries = []
+        items_matching = self.index.itemsMatching
+        self.index.itemsMatching = lambda keys: queries.append(keys) or items_matching(keys)
+        selected = [item for item in self.index._by_order.values() if isinstance(item, RegionItem)][:40]
+        for item in selected:
+            item.setSelected(True)
+        SelectSimilarAction(self.scene).execute()
+        keys = {self.index.keys(item, SelectSimilarAction.attributes) for item in selected}
+        self.assertEqual(len(queries), len(keys))
+        expected = set().union(*(self.expected(item, ('type', 'size')) for item in selected))
+        self.assertEqual(set(self.scene.selectedItems()), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QRectF, Qt
+from PySide6.QtWidgets import QApplication, QGraphicsEllipseItem, QGraphicsItem, QGraphicsRectItem
+
+from animation_tools_common.custom_scene import CustomScene
+from animation_tools_common.region_item_v2 import RegionItem
+from animation_tools_common.selection import selectionBatchActive
+
+app = QApplication.instance() or QApplication([])
+
+Flag = QGraphicsItem.GraphicsItemFlag
+
+
+class TestBulkUpdateItems(unittest.TestCase):
+
+    def setUp(self):
+        self.scene = CustomScene()
+        self.rects = []
+        self.ellipses = []
+        for i in range(10):
+            rect = QGraphicsRectItem(0, 0, 10, 10)
+            rect.setPos(i * 20, 0)
+            rect.setZValue(i)
+            self.scene.importItem(rect)
+            self.rects.append(rect)
+            ellipse = QGraphicsEllipseItem(0, 0, 10, 10)
+            ellipse.setPos(i * 20, 100)
+            self.scene.importItem(ellipse)
+            self.ellipses.append(ellipse)
+        self.emitted = 0
+        self.scene.selectionChanged.connect(self.onSelectionChanged)
+
+    def onSelectionChanged(self):
+        if not selectionBatchActive(self.scene):
+            self.emitted += 1
+
+    def test_type_filter(self):
+        changed = self.scene.bulkUpdateItems(properties={'opacity': 0.5}, item_types=QGraphicsEllipseItem)
+        self.assertEqual(set(changed), set(self.ellipses))
+        self.assertTrue(all(item.opacity() == 1.0 for item in self.rects))
+
+    def test_z_range_filter(self):
+        changed = self.scene.bulkUpdateItems(properties={'opacity': 0.5}, item_types=QGraphicsRectItem,
+                                             z_range=(3, 5))
+        self.assertEqual(changed, self.rects[3:6])
+
+    def test_region_filter(self):
+        changed = self.scene.bulkUpdateItems(flags={Flag.ItemIsMovable: True}, region=QRectF(-5, 90, 50, 30))
+        self.assertEqual(set(changed), set(self.ellipses[:3]))
+        self.assertTrue(all(item.flags() & Flag.ItemIsMovable for item in self.ellipses[:3]))
+
+    def test_unchanged_items_are_skipped(self):
+        self.rects[0].setOpacity(0.5)
+        changed = self.scene.bulkUpdateItems(properties={'opacity': 0.5}, item_types=QGraphicsRectItem)
+        self.assertEqual(set(changed), set(self.rects[1:]))
+        self.assertEqual(self.scene.bulkUpdateItems(properties={'opacity': 0.5}, item_types=QGraphicsRectItem), [])
+        self.assertEqual(self.scene.bulkUpdateItems(flags={Flag.ItemIsSelectable: True}), [])
+
+    def test_deselection_notifies_once(self):
+        for item in self.rects + self.ellipses:
+            item.setSelected(True)
+        self.emitted = 0
+        changed = self.scene.bulkUpdateItems(flags={Flag.ItemIsSelectable: False})
+        self.assertEqual(len(changed), 20)
+        self.assertEqual(self.scene.selectedItems(), [])
+        self.assertEqual(self.emitted, 1)
+
+    def test_python_properties(self):
+        region = RegionItem('r', QRectF(0, 200, 50, 50), 'before')
+        self.scene.addItem(region)
+        changed = self.scene.bulkUpdateItems(properties={'label': 'after', 'color': Qt.GlobalColor.red,
+                                                         'visible': False},
+                                             item_types=RegionItem)
+        self.assertEqual(changed, [region])
+        self.assertEqual(region.label, 'after')
+        self.assertEqual(region.color, Qt.GlobalColor.red)
+        self.assertFalse(region.isVisible())
+        # label/colorを持たないアイテムには設定しない
+        self.assertEqual(self.scene.bulkUpdateItems(properties={'label': 'x'}, item_types=QGraphicsEllipseItem), [])
+
+    def test_set_item_flags_reaches_child_items(self):
+        child = QGraphicsRectItem(0, 0, 5, 5, self.rects[0])
+        self.scene.setItemFlags(Flag.ItemIsMovable, True)
+        self.assertTrue(child.flags() & Flag.ItemIsMovable)
+        self.assertTrue(all(item.flags() & Flag.ItemIsMovable for item in self.rects + self.ellipses))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import math
+import random
+import unittest
+
+import numpy as np
+from PySide6.QtCore import QPointF, QRectF, Qt
+from PySide6.QtGui import QPainterPath, QPolygonF
+
+from animation_tools_common.geometry import pointsInPolygon, quadsInPolygon, quadsInRect
+
+
+def random_lasso(rng: random.Random, count: int = 40) -> list[tuple[float, float]]:
+    """中心の周りを一周する凹凸のある多角形"""
+    points = []
+    for i in range(count):
+        angle = 2 * math.pi * i / count
+        radius = rng.uniform(30, 100)
+        points.append((radius * math.cos(angle), radius * math.sin(angle)))
+    return points
+
+
+def random_quad(rng: random.Random) -> list[tuple[float, float]]:
+    cx, cy = rng.uniform(-120, 120), rng.uniform(-120, 120)
+    w, h = rng.uniform(1, 40), rng.uniform(1, 40)
+    angle = math.radians(rng.choice([0, 0, 30, 45]))
+    cos, sin = math.cos(angle), math.sin(angle)
+    return [(cx + x * cos - y * sin, cy + x * sin + y * cos)
+            for x, y in ((-w / 2, -h / 2), (w / 2, -h / 2), (w / 2, h / 2), (-w / 2, h / 2))]
+
+
+def to_path(points: list[tuple[float, float]]) -> QPainterPath:
+    path = QPainterPath()
+    path.addPolygon(QPolygonF([QPointF(x, y) for x, y in points]))
+    path.closeSubpath()
+    return path
+
+
+class TestGeometry(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = random.Random(0)
+
+    def test_points_in_polygon_matches_qt(self):
+        lasso = random_lasso(self.rng)
+        polygon = QPolygonF([QPointF(x, y) for x, y in lasso])
+        points = [(self.rng.uniform(-120, 120), self.rng.uniform(-120, 120)) for _ in range(2000)]
+        expected = [polygon.containsPoint(QPointF(x, y), Qt.FillRule.OddEvenFill) for x, y in points]
+        self.assertEqual(pointsInPolygon(np.array(points), np.array(lasso)).tolist(), expected)
+
+    def test_quads_in_polygon_matches_qt(self):
+        lasso = random_lasso(self.rng)
+        lasso_path = to_path(lasso)
+        quads = [random_quad(self.rng) for _ in range(1000)]
+        intersects = quadsInPolygon(np.array(quads), np.array(lasso))
+        contains = quadsInPolygon(np.array(quads), np.array(lasso), contains=True)
+        for quad, hit, inside in zip(quads, intersects, contains):
+            quad_path = to_path(quad)
+            self.assertEqual(hit, lasso_path.intersects(quad_path), quad)
+            self.assertEqual(inside, lasso_path.contains(quad_path), quad)
+
+    def test_quads_in_rect_matches_qt(self):
+        rect = QRectF(-40, -20, 90, 60)
+        rect_path = QPainterPath()
+        rect_path.addRect(rect)
+        quads = [random_quad(self.rng) for _ in range(1000)]
+        bounds = (rect.left(), rect.top(), rect.right(), rect.bottom())
+        intersects = quadsInRect(np.array(quads), bounds)
+        contains = quadsInRect(np.array(quads), bounds, contains=True)
+        for quad, hit, inside in zip(quads, intersects, contains):
+            quad_path = to_path(quad)
+            self.assertEqual(hit, rect_path.intersects(quad_path), quad)
+            self.assertEqual(inside, rect_path.contains(quad_path), quad)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import subprocess
+import sys
+import unittest
+
+
+def imported_modules(statement: str) -> set[str]:
+    """新しいインタプリタでstatementを実行した後のsys.modulesを返す"""
+    code = f"{statement}\nimport sys\nprint('\\n'.join(sys.modules))"
+    proc = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return set(proc.stdout.split())
+
+
+class TestLazyImport(unittest.TestCase):
+
+    def test_filename_format_does_not_load_qt(self):
+        modules = imported_modules("import animation_tools_common.filename_format")
+        self.assertFalse({m for m in modules if m.startswith('PySide6')})
+
+    def test_template_manager_does_not_load_qt_widgets(self):
+        modules = imported_modules("from animation_tools_common.template_manager import TemplateManager")
+        self.assertNotIn('PySide6.QtWidgets', modules)
+
+    def test_package_attributes_resolve_lazily(self):
+        modules = imported_modules("import animation_tools_common as atc\natc.format_filename")
+        self.assertNotIn('animation_tools_common.custom_scene', modules)
+        modules = imported_modules("import animation_tools_common as atc\natc.CustomScene")
+        self.assertIn('animation_tools_common.custom_scene', modules)
+        self.assertNotIn('animation_tools_common.actions.align_actions', modules)
+
+
+if __name__ == '__main__':
+    unittest.main()
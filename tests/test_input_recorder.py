@@ -0,0 +1,104 @@
+import os
+import tempfile
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QCoreApplication, QEvent, QPointF, QRectF, Qt
+from PySide6.QtGui import QKeyEvent
+from PySide6.QtWidgets import QApplication, QGraphicsRectItem
+
+from animation_tools_common.custom_scene import CustomScene
+from animation_tools_common.input_recorder import SceneInputRecorder, SceneInputReplayer
+from animation_tools_common.tools.select_tool import SelectTool
+from tests.helpers import send_mouse
+
+app = QApplication.instance() or QApplication([])
+
+
+def click(scene, pos, modifiers=Qt.KeyboardModifier.NoModifier):
+    send_mouse(scene, QEvent.Type.GraphicsSceneMousePress, pos, pos, pos, modifiers=modifiers)
+    send_mouse(scene, QEvent.Type.GraphicsSceneMouseRelease, pos, pos, pos, modifiers=modifiers)
+
+
+def drag(scene, start, end, steps=4):
+    send_mouse(scene, QEvent.Type.GraphicsSceneMousePress, start, start, start)
+    for i in range(1, steps + 1):
+        pos = start + (end - start) * (i / steps)
+        send_mouse(scene, QEvent.Type.GraphicsSceneMouseMove, pos, start, pos)
+    send_mouse(scene, QEvent.Type.GraphicsSceneMouseRelease, end, start, end)
+
+
+def make_scene() -> CustomScene:
+    scene = CustomScene()
+    scene.registerTool('select', SelectTool(scene))
+    scene.setActiveTool('select')
+    return scene
+
+
+def scene_state(scene):
+    """補助アイテム以外のトップレベルアイテムの状態（重なり順）"""
+    state = []
+    for item in scene.items(scene.itemsBoundingRect(), Qt.ItemSelectionMode.IntersectsItemBoundingRect,
+                            Qt.SortOrder.AscendingOrder):
+        if isinstance(item, QGraphicsRectItem) and item.topLevelItem() is item and item.rect().width() > 0:
+            state.append((item.pos().x(), item.pos().y(), item.rect().width(), item.zValue(), item.isSelected()))
+    return state
+
+
+class TestInputRecorderRoundTrip(unittest.TestCase):
+
+    def setUp(self):
+        self.scene = make_scene()
+        self.items = []
+        for i in range(6):
+            item = QGraphicsRectItem(0, 0, 20 + i, 20)
+            item.setPos(30 * i, 0)
+            self.scene.importItem(item)
+            self.items.append(item)
+        # 重なり順がZ値と追加順だけで決まらないようにする
+        self.items[1].setZValue(2)
+        self.items[4].stackBefore(self.items[3])
+        self.items[0].setSelected(True)
+        fd, self.path = tempfile.mkstemp(suffix='.json.gz')
+        os.close(fd)
+        self.addCleanup(os.remove, self.path)
+
+    def record(self):
+        recorder = SceneInputRecorder(self.scene)
+        recorder.start()
+        click(self.scene, QPointF(35, 10))
+        click(self.scene, QPointF(95, 10), Qt.KeyboardModifier.ControlModifier)
+        drag(self.scene, QPointF(110, -10), QPointF(200, 30))
+        key = QKeyEvent(QEvent.Type.KeyPress, Qt.Key.Key_A, Qt.KeyboardModifier.NoModifier, 'a')
+        QCoreApplication.sendEvent(self.scene, key)
+        recorder.stop()
+        recorder.save(self.path)
+        return recorder
+
+    def test_save_load_replay_round_trip(self):
+        initial_state = scene_state(self.scene)
+        recorder = self.record()
+        final_state = scene_state(self.scene)
+        self.assertNotEqual(initial_state, final_state)
+        self.assertEqual({item for item in self.items if item.isSelected()}, set(self.items[3:]))
+
+        scene = make_scene()
+        replayer = SceneInputReplayer(scene)
+        replayer.load(self.path)
+        self.assertEqual(replayer.events, recorder.events)
+        self.assertEqual([record[1] for record in replayer.events],
+                         ['P', 'R', 'P', 'R', 'P', 'M', 'M', 'M', 'M', 'R', 'K'])
+
+        restored = replayer.restoreSnapshot()
+        self.assertEqual(len(restored), len(self.items))
+        self.assertEqual(scene_state(scene), initial_state)
+        self.assertEqual(scene.sceneRect(), QRectF(self.scene.sceneRect()))
+
+        durations = replayer.replay()
+        self.assertEqual(len(durations), len(replayer.events))
+        self.assertEqual(scene_state(scene), final_state)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+import math
+import os
+import time
+import unittest
+from typing import Callable
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QEvent, QPointF
+from PySide6.QtWidgets import QApplication, QGraphicsRectItem, QGraphicsView
+
+from animation_tools_common.custom_scene import CustomScene
+from animation_tools_common.actions.align_actions import DistributeHorizontallyAction, DistributeVerticallyAction, DistributeTiledAction
+from animation_tools_common.actions.align_size_actions import AlignMiddleSizeAction
+from animation_tools_common.tools.select_tool import SelectTool
+from tests.helpers import mouse_event
+
+app = QApplication.instance() or QApplication([])
+
+SIZES = (100, 1000, 10000)
+
+# 計算量クラスごとの許容する増加指数（計測ノイズ分の余裕を含む）
+COMPLEXITY_EXPONENTS = {
+    'linear': 1.0,
+    'n log n': 1.15,
+}
+TOLERANCE = 0.3
+
+# 実行時間を計測するテストは遅く、マシンの負荷で結果が変わるため、環境変数を設定した場合のみ実行する
+RUN_SLOW_TESTS = os.environ.get('ATC_RUN_SLOW_TESTS', '') not in ('', '0')
+
+
+def fit_exponent(sizes: tuple[int, ...], times: list[float]) -> float:
+    """log(時間) と log(サイズ) の最小二乗近似の傾きを返す"""
+    xs = [math.log(n) for n in sizes]
+    ys = [math.log(max(t, 1e-9)) for t in times]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    num = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    den = sum((x - mean_x) ** 2 for x in xs)
+    return num / den
+
+
+def measure(setup: Callable[[int], Callable[[], None]], n: int, repeat: int = 3) -> float:
+    """setupが返す処理をrepeat回実行し、最短時間を返す"""
+    best = float('inf')
+    for _ in range(repeat):
+        run = setup(n)
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def make_scene(n: int) -> tuple[CustomScene, QGraphicsView]:
+    """n個のアイテムを並べたシーンと、シーンを表示するビュー（呼び出し側で保持する）"""
+    scene = CustomScene()
+    view = QGraphicsView(scene)
+    columns = int(math.sqrt(n)) or 1
+    for i in range(n):
+        item = QGraphicsRectItem(0, 0, 10 + i % 7, 10 + i % 5)
+        item.setPos((i % columns) * 20, (i // columns) * 20)
+        scene.importItem(item)
+    return scene, view
+
+
+@unittest.skipUnless(RUN_SLOW_TESTS, "timing tests run only when ATC_RUN_SLOW_TESTS=1")
+class TestScaling(unittest.TestCase):
+
+    def setUp(self):
+        self.views: list[QGraphicsView] = []
+
+    def makeScene(self, n: int) -> CustomScene:
+        """ビューはテストの終了まで保持する"""
+        scene, view = make_scene(n)
+        self.views.append(view)
+        return scene
+
+    def assertScales(self, name: str, complexity: str, setup: Callable[[int], Callable[[], None]]):
+        times = [measure(setup, n) for n in SIZES]
+        exponent = fit_exponent(SIZES, times)
+        limit = COMPLEXITY_EXPONENTS[complexity] + TOLERANCE
+        detail = ", ".join(f"n={n}: {t * 1000:.2f}ms" for n, t in zip(SIZES, times))
+        self.assertLessEqual(
+            exponent, limit,
+            f"{name} grows as n^{exponent:.2f}, declared {complexity} (limit n^{limit:.2f}); {detail}")
+
+    def _action_setup(self, action_class) -> Callable[[int], Callable[[], None]]:
+        def setup(n: int) -> Callable[[], None]:
+            scene = self.makeScene(n)
+            for item in scene.items():
+                item.setSelected(True)
+            action = action_class(scene)
+            return action.execute
+        return setup
+
+    def test_align_middle_size(self):
+        self.assertScales("AlignMiddleSizeAction", 'n log n', self._action_setup(AlignMiddleSizeAction))
+
+    def test_distribute_horizontally(self):
+        self.assertScales("DistributeHorizontallyAction", 'linear', self._action_setup(DistributeHorizontallyAction))
+
+    def test_distribute_vertically(self):
+        self.assertScales("DistributeVerticallyAction", 'linear', self._action_setup(DistributeVerticallyAction))
+
+    def test_distribute_tiled(self):
+        self.assertScales("DistributeTiledAction", 'linear', self._action_setup(DistributeTiledAction))
+
+    def test_select_tool_rubber_band(self):
+        def setup(n: int) -> Callable[[], None]:
+            scene = self.makeScene(n)
+            scene.registerTool('select', SelectTool)
+            far = scene.itemsBoundingRect().bottomRight() + QPointF(10, 10)
+            start = QPointF(-5, -5)
+
+            def run():
+                scene.mousePressEvent(mouse_event(QEvent.Type.GraphicsSceneMousePress, start))
+                # 選択範囲を段階的に広げ、最後は全アイテムを含むドラッグを再現
+                for step in range(1, 5):
+                    pos = start + (far - start) * (step / 4)
+                    scene.mouseMoveEvent(mouse_event(QEvent.Type.GraphicsSceneMouseMove, pos))
+                scene.mouseReleaseEvent(mouse_event(QEvent.Type.GraphicsSceneMouseRelease, far))
+            return run
+        self.assertScales("SelectTool rubber band", 'linear', setup)
+
+    def test_select_tool_lasso(self):
+        def setup(n: int) -> Callable[[], None]:
+            scene = self.makeScene(n)
+            tool = SelectTool(scene)
+            tool.selection_shape = 'lasso'
+            scene.registerTool('select', tool)
+            bounds = scene.itemsBoundingRect()
+            center = bounds.center()
+            radius = max(bounds.width(), bounds.height())
+            # シーン全体を囲む円を描く投げ縄（頂点は64個）
+            points = [center + QPointF(radius * math.cos(t), radius * math.sin(t))
+                      for t in (2 * math.pi * i / 64 for i in range(65))]
+
+            def run():
+                scene.mousePressEvent(mouse_event(QEvent.Type.GraphicsSceneMousePress, points[0]))
+                for pos in points[1:]:
+                    scene.mouseMoveEvent(mouse_event(QEvent.Type.GraphicsSceneMouseMove, pos))
+                scene.mouseReleaseEvent(mouse_event(QEvent.Type.GraphicsSceneMouseRelease, points[-1]))
+                assert len(scene.selectedItems()) == n
+            return run
+        self.assertScales("SelectTool lasso", 'linear', setup)
+
+
+if __name__ == '__main__':
+    unittest.main()
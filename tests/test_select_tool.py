@@ -0,0 +1,171 @@
+import os
+import random
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QEvent, QPoint, QPointF, QRectF, Qt
+from PySide6.QtTest import QTest
+from PySide6.QtWidgets import QApplication, QGraphicsItem, QGraphicsRectItem, QGraphicsView
+
+from animation_tools_common.custom_scene import CustomScene
+from animation_tools_common.tools.select_tool import SelectTool
+from tests.helpers import send_mouse
+
+app = QApplication.instance() or QApplication([])
+
+
+class TogglingRectItem(QGraphicsRectItem):
+    """選択状態が切り替わった回数を記録するアイテム"""
+
+    def __init__(self, *args, log: list):
+        super().__init__(*args)
+        self.log = log
+
+    def itemChange(self, change, value):
+        if change == QGraphicsItem.GraphicsItemChange.ItemSelectedHasChanged:
+            self.log.append(self)
+        return super().itemChange(change, value)
+
+
+class TestRubberBandSelection(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = random.Random(0)
+        self.scene = CustomScene()
+        self.tool = SelectTool(self.scene)
+        self.scene.registerTool('select', self.tool)
+        self.scene.setActiveTool('select')
+        self.toggled: list[QGraphicsItem] = []
+        self.items = []
+        for i in range(400):
+            item = TogglingRectItem(0, 0, 15, 15, log=self.toggled)
+            item.setPos((i % 20) * 25, (i // 20) * 25)
+            self.scene.importItem(item)
+            self.items.append(item)
+
+    def selection(self) -> set:
+        return {item for item in self.items if item.isSelected()}
+
+    def itemsInRect(self, rect: QRectF) -> set:
+        return {item for item in self.scene.items(rect, Qt.ItemSelectionMode.IntersectsItemShape)
+                if isinstance(item, TogglingRectItem)}
+
+    def test_matches_clear_and_reselect(self):
+        for _ in range(20):
+            # 既存の選択から始める
+            for item in self.items:
+                item.setSelected(self.rng.random() < 0.2)
+            start = QPointF(self.rng.uniform(-20, 500), self.rng.uniform(-20, 500))
+            ctrl = self.rng.random() < 0.5
+            modifiers = Qt.KeyboardModifier.ControlModifier if ctrl else Qt.KeyboardModifier.NoModifier
+            send_mouse(self.scene, QEvent.Type.GraphicsSceneMousePress, start, start, modifiers=modifiers)
+            # 押した位置のアイテムの選択はツールの処理に含まれるため、ここから比較する
+            expected = self.selection()
+            for _ in range(15):
+                if self.rng.random() < 0.3:
+                    # ドラッグ中にCtrlを押したり離したりする
+                    ctrl = not ctrl
+                    modifiers = Qt.KeyboardModifier.ControlModifier if ctrl else Qt.KeyboardModifier.NoModifier
+                pos = QPointF(self.rng.uniform(-20, 500), self.rng.uniform(-20, 500))
+                if (pos - start).manhattanLength() <= 3:
+                    continue
+                before = self.selection()
+                del self.toggled[:]
+                send_mouse(self.scene, QEvent.Type.GraphicsSceneMouseMove, pos, start, modifiers=modifiers)
+
+                # 従来の処理: Ctrlなしでは選択を解除して範囲内を選択、Ctrlありでは範囲内を追加
+                hits = self.itemsInRect(QRectF(start, pos).normalized())
+                expected = hits if not ctrl else expected | hits
+                self.assertEqual(self.selection(), expected)
+                # 範囲に入った・範囲から出たアイテムだけが1回ずつ切り替わる
+                self.assertEqual(len(self.toggled), len(set(self.toggled)))
+                self.assertEqual(set(self.toggled), before ^ expected)
+            send_mouse(self.scene, QEvent.Type.GraphicsSceneMouseRelease, pos, start, modifiers=modifiers)
+            self.assertEqual(self.selection(), expected)
+
+    def test_selectable_children_are_selected(self):
+        parent = self.items[0]
+        child = QGraphicsRectItem(2, 2, 5, 5, parent)
+        child.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, True)
+        unselectable = QGraphicsRectItem(8, 8, 5, 5, parent)
+        start = QPointF(-5, -5)
+        for shape, path in (('rect', [QPointF(40, 40)]),
+                            ('lasso', [QPointF(40, -5), QPointF(40, 40), QPointF(-5, 40)])):
+            self.scene.clearSelection()
+            self.tool.selection_shape = shape
+            send_mouse(self.scene, QEvent.Type.GraphicsSceneMousePress, start, start)
+            for pos in path:
+                send_mouse(self.scene, QEvent.Type.GraphicsSceneMouseMove, pos, start)
+            send_mouse(self.scene, QEvent.Type.GraphicsSceneMouseRelease, path[-1], start)
+            self.assertTrue(child.isSelected(), shape)
+            self.assertTrue(parent.isSelected(), shape)
+            self.assertFalse(unselectable.isSelected(), shape)
+
+
+
+class TestItemPress(unittest.TestCase):
+
+    def setUp(self):
+        self.scene = CustomScene()
+        self.scene.registerTool('select', SelectTool(self.scene))
+        self.scene.setActiveTool('select')
+        self.view = QGraphicsView(self.scene)
+        self.view.setSceneRect(QRectF(0, 0, 200, 200))
+        self.view.resize(240, 240)
+        self.view.show()
+        QTest.qWaitForWindowExposed(self.view)
+        self.items = []
+        for x in (0, 100):
+            item = QGraphicsRectItem(0, 0, 40, 40)
+            item.setPos(x, 0)
+            item.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, True)
+            self.scene.importItem(item)
+            self.items.append(item)
+
+    def tearDown(self):
+        self.view.close()
+
+    def drag(self, start: QPointF, end: QPointF, modifiers=Qt.KeyboardModifier.NoModifier) -> None:
+        viewport = self.view.viewport()
+        start_pos = self.view.mapFromScene(start)
+        end_pos = self.view.mapFromScene(end)
+        QTest.mousePress(viewport, Qt.MouseButton.LeftButton, modifiers, start_pos)
+        for i in range(1, 5 if start_pos != end_pos else 1):
+            QTest.mouseMove(viewport, start_pos + (end_pos - start_pos) * i / 4)
+        QTest.mouseRelease(viewport, Qt.MouseButton.LeftButton, modifiers, end_pos)
+
+    def test_drag_moves_movable_item(self):
+        item = self.items[0]
+        self.drag(QPointF(20, 20), QPointF(60, 60))
+        self.assertEqual(item.pos(), QPointF(40, 40))
+        self.assertTrue(item.isSelected())
+        self.assertIs(self.scene.mouseGrabberItem(), None)
+        # ドラッグした位置が空間インデックスに反映されている
+        self.assertIn(item, self.scene.spatial_index.itemsAt(QPointF(75, 75)))
+
+    def test_drag_moves_whole_selection(self):
+        for item in self.items:
+            item.setSelected(True)
+        self.drag(QPointF(20, 20), QPointF(30, 50))
+        self.assertEqual([item.pos() for item in self.items], [QPointF(10, 30), QPointF(110, 30)])
+        self.assertTrue(all(item.isSelected() for item in self.items))
+
+    def test_ctrl_click_toggles_selection(self):
+        self.items[0].setSelected(True)
+        ctrl = Qt.KeyboardModifier.ControlModifier
+        self.drag(QPointF(120, 20), QPointF(120, 20), ctrl)
+        self.assertTrue(all(item.isSelected() for item in self.items))
+        self.drag(QPointF(20, 20), QPointF(20, 20), ctrl)
+        self.assertFalse(self.items[0].isSelected())
+        self.assertTrue(self.items[1].isSelected())
+
+    def test_rubber_band_from_empty_space(self):
+        self.drag(QPointF(150, 150), QPointF(60, 60))
+        self.assertEqual(self.scene.selectedItems(), [])
+        self.drag(QPointF(190, 60), QPointF(30, 30))
+        self.assertEqual([item.pos() for item in self.items], [QPointF(0, 0), QPointF(100, 0)])
+        self.assertEqual(set(self.scene.selectedItems()), set(self.items))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,318 @@
+import os
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QEvent, QRectF, Qt
+from PySide6.QtGui import QKeyEvent, QTransform
+from PySide6.QtWidgets import QApplication, QGraphicsItem, QGraphicsRectItem
+
+from animation_tools_common.custom_scene import CustomScene
+from animation_tools_common.input_recorder import SceneInputReplayer, snapshot_scene
+from animation_tools_common.selection import batchSelection, selectionBatchActive
+from animation_tools_common.tools.transform_tool import TransformTool
+from animation_tools_common.transform_scene import TransformScene
+
+app = QApplication.instance() or QApplication([])
+
+
+class TestBatchSelection(unittest.TestCase):
+
+    def setUp(self):
+        self.scene = CustomScene()
+        self.items = []
+        for i in range(50):
+            item = QGraphicsRectItem(0, 0, 10, 10)
+            item.setPos(i * 20, 0)
+            self.scene.importItem(item)
+            self.items.append(item)
+        self.emitted = 0
+        self.scene.selectionChanged.connect(self.onSelectionChanged)
+
+    def onSelectionChanged(self):
+        # ブロック中にQtが発行する通知は無視し、終了時にまとめて発行される通知だけを数える
+        if not selectionBatchActive(self.scene):
+            self.emitted += 1
+
+    def test_single_notification(self):
+        with self.scene.batchSelection():
+            for item in self.items:
+                item.setSelected(True)
+            self.assertEqual(self.emitted, 0)
+        self.assertEqual(self.emitted, 1)
+        self.assertEqual(len(self.scene.selectedItems()), 50)
+
+    def test_nested_batches_notify_once(self):
+        with self.scene.batchSelection():
+            with self.scene.batchSelection():
+                self.items[0].setSelected(True)
+            self.assertEqual(self.emitted, 0)
+            self.items[1].setSelected(True)
+        self.assertEqual(self.emitted, 1)
+
+    def test_unchanged_selection_does_not_notify(self):
+        self.items[0].setSelected(True)
+        self.emitted = 0
+        with batchSelection(self.scene):
+            self.items[0].setSelected(False)
+            self.items[0].setSelected(True)
+        self.assertEqual(self.emitted, 0)
+
+    def test_select_all(self):
+        self.scene.selectAll()
+        self.assertEqual(self.emitted, 1)
+        self.assertEqual(set(self.scene.selectedItems()), set(self.items))
+
+    def test_plain_slot_is_called_once(self):
+        calls = []
+        self.scene.selectionChanged.connect(lambda: calls.append(len(self.scene.selectedItems())))
+        with self.scene.batchSelection():
+            for item in self.items:
+                item.setSelected(True)
+            self.assertEqual(calls, [])
+        self.assertEqual(calls, [50])
+        self.scene.selectAll()
+        self.scene.clearSelection()
+        self.assertEqual(calls, [50, 0])
+
+    def test_signal_blocking_is_restored(self):
+        rects = []
+        self.scene.sceneRectChanged.connect(rects.append)
+        with self.scene.batchSelection():
+            self.items[0].setSelected(True)
+        self.assertFalse(self.scene.signalsBlocked())
+        self.scene.setSceneRect(QRectF(0, 0, 2000, 100))
+        self.assertEqual(rects, [QRectF(0, 0, 2000, 100)])
+        # 呼び出し側が止めていたシグナルは止めたまま戻す
+        self.scene.blockSignals(True)
+        with self.scene.batchSelection():
+            self.items[1].setSelected(True)
+        self.assertTrue(self.scene.signalsBlocked())
+        self.scene.blockSignals(False)
+        self.assertEqual(self.emitted, 1)
+
+    def test_transform_rect_updates_once(self):
+        scene = TransformScene()
+        items = []
+        for i in range(20):
+            item = QGraphicsRectItem(0, 0, 10, 10)
+            item.setPos(i * 20, 0)
+            item.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, True)
+            scene.addItem(item)
+            items.append(item)
+        scene.tool = 'transform'
+        updates = []
+        original = scene.updateTransformRect
+        scene.updateTransformRect = lambda *args, **kwargs: (updates.append(len(scene.selectedItems())),
+                                                           original(*args, **kwargs))
+        with scene.batchSelection():
+            for item in items:
+                item.setSelected(True)
+        self.assertEqual(updates, [20])
+
+
+class TestSelectionCache(unittest.TestCase):
+
+    def setUp(self):
+        self.scene = CustomScene()
+        self.items = []
+        for i in range(10):
+            item = QGraphicsRectItem(0, 0, 10, 10)
+            self.scene.importItem(item)
+            self.items.append(item)
+
+    def test_cache_is_reused_until_selection_changes(self):
+        self.items[0].setSelected(True)
+        cached = self.scene.cachedSelectedItems()
+        self.assertIs(self.scene.cachedSelectedItems(), cached)
+        self.items[1].setSelected(True)
+        self.assertEqual(set(self.scene.cachedSelectedItems()), {self.items[0], self.items[1]})
+        self.scene.removeItem(self.items[0])
+        self.assertEqual(self.scene.cachedSelectedItems(), (self.items[1],))
+
+    def test_cache_is_bypassed_inside_batch(self):
+        self.scene.cachedSelectedItems()
+        with self.scene.batchSelection():
+            self.items[2].setSelected(True)
+            self.assertEqual(self.scene.cachedSelectedItems(), (self.items[2],))
+        self.assertEqual(self.scene.cachedSelectedItems(), (self.items[2],))
+
+
+class CountingRectItem(QGraphicsRectItem):
+    """sceneBoundingRect() の呼び出し回数を数える"""
+    calls = 0
+
+    def sceneBoundingRect(self):
+        CountingRectItem.calls += 1
+        return super().sceneBoundingRect()
+
+
+class TestSelectionBounds(unittest.TestCase):
+
+    def make_items(self, scene, count: int) -> list:
+        items = []
+        for i in range(count):
+            item = CountingRectItem(0, 0, 10, 10)
+            item.setPos((i % 20) * 15, (i // 20) * 15)
+            item.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, True)
+            scene.addItem(item)
+            items.append(item)
+        return items
+
+    def union(self, items) -> QRectF:
+        rect = QRectF()
+        for item in items:
+            rect = rect.united(QGraphicsRectItem.sceneBoundingRect(item))
+        return rect
+
+    def test_tracks_selection_changes(self):
+        scene = CustomScene()
+        items = self.make_items(scene, 100)
+        bounds = scene.selection_bounds
+        self.assertTrue(bounds.rect().isEmpty())
+        with scene.batchSelection():
+            for item in items[:60]:
+                item.setSelected(True)
+        self.assertEqual(bounds.rect(), self.union(items[:60]))
+
+        # 追加したアイテムの矩形だけを求める
+        CountingRectItem.calls = 0
+        items[80].setSelected(True)
+        self.assertEqual(bounds.rect(), self.union(items[:60] + [items[80]]))
+        self.assertEqual(CountingRectItem.calls, 1)
+
+        # 境界のアイテムが外れた場合も、残りのアイテムの矩形は求め直さない
+        CountingRectItem.calls = 0
+        items[80].setSelected(False)
+        items[59].setSelected(False)
+        self.assertEqual(bounds.rect(), self.union(items[:59]))
+        self.assertEqual(CountingRectItem.calls, 0)
+
+        # 回転しているアイテムの数
+        items[10].setTransform(QTransform().rotate(30))
+        scene.notifyGeometryChanged(items[10])
+        self.assertEqual(bounds.rotatedCount(), 1)
+        self.assertEqual(bounds.rect(), self.union(items[:59]))
+        items[10].setSelected(False)
+        self.assertFalse(bounds.hasRotation())
+
+    def test_moved_items(self):
+        scene = CustomScene()
+        items = self.make_items(scene, 50)
+        for item in items:
+            item.setSelected(True)
+        bounds = scene.selection_bounds
+        bounds.rect()
+
+        items[3].setPos(-100, -50)
+        scene.notifyGeometryChanged(items[3])
+        self.assertEqual(bounds.rect(), self.union(items))
+
+        # 全体の移動はオフセットだけを更新する
+        CountingRectItem.calls = 0
+        for item in items:
+            item.moveBy(7, -3)
+        bounds.translate(7, -3)
+        self.assertEqual(bounds.rect(), self.union(items))
+        self.assertEqual(CountingRectItem.calls, 0)
+
+    def test_keyboard_nudge_is_incremental(self):
+        scene = TransformScene()
+        scene.tool = 'transform'
+        items = self.make_items(scene, 200)
+        with scene.batchSelection():
+            for item in items:
+                item.setSelected(True)
+        CountingRectItem.calls = 0
+        for _ in range(5):
+            scene.keyPressEvent(QKeyEvent(QEvent.Type.KeyPress, Qt.Key.Key_Right, Qt.KeyboardModifier.NoModifier))
+        self.assertEqual(CountingRectItem.calls, 0)
+        self.assertEqual(scene.transform_rect_item.rect(), self.union(items))
+        self.assertEqual(items[0].pos().x(), 5)
+
+    def test_update_transform_rect_remeasures_moved_items(self):
+        scene = TransformScene()
+        scene.tool = 'transform'
+        a, b = self.make_items(scene, 2)
+        with scene.batchSelection():
+            a.setSelected(True)
+            b.setSelected(True)
+        # notifyGeometryChanged() を通さずに動かす
+        b.setPos(200, 200)
+        scene.updateTransformRect()
+        self.assertEqual(scene.transform_rect_item.rect(), self.union([a, b]))
+        self.assertEqual(scene.selection_bounds.rect(), self.union([a, b]))
+
+    def test_tool_update_transform_rect_remeasures_moved_items(self):
+        scene = CustomScene()
+        tool = TransformTool(scene)
+        scene.registerTool('transform', tool)
+        scene.setActiveTool('transform')
+        self.addCleanup(scene.selectionChanged.disconnect, tool.onSelectionChanged)
+        a, b = self.make_items(scene, 2)
+        with scene.batchSelection():
+            a.setSelected(True)
+            b.setSelected(True)
+        self.assertEqual(tool.transform_rect_item.rect(), self.union([a, b]))
+        b.setPos(200, 200)
+        tool.updateTransformRect()
+        self.assertEqual(tool.transform_rect_item.rect(), self.union([a, b]))
+
+
+class TestSelectionSets(unittest.TestCase):
+
+    def setUp(self):
+        self.scene = CustomScene()
+        self.items = []
+        for i in range(20):
+            item = QGraphicsRectItem(0, 0, 10, 10)
+            item.setPos(i * 20, 0)
+            self.scene.importItem(item)
+            self.items.append(item)
+        self.sets = self.scene.selection_sets
+        self.sets.store('a', self.items[:10])
+        self.sets.store('b', self.items[5:15])
+        self.emitted = 0
+        self.scene.selectionChanged.connect(self.onSelectionChanged)
+
+    def onSelectionChanged(self):
+        # ブロック中にQtが発行する通知は無視し、終了時にまとめて発行される通知だけを数える
+        if not selectionBatchActive(self.scene):
+            self.emitted += 1
+
+    def test_recall_notifies_once(self):
+        self.items[19].setSelected(True)
+        self.emitted = 0
+        self.scene.recallSelectionSet('a')
+        self.assertEqual(self.emitted, 1)
+        self.assertEqual(set(self.scene.selectedItems()), set(self.items[:10]))
+        self.scene.recallSelectionSet('a')
+        self.assertEqual(self.emitted, 1)
+        self.scene.recallSelectionSet('b', add=True)
+        self.assertEqual(self.emitted, 2)
+        self.assertEqual(set(self.scene.selectedItems()), set(self.items[:15]))
+
+    def test_set_algebra(self):
+        self.sets.store('c', self.items[:10])
+        self.sets.union('c', 'b')
+        self.assertEqual(set(self.sets.items('c')), set(self.items[:15]))
+        self.sets.intersect('c', 'a')
+        self.assertEqual(set(self.sets.items('c')), set(self.items[:10]))
+        self.sets.subtract('c', 'b')
+        self.assertEqual(set(self.sets.items('c')), set(self.items[:5]))
+
+    def test_removed_items_are_ignored(self):
+        self.scene.removeItem(self.items[0])
+        self.assertEqual(set(self.sets.items('a')), set(self.items[1:10]))
+
+    def test_sets_are_saved_in_snapshot(self):
+        snapshot = snapshot_scene(self.scene)
+        self.assertEqual(snapshot['selection_sets']['b'], list(range(5, 15)))
+        replayer = SceneInputReplayer(self.scene)
+        replayer.snapshot = snapshot
+        restored = replayer.restoreSnapshot()
+        self.assertEqual(set(self.sets.items('b')), set(restored[5:15]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,270 @@
+import os
+import random
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QCoreApplication, QEvent, QPointF, QRectF, Qt
+from PySide6.QtGui import QPen
+from PySide6.QtWidgets import QApplication, QGraphicsEllipseItem, QGraphicsItem, QGraphicsRectItem, QGraphicsScene
+
+from animation_tools_common.custom_scene import CustomScene, ItemIndexPolicy
+from animation_tools_common.hit_test import topmostSelectableItemAt
+from animation_tools_common.region_item_v2 import RegionItem
+from animation_tools_common.spatial_index import SpatialIndex
+from animation_tools_common.tools.region_tool import RegionTool
+from animation_tools_common.transform_rect_item import TransformRectItem
+from tests.helpers import send_mouse
+
+app = QApplication.instance() or QApplication([])
+
+
+class TestSpatialIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = random.Random(0)
+        self.scene = CustomScene()
+        self.scene.spatial_index = SpatialIndex(cell_size=50)
+        for i in range(300):
+            if i % 3 == 0:
+                item = QGraphicsEllipseItem(0, 0, self.rng.uniform(5, 80), self.rng.uniform(5, 80))
+            else:
+                item = QGraphicsRectItem(0, 0, self.rng.uniform(5, 80), self.rng.uniform(5, 80))
+            item.setPos(self.rng.uniform(-500, 500), self.rng.uniform(-500, 500))
+            item.setRotation(self.rng.choice([0, 0, 30, 45]))
+            self.scene.importItem(item)
+        # 大きなアイテムと補助アイテム
+        self.scene.importItem(QGraphicsRectItem(-2000, -2000, 4000, 4000))
+        self.scene.addItem(TransformRectItem(QRectF(0, 0, 100, 100)))
+
+    def expected(self, rect: QRectF, mode: Qt.ItemSelectionMode) -> set:
+        return {item for item in self.scene.items(rect, mode)
+                if item.flags() & QGraphicsItem.GraphicsItemFlag.ItemIsSelectable
+                and not isinstance(item, TransformRectItem)}
+
+    def assertMatchesScene(self):
+        for _ in range(50):
+            x, y = self.rng.uniform(-600, 600), self.rng.uniform(-600, 600)
+            rect = QRectF(x, y, self.rng.uniform(1, 300), self.rng.uniform(1, 300))
+            for mode in (Qt.ItemSelectionMode.IntersectsItemShape, Qt.ItemSelectionMode.ContainsItemShape,
+                         Qt.ItemSelectionMode.IntersectsItemBoundingRect, Qt.ItemSelectionMode.ContainsItemBoundingRect):
+                self.assertEqual(set(self.scene.spatial_index.itemsInRect(rect, mode)), self.expected(rect, mode))
+            point = QPointF(x, y)
+            expected = {item for item in self.scene.items(point) if not isinstance(item, TransformRectItem)}
+            self.assertEqual(set(self.scene.spatial_index.itemsAt(point)), expected)
+
+    def test_queries_match_scene(self):
+        self.assertMatchesScene()
+
+    def test_vectorized_box_queries_match_scene(self):
+        # 境界にかかる矩形アイテムを常にNumPyで判定させる
+        self.scene.spatial_index.VECTORIZE_MIN_ITEMS = 1
+        # 既定のペン（BevelJoin）では形状の角がわずかに欠けるため、形状とバウンディング矩形を一致させる
+        for item in self.scene.items():
+            if type(item) is QGraphicsRectItem:
+                item.setPen(QPen(Qt.GlobalColor.black, 1, Qt.PenStyle.SolidLine,
+                                 Qt.PenCapStyle.SquareCap, Qt.PenJoinStyle.MiterJoin))
+        self.assertMatchesScene()
+
+    def test_queries_after_geometry_changes(self):
+        items = list(self.scene.spatial_index._bounds)
+        for item in items[:100]:
+            item.moveBy(self.rng.uniform(-200, 200), self.rng.uniform(-200, 200))
+            if isinstance(item, QGraphicsRectItem):
+                item.setRect(0, 0, self.rng.uniform(5, 150), self.rng.uniform(5, 150))
+        self.scene.notifyGeometryChanged(items[:100])
+        for item in items[100:120]:
+            self.scene.removeItem(item)
+        self.assertMatchesScene()
+
+    def test_region_items_notify_their_own_changes(self):
+        regions = []
+        for i in range(30):
+            region = RegionItem(f'r{i}', QRectF(self.rng.uniform(-500, 500), self.rng.uniform(-500, 500), 40, 30))
+            self.scene.importItem(region)
+            regions.append(region)
+        for region in regions:
+            region.moveBy(self.rng.uniform(-200, 200), self.rng.uniform(-200, 200))
+            region.setRect(0, 0, self.rng.uniform(5, 150), self.rng.uniform(5, 150))
+        for region in regions[:10]:
+            region.setRotation(region.rotation() + 20)
+        self.assertMatchesScene()
+
+    def test_helper_repaints_do_not_mark_items(self):
+        self.scene.spatial_index.itemsInRect(QRectF(-600, -600, 1200, 1200))
+        helper = next(item for item in self.scene.items() if isinstance(item, TransformRectItem))
+        for i in range(10):
+            helper.setRect(QRectF(0, 0, 100 + i, 100 + i))
+            helper.update()
+            QCoreApplication.processEvents()
+        self.assertFalse(self.scene.spatial_index._dirty)
+
+    def test_helper_items_are_not_indexed(self):
+        helpers = [item for item in self.scene.items() if isinstance(item, TransformRectItem)]
+        self.assertTrue(helpers)
+        self.assertFalse(any(item in self.scene.spatial_index for item in helpers))
+
+    def test_topmost_item_matches_scene(self):
+        for item in list(self.scene.spatial_index._bounds)[::7]:
+            item.setZValue(self.rng.choice([-1, 1, 2]))
+        for _ in range(200):
+            point = QPointF(self.rng.uniform(-600, 600), self.rng.uniform(-600, 600))
+            expected = next(item for item in self.scene.items(point) if not isinstance(item, TransformRectItem))
+            self.assertIs(topmostSelectableItemAt(self.scene, point), expected)
+
+    def test_drag_notifies_selected_items(self):
+        item = QGraphicsRectItem(0, 0, 20, 20)
+        item.setPos(1000, 1000)
+        item.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, True)
+        self.scene.importItem(item)
+        item.setZValue(10)
+        press = QPointF(1010, 1010)
+        send_mouse(self.scene, QEvent.Type.GraphicsSceneMousePress, press, press)
+        send_mouse(self.scene, QEvent.Type.GraphicsSceneMouseMove, QPointF(-890, -890), press)
+        send_mouse(self.scene, QEvent.Type.GraphicsSceneMouseRelease, QPointF(-890, -890), press)
+        self.assertEqual(item.pos(), QPointF(-900, -900))
+        self.assertIn(item, self.scene.spatial_index.itemsAt(QPointF(-890, -890)))
+
+    def test_drag_marks_selection_once(self):
+        items = []
+        for i in range(50):
+            item = QGraphicsRectItem(0, 0, 20, 20)
+            item.setPos(1000 + i * 30, 1000)
+            item.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, True)
+            self.scene.importItem(item)
+            item.setZValue(10)
+            item.setSelected(True)
+            items.append(item)
+        index = self.scene.spatial_index
+        marked = []
+        mark_dirty = index.markDirty
+        index.markDirty = lambda dirty: marked.append(dirty) or mark_dirty(dirty)
+        press = QPointF(1010, 1010)
+        send_mouse(self.scene, QEvent.Type.GraphicsSceneMousePress, press, press)
+        for i in range(1, 11):
+            send_mouse(self.scene, QEvent.Type.GraphicsSceneMouseMove, press + QPointF(0, i * 100), press)
+        # 移動イベントごとには通知せず、ドラッグ中の検索では移動後の位置で見つかる
+        self.assertEqual(marked, [])
+        self.assertIn(items[-1], index.itemsAt(QPointF(2480, 2010)))
+        send_mouse(self.scene, QEvent.Type.GraphicsSceneMouseRelease, press + QPointF(0, 1000), press)
+        self.assertEqual(len(marked), 1)
+        self.assertEqual(set(marked[0]), set(items))
+        self.assertFalse(index._moving)
+        self.assertIn(items[-1], index.itemsAt(QPointF(2480, 2010)))
+
+
+class TestTopmostSelectableItem(unittest.TestCase):
+
+    def setUp(self):
+        self.scene = CustomScene()
+        self.items = []
+        for i in range(4):
+            item = QGraphicsRectItem(0, 0, 40, 40)
+            item.setPos(i * 10, 0)
+            self.scene.importItem(item)
+            self.items.append(item)
+
+    def topmostInScene(self, point: QPointF):
+        return next(item for item in self.scene.items(point)
+                    if item.flags() & QGraphicsItem.GraphicsItemFlag.ItemIsSelectable)
+
+    def test_restacked_items_follow_scene_order(self):
+        point = QPointF(35, 20)
+        self.assertIs(topmostSelectableItemAt(self.scene, point), self.items[3])
+        self.items[3].stackBefore(self.items[1])
+        self.assertIs(topmostSelectableItemAt(self.scene, point), self.items[2])
+        self.items[2].stackBefore(self.items[0])
+        self.assertIs(topmostSelectableItemAt(self.scene, point), self.topmostInScene(point))
+        self.assertIs(topmostSelectableItemAt(self.scene, point), self.items[1])
+
+    def test_selectable_child_is_returned(self):
+        parent = self.items[3]
+        child = QGraphicsRectItem(5, 5, 10, 10, parent)
+        child.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, True)
+        self.assertIs(topmostSelectableItemAt(self.scene, QPointF(40, 10)), child)
+        self.assertIs(topmostSelectableItemAt(self.scene, QPointF(60, 30)), parent)
+        # 選択できない子アイテムの下は親を返す
+        child.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, False)
+        self.assertIs(topmostSelectableItemAt(self.scene, QPointF(40, 10)), parent)
+
+    def test_child_outside_parent_bounds(self):
+        child = QGraphicsRectItem(0, 100, 10, 10, self.items[0])
+        child.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, True)
+        self.assertIs(topmostSelectableItemAt(self.scene, QPointF(5, 105)), child)
+        self.assertIsNone(topmostSelectableItemAt(self.scene, QPointF(5, 200)))
+
+
+class TestRegionTool(unittest.TestCase):
+
+    def setUp(self):
+        self.scene = CustomScene()
+        self.scene.registerTool('region', RegionTool(self.scene))
+        self.scene.setActiveTool('region')
+        self.region = RegionItem('existing', QRectF(0, 0, 100, 100))
+        self.scene.addItem(self.region)
+
+    def regions(self) -> list:
+        return [item for item in self.scene.items() if isinstance(item, RegionItem)]
+
+    def drag(self, start: QPointF, end: QPointF) -> None:
+        send_mouse(self.scene, QEvent.Type.GraphicsSceneMousePress, start, start)
+        send_mouse(self.scene, QEvent.Type.GraphicsSceneMouseMove, end, start)
+        send_mouse(self.scene, QEvent.Type.GraphicsSceneMouseRelease, end, start)
+
+    def test_click_on_region_selects_it(self):
+        self.scene.registerTool('region', RegionTool(self.scene, select_existing=True))
+        self.scene.setActiveTool('region')
+        # 領域は自身の移動を空間インデックスに通知する
+        self.region.setPos(300, 300)
+        self.drag(QPointF(350, 350), QPointF(352, 352))
+        self.assertEqual(self.regions(), [self.region])
+        self.assertTrue(self.region.isSelected())
+
+    def test_drag_on_region_creates_region_by_default(self):
+        self.drag(QPointF(20, 20), QPointF(90, 90))
+        created = [item for item in self.regions() if item is not self.region]
+        self.assertEqual(len(created), 1)
+        self.assertEqual(created[0].pos(), QPointF(20, 20))
+        self.assertFalse(self.region.isSelected())
+
+    def test_drag_on_empty_space_creates_region(self):
+        self.drag(QPointF(200, 200), QPointF(300, 280))
+        created = [item for item in self.regions() if item is not self.region]
+        self.assertEqual(len(created), 1)
+        self.assertEqual(created[0].pos(), QPointF(200, 200))
+        self.assertEqual(created[0].rect(), QRectF(0, 0, 100, 80))
+
+class TestItemIndexPolicy(unittest.TestCase):
+
+    def setUp(self):
+        self.scene = CustomScene()
+        self.scene.setIndexPolicy(ItemIndexPolicy(min_items=10))
+
+    def indexMethod(self) -> QGraphicsScene.ItemIndexMethod:
+        QCoreApplication.processEvents()  # 再判定はイベントループに戻った時に行われる
+        return self.scene.itemIndexMethod()
+
+    def test_child_items_are_counted(self):
+        parent = QGraphicsRectItem(0, 0, 100, 100)
+        for i in range(10):
+            QGraphicsRectItem(i * 10, 0, 5, 5, parent)
+        self.scene.addItem(parent)
+        self.assertEqual(self.indexMethod(), QGraphicsScene.ItemIndexMethod.BspTreeIndex)
+        # 子アイテムも親と一緒に取り除かれる
+        self.scene.removeItem(parent)
+        self.assertEqual(self.indexMethod(), QGraphicsScene.ItemIndexMethod.NoIndex)
+
+    def test_count_follows_clear_and_readd(self):
+        items = [QGraphicsRectItem(i * 10, 0, 5, 5) for i in range(12)]
+        for item in items:
+            self.scene.addItem(item)
+        self.assertEqual(self.indexMethod(), QGraphicsScene.ItemIndexMethod.BspTreeIndex)
+        self.scene.clear()
+        self.assertEqual(self.indexMethod(), QGraphicsScene.ItemIndexMethod.NoIndex)
+        for i in range(5):
+            self.scene.addItem(QGraphicsRectItem(i * 10, 0, 5, 5))
+        self.assertEqual(self.indexMethod(), QGraphicsScene.ItemIndexMethod.NoIndex)
+
+
+if __name__ == '__main__':
+    unittest.main()
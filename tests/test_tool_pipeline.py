@@ -0,0 +1,67 @@
+import os
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QEvent, QPointF
+from PySide6.QtWidgets import QApplication, QGraphicsRectItem
+
+from animation_tools_common.custom_scene import CustomScene
+from animation_tools_common.tools.base_tool import BaseTool
+from tests.helpers import send_mouse
+
+app = QApplication.instance() or QApplication([])
+
+
+class RecordingTool(BaseTool):
+    def __init__(self, scene, name, log, handles=False):
+        super().__init__(scene)
+        self.name = name
+        self.log = log
+        self.handles = handles
+
+    def setup(self):
+        pass
+
+    def cleanup(self):
+        pass
+
+    def mousePressEvent(self, event):
+        self.log.append(self.name)
+        return self.handles
+
+
+class TestToolPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.scene = CustomScene()
+        self.item = QGraphicsRectItem(0, 0, 10, 10)
+        self.scene.importItem(self.item)
+        self.log = []
+
+    def test_overlays_run_by_priority_before_active_tool(self):
+        self.scene.registerTool('active', RecordingTool(self.scene, 'active', self.log))
+        self.scene.addOverlayTool(RecordingTool(self.scene, 'low', self.log), priority=0)
+        self.scene.addOverlayTool(RecordingTool(self.scene, 'high', self.log), priority=10)
+        send_mouse(self.scene, QEvent.Type.GraphicsSceneMousePress, QPointF(5, 5))
+        self.assertEqual(self.log, ['high', 'low', 'active'])
+        # どのツールも処理しなかった場合はQt標準の処理でアイテムが選択される
+        self.assertTrue(self.item.isSelected())
+
+    def test_handled_event_skips_remaining_tools_and_default_handler(self):
+        self.scene.registerTool('active', RecordingTool(self.scene, 'active', self.log))
+        overlay = RecordingTool(self.scene, 'overlay', self.log, handles=True)
+        self.scene.addOverlayTool(overlay)
+        event = send_mouse(self.scene, QEvent.Type.GraphicsSceneMousePress, QPointF(5, 5))
+        self.assertEqual(self.log, ['overlay'])
+        self.assertTrue(event.isAccepted())
+        self.assertFalse(self.item.isSelected())
+
+        self.scene.removeOverlayTool(overlay)
+        self.assertFalse(overlay.is_active)
+        send_mouse(self.scene, QEvent.Type.GraphicsSceneMousePress, QPointF(5, 5))
+        self.assertEqual(self.log, ['overlay', 'active'])
+
+
+if __name__ == '__main__':
+    unittest.main()
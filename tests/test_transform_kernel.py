@@ -0,0 +1,94 @@
+import os
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QPointF
+from PySide6.QtGui import QTransform
+from PySide6.QtWidgets import QApplication, QGraphicsEllipseItem, QGraphicsRectItem, QGraphicsScene
+
+from animation_tools_common.tools.transform_tool import TransformTool
+from animation_tools_common.transform_kernel import TransformBatch
+
+app = QApplication.instance() or QApplication([])
+
+
+def make_items(scene) -> list:
+    items = []
+    for i in range(12):
+        item = QGraphicsRectItem(0, 0, 40 + i, 30) if i % 2 == 0 else QGraphicsEllipseItem(0, 0, 20, 30 + i)
+        item.setPos(10 * i - 50, 7 * i + 3)
+        transform = QTransform()
+        transform.rotate(15 * i)
+        if i % 3 == 0:
+            transform.scale(1.5, 0.75)
+        item.setTransform(transform)
+        if i % 4 == 1:
+            item.setRotation(20)
+        scene.addItem(item)
+        items.append(item)
+    return items
+
+
+class TestTransformBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.scene = QGraphicsScene()
+        self.tool = TransformTool(self.scene)
+        self.addCleanup(self.scene.selectionChanged.disconnect, self.tool.onSelectionChanged)
+
+    def assertSameGeometry(self, items, expected_items):
+        for item, expected in zip(items, expected_items):
+            self.assertAlmostEqual(item.pos().x(), expected.pos().x(), places=6)
+            self.assertAlmostEqual(item.pos().y(), expected.pos().y(), places=6)
+            for a, b in zip(
+                (item.transform().m11(), item.transform().m12(), item.transform().m21(), item.transform().m22(),
+                 item.transform().dx(), item.transform().dy()),
+                (expected.transform().m11(), expected.transform().m12(), expected.transform().m21(),
+                 expected.transform().m22(), expected.transform().dx(), expected.transform().dy())):
+                self.assertAlmostEqual(a, b, places=6)
+            self.assertAlmostEqual(item.boundingRect().width(), expected.boundingRect().width(), places=6)
+            self.assertAlmostEqual(item.boundingRect().height(), expected.boundingRect().height(), places=6)
+
+    def test_matches_per_item_transform(self):
+        items = make_items(self.scene)
+        expected_items = make_items(self.scene)
+        batch, others = TransformBatch.split(items)
+        self.assertEqual(others, [])
+
+        # ドラッグ中と同じく、同じ配列に対して変形を繰り返す
+        steps = [('scale', 1.2, 0.9, QPointF(-20, 10)), ('rotate', 30, QPointF(15, 40)),
+                 ('translate', 5, -3), ('scale', 0.8, 1.1, QPointF(60, -5)), ('rotate', -12.5, QPointF(0, 0))]
+        for step in steps:
+            if step[0] == 'scale':
+                _, sx, sy, origin = step
+                batch.scale(sx, sy, origin)
+                for item in expected_items:
+                    if isinstance(item, QGraphicsRectItem):
+                        self.tool._transformRectItem(item, sx, sy, origin)
+                    else:
+                        self.tool._transformGenericItem(item, sx, sy, origin)
+            elif step[0] == 'rotate':
+                _, angle, center = step
+                batch.rotate(angle, center)
+                for item in expected_items:
+                    self.tool._rotateItem(item, angle, center)
+            else:
+                _, dx, dy = step
+                batch.translate(dx, dy)
+                for item in expected_items:
+                    item.setPos(item.pos() + QPointF(dx, dy))
+            batch.apply()
+            self.assertSameGeometry(items, expected_items)
+
+    def test_split_keeps_child_items_separate(self):
+        parent = QGraphicsRectItem(0, 0, 10, 10)
+        child = QGraphicsRectItem(0, 0, 5, 5, parent)
+        self.scene.addItem(parent)
+        batch, others = TransformBatch.split([parent, child])
+        self.assertEqual(batch.items, [parent])
+        self.assertEqual(others, [child])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+import os
+import unittest
+
+import numpy as np
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QLineF, QPointF, QRectF
+from PySide6.QtGui import QColor, QImage, QPainter
+from PySide6.QtTest import QTest
+from PySide6.QtWidgets import QApplication, QGraphicsScene, QGraphicsView, QStyleOptionGraphicsItem
+
+from animation_tools_common.transform_rect_item import TransformRectItem
+
+app = QApplication.instance() or QApplication([])
+
+
+class TestTransformRectItemGeometryCache(unittest.TestCase):
+
+    def setUp(self):
+        self.scene = QGraphicsScene()
+        self.item = TransformRectItem(QRectF(0, 0, 100, 50))
+        self.scene.addItem(self.item)
+
+    def test_bounding_rect_is_cached_and_copied(self):
+        rect = self.item.boundingRect()
+        rect.setLeft(-1000)
+        self.assertEqual(self.item.boundingRect(), self.item._computeBoundingRect())
+        self.assertIsNotNone(self.item._bounding_rect_cache)
+
+    def test_cache_follows_rect_and_transform_center(self):
+        before = self.item.boundingRect()
+        self.item.setRect(QRectF(0, 0, 300, 200))
+        self.assertEqual(self.item.boundingRect(), self.item._computeBoundingRect())
+        self.assertNotEqual(self.item.boundingRect(), before)
+
+        self.item.transformCenterOffset = QPointF(400, 0)
+        self.assertEqual(self.item.boundingRect(), self.item._computeBoundingRect())
+        self.assertTrue(self.item.boundingRect().contains(QPointF(400 + 150, 100)))
+
+    def test_shape_follows_handles_and_flags(self):
+        shape = self.item.shape()
+        cached = self.item._shape_cache
+        self.assertEqual(self.item.shape(), shape)
+        self.assertIs(self.item._shape_cache, cached)
+        self.item.setRotatable(False)
+        self.assertEqual(self.item.shape(), self.item._computeShape())
+        self.assertNotEqual(self.item.shape(), shape)
+        self.item.setRect(QRectF(0, 0, 10, 10))
+        self.item.updateHandlesPos()
+        self.assertEqual(self.item.shape(), self.item._computeShape())
+
+
+class TestTransformRectItemHandleTable(unittest.TestCase):
+
+    def setUp(self):
+        self.scene = QGraphicsScene()
+        self.item = TransformRectItem(QRectF(0, 0, 100, 50))
+        self.scene.addItem(self.item)
+        self.item.updateHandlesPos()
+
+    def scan(self, point: QPointF):
+        """表を使わずにハンドルを探す"""
+        item = self.item
+        rotate_handles = (item.handleRotate, item.handleTransformCenter)
+        middle_handles = (item.handleTopMiddle, item.handleMiddleLeft, item.handleMiddleRight, item.handleBottomMiddle)
+        for k, v in item.handles.items():
+            if k in rotate_handles:
+                if not item.rotatable:
+                    continue
+            elif not item.resizable or (item.keep_aspect_ratio and k in middle_handles):
+                continue
+            if k == item.handleRotate:
+                distance = QLineF(v.center(), point).length()
+                if abs(distance - v.width() / 2) <= item.tolerance / item.get_lod():
+                    return k
+            elif v.adjusted(-item.adjust_size, -item.adjust_size, item.adjust_size, item.adjust_size).contains(point):
+                return k
+        return None
+
+    def assertMatchesScan(self):
+        bounds = self.item.boundingRect()
+        for i in range(60):
+            for j in range(60):
+                point = QPointF(bounds.left() + bounds.width() * i / 59, bounds.top() + bounds.height() * j / 59)
+                self.assertEqual(self.item.handleAt(point), self.scan(point), (point.x(), point.y()))
+
+    def test_handle_at_matches_scan(self):
+        self.assertMatchesScan()
+        self.item.setKeepAspectRatio(True)
+        self.assertMatchesScan()
+        self.item.setRotatable(False)
+        self.assertMatchesScan()
+        self.item.setRect(QRectF(-30, 10, 60, 200))
+        self.item.updateHandlesPos()
+        self.assertMatchesScan()
+
+
+class TestTransformRectItemGlyphCache(unittest.TestCase):
+
+    def render(self, item: TransformRectItem, use_glyph_cache: bool, dx: float, dy: float, angle: float) -> np.ndarray:
+        item.use_glyph_cache = use_glyph_cache
+        image = QImage(300, 300, QImage.Format.Format_ARGB32_Premultiplied)
+        image.fill(QColor(255, 255, 255))
+        painter = QPainter(image)
+        painter.translate(dx, dy)
+        painter.rotate(angle)
+        item.paint(painter, QStyleOptionGraphicsItem(), None)
+        painter.end()
+        return np.frombuffer(image.constBits(), dtype=np.uint8).reshape(300, 300, 4).astype(int)
+
+    def test_glyphs_match_vector_painting(self):
+        item = TransformRectItem(QRectF(0, 0, 100, 60))
+        for debug in (False, True):
+            item.set_debug_mode(debug)
+            for dx, dy, angle in ((100, 100, 0), (100.3, 120.6, 0), (150.1, 80.7, 30)):
+                diff = np.abs(self.render(item, True, dx, dy, angle) - self.render(item, False, dx, dy, angle))
+                # 端数の位置を1/4ピクセル単位に丸めるため、輪郭のアンチエイリアスだけがわずかに異なる
+                self.assertLess(diff.mean(), 0.1)
+                self.assertLessEqual((diff.max(axis=2) > 64).sum(), 0)
+
+
+class TestTransformRectItemPerViewLod(unittest.TestCase):
+
+    def setUp(self):
+        self.scene = QGraphicsScene()
+        self.item = TransformRectItem(QRectF(0, 0, 100, 50))
+        self.scene.addItem(self.item)
+        self.overview = QGraphicsView(self.scene)
+        self.zoomed = QGraphicsView(self.scene)
+        self.zoomed.scale(4, 4)
+
+    def hover(self, view: QGraphicsView, pos: QPointF):
+        """ビューのビューポートにマウス移動を送る（シーンのホバーイベントはビューから送られる）"""
+        point = view.mapFromScene(self.item.mapToScene(pos))
+        QTest.mouseMove(view.viewport(), point)
+        QApplication.processEvents()
+
+    def test_hit_test_uses_event_view(self):
+        for view in (self.overview, self.zoomed):
+            view.resize(400, 300)
+            view.centerOn(self.item)
+            view.show()
+        QTest.qWaitForWindowExposed(self.zoomed)
+        # 左上のハンドルの中心から少し内側の位置: 等倍のビューでは当たり、4倍のビューでは外れる
+        pos = QPointF(6, 1)
+        self.hover(self.overview, QPointF(30, 30))
+        self.hover(self.overview, pos)
+        self.assertAlmostEqual(self.item.get_lod(), 1)
+        self.assertEqual(self.item.handleAt(pos), TransformRectItem.handleTopLeft)
+        self.hover(self.zoomed, QPointF(30, 30))
+        self.hover(self.zoomed, pos)
+        self.assertAlmostEqual(self.item.get_lod(), 4)
+        self.assertIsNone(self.item.handleAt(pos))
+        self.assertAlmostEqual(self.item.get_lod(self.overview), 1)
+
+    def test_layouts_are_reused_per_lod(self):
+        self.item._useLod(1.0)
+        handles = self.item.handles
+        self.item._useLod(4.0)
+        self.assertAlmostEqual(self.item.handles[TransformRectItem.handleTopLeft].width(), 2)
+        self.item._useLod(1.0)
+        self.assertIs(self.item.handles, handles)
+        # 矩形が変わると保存していた配置は破棄される
+        self.item.setRect(QRectF(0, 0, 200, 50))
+        self.item.updateHandlesPos()
+        self.item._useLod(4.0)
+        self.assertEqual(self.item.handles[TransformRectItem.handleTopRight].center(), QPointF(200, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,348 @@
+import math
+import os
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QCoreApplication, QEvent, QPointF, Qt
+from PySide6.QtWidgets import QApplication, QGraphicsItem, QGraphicsRectItem
+
+from animation_tools_common.custom_scene import CustomScene
+from animation_tools_common.tools.transform_tool import TransformTool
+from animation_tools_common.transform_group_item import TransformGroupItem
+from animation_tools_common.transform_scene import TransformScene
+from tests.helpers import send_mouse
+
+app = QApplication.instance() or QApplication([])
+
+
+def add_items(scene, count: int = 20) -> list[QGraphicsRectItem]:
+    items = []
+    for i in range(count):
+        item = QGraphicsRectItem(0, 0, 40, 30)
+        item.setPos(100 + (i % 5) * 50, 100 + (i // 5) * 40)
+        item.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, True)
+        if hasattr(scene, 'importItem'):
+            scene.importItem(item)
+        else:
+            scene.addItem(item)
+        item.setSelected(True)
+        items.append(item)
+    return items
+
+
+class TestTransformDragCoalescing(unittest.TestCase):
+
+    def drag(self, scene, rect_item, moves: int = 30) -> int:
+        """変形矩形の内側を掴んで移動し、itemsMovedの発行回数を返す"""
+        emitted = []
+        scene_signal = scene.itemsMoved if isinstance(scene, TransformScene) else scene.tools['transform'].itemsMoved
+        scene_signal.connect(emitted.append)
+        rect = rect_item.rect()
+        press = rect_item.mapToScene(rect.center() + QPointF(rect.width() / 4, rect.height() / 4))
+        send_mouse(scene, QEvent.Type.GraphicsSceneMousePress, press, press, press)
+        last = press
+        # イベントループを回さない（タイマーが発火しない）高頻度の入力を想定
+        for i in range(1, moves + 1):
+            pos = press + QPointF(i * 2, i)
+            send_mouse(scene, QEvent.Type.GraphicsSceneMouseMove, pos, press, last)
+            last = pos
+        send_mouse(scene, QEvent.Type.GraphicsSceneMouseRelease, last, press, last)
+        return len(emitted)
+
+    def run_tool(self, coalesce_updates: bool) -> tuple[list[QPointF], int]:
+        scene = CustomScene()
+        tool = TransformTool(scene, coalesce_updates=coalesce_updates)
+        scene.registerTool('transform', tool)
+        scene.setActiveTool('transform')
+        items = add_items(scene)
+        count = self.drag(scene, tool.transform_rect_item)
+        # シーンの破棄時の選択変更でツールが呼ばれないようにする
+        scene.selectionChanged.disconnect(tool.onSelectionChanged)
+        return [item.pos() for item in items], count
+
+    def run_scene(self, coalesce_updates: bool) -> tuple[list[QPointF], int]:
+        scene = TransformScene(coalesce_updates=coalesce_updates)
+        scene.tool = 'transform'
+        items = add_items(scene)
+        count = self.drag(scene, scene.transform_rect_item)
+        return [item.pos() for item in items], count
+
+    def test_tool_applies_final_state_on_release(self):
+        immediate, immediate_count = self.run_tool(False)
+        coalesced, coalesced_count = self.run_tool(True)
+        self.assertEqual(coalesced, immediate)
+        # 最終位置は変形矩形の移動量（60, 30）と一致する
+        self.assertEqual(immediate[0], QPointF(160, 130))
+        self.assertLessEqual(coalesced_count, 2)
+        self.assertGreater(immediate_count, 20)
+
+    def test_scene_applies_final_state_on_release(self):
+        immediate, _ = self.run_scene(False)
+        coalesced, coalesced_count = self.run_scene(True)
+        self.assertEqual(coalesced, immediate)
+        self.assertEqual(immediate[0], QPointF(160, 130))
+        self.assertLessEqual(coalesced_count, 2)
+
+
+class TestTransformPreview(unittest.TestCase):
+
+    def run_tool(self, preview_min_items: int | None, corner: bool) -> tuple[CustomScene, TransformTool, list, list]:
+        scene = CustomScene()
+        tool = TransformTool(scene, preview_min_items=preview_min_items)
+        scene.registerTool('transform', tool)
+        scene.setActiveTool('transform')
+        items = add_items(scene, 30)
+        finished = []
+        tool.itemsTransformedFinished.connect(finished.append)
+        self.addCleanup(scene.selectionChanged.disconnect, tool.onSelectionChanged)
+
+        rect_item = tool.transform_rect_item
+        rect = rect_item.rect()
+        # 右下のハンドルを掴んでリサイズ、または内側を掴んで移動
+        press = rect_item.mapToScene(rect.bottomRight() if corner else rect.center() + QPointF(rect.width() / 4, 0))
+        send_mouse(scene, QEvent.Type.GraphicsSceneMousePress, press, press, press)
+        last = press
+        for i in range(1, 21):
+            pos = press + QPointF(i * 3, i * 2)
+            send_mouse(scene, QEvent.Type.GraphicsSceneMouseMove, pos, press, last)
+            last = pos
+        if preview_min_items is not None:
+            # ドラッグ中はプレビューだけが変形し、アイテムは動かない
+            self.assertIs(tool.preview_item.scene(), scene)
+            self.assertFalse(tool.preview_item.transform().isIdentity())
+            self.assertEqual(items[0].pos(), QPointF(100, 100))
+            self.assertEqual(finished, [])
+        send_mouse(scene, QEvent.Type.GraphicsSceneMouseRelease, last, press, last)
+        return scene, tool, items, finished
+
+    def test_preview_commits_once_on_release(self):
+        for corner in (False, True):
+            _, _, direct_items, _ = self.run_tool(None, corner)
+            scene, tool, items, finished = self.run_tool(10, corner)
+            self.assertIsNone(tool.preview_item.scene())
+            self.assertEqual(len(finished), 1)
+            self.assertEqual(set(finished[0]), set(items))
+            for item, expected in zip(items, direct_items):
+                self.assertAlmostEqual(item.pos().x(), expected.pos().x(), places=6)
+                self.assertAlmostEqual(item.pos().y(), expected.pos().y(), places=6)
+                self.assertAlmostEqual(item.rect().width(), expected.rect().width(), places=6)
+            # 空間インデックスにもリリース時の変形が反映されている
+            moved = items[-1].sceneBoundingRect()
+            self.assertIn(items[-1], scene.spatial_index.itemsInRect(moved))
+
+
+class TestTransformGroup(unittest.TestCase):
+
+    def run_drag(self, scene, rect_item, corner: bool, during_drag=None) -> None:
+        rect = rect_item.rect()
+        press = rect_item.mapToScene(rect.bottomRight() if corner else rect.center() + QPointF(rect.width() / 4, 0))
+        send_mouse(scene, QEvent.Type.GraphicsSceneMousePress, press, press, press)
+        last = press
+        for i in range(1, 21):
+            pos = press + QPointF(i * 3, i * 2)
+            send_mouse(scene, QEvent.Type.GraphicsSceneMouseMove, pos, press, last)
+            last = pos
+        if during_drag is not None:
+            during_drag()
+        send_mouse(scene, QEvent.Type.GraphicsSceneMouseRelease, last, press, last)
+
+    def run_tool(self, group_min_items: int | None, corner: bool):
+        scene = CustomScene()
+        tool = TransformTool(scene, group_min_items=group_min_items)
+        scene.registerTool('transform', tool)
+        scene.setActiveTool('transform')
+        items = add_items(scene, 30)
+        # 選択アイテムの奥と手前に重なる選択外のアイテム、追加順と異なる重なり順のメンバー
+        for z in (-1, 1):
+            other = QGraphicsRectItem(0, 0, 500, 500)
+            other.setZValue(z)
+            scene.importItem(other)
+        items[10].stackBefore(items[0])
+        order = scene.items(scene.itemsBoundingRect(), Qt.ItemSelectionMode.IntersectsItemBoundingRect,
+                            Qt.SortOrder.AscendingOrder)
+        finished = []
+        tool.itemsTransformedFinished.connect(finished.append)
+        self.addCleanup(scene.selectionChanged.disconnect, tool.onSelectionChanged)
+
+        def during_drag():
+            if group_min_items is None:
+                return
+            # ドラッグ中はグループだけが変形し、アイテム自身の位置と変換は変わらない
+            self.assertIs(items[0].topLevelItem(), tool.group_item)
+            self.assertEqual(items[0].pos(), QPointF(100, 100))
+            self.assertNotEqual(items[0].sceneBoundingRect().topLeft(), QPointF(100, 100))
+            self.assertTrue(items[0].isSelected())
+            self.assertEqual(finished, [])
+
+        self.run_drag(scene, tool.transform_rect_item, corner, during_drag)
+        return scene, tool, items, finished, order
+
+    def test_group_commits_once_on_release(self):
+        for corner in (False, True):
+            _, _, direct_items, _, _ = self.run_tool(None, corner)
+            scene, tool, items, finished, order = self.run_tool(10, corner)
+            self.assertIsNone(tool.group_item.scene())
+            self.assertIs(items[0].topLevelItem(), items[0])
+            self.assertEqual(len(finished), 1)
+            self.assertEqual(set(finished[0]), set(items))
+            for item, expected in zip(items, direct_items):
+                self.assertEqual(item.pos(), expected.pos())
+                self.assertEqual(item.rect(), expected.rect())
+                self.assertEqual(item.transform(), expected.transform())
+            # グループの解除後も重なり順は変わらない
+            self.assertEqual(scene.items(scene.itemsBoundingRect(), Qt.ItemSelectionMode.IntersectsItemBoundingRect,
+                                         Qt.SortOrder.AscendingOrder), order)
+            moved = items[-1].sceneBoundingRect()
+            self.assertIn(items[-1], scene.spatial_index.itemsInRect(moved))
+
+    def test_unselected_item_between_members_disables_group(self):
+        scene = CustomScene()
+        tool = TransformTool(scene, group_min_items=2)
+        scene.registerTool('transform', tool)
+        scene.setActiveTool('transform')
+        self.addCleanup(scene.selectionChanged.disconnect, tool.onSelectionChanged)
+        a, b = add_items(scene, 2)
+        b.setZValue(5)
+        middle = QGraphicsRectItem(0, 0, 500, 500)
+        middle.setZValue(3)
+        scene.importItem(middle)
+        self.assertFalse(TransformGroupItem.supports([a, b]))
+        # 選択外のアイテムがメンバーより手前だけにある場合はまとめられる
+        middle.setZValue(6)
+        self.assertTrue(TransformGroupItem.supports([a, b]))
+        middle.setZValue(3)
+
+        def during_drag():
+            # グループにまとめず、aはmiddleの奥に描かれたまま
+            self.assertIsNone(tool.group_item.scene())
+            self.assertIs(a.topLevelItem(), a)
+            under_cursor = scene.items(a.sceneBoundingRect().center())
+            self.assertLess(under_cursor.index(middle), under_cursor.index(a))
+
+        self.run_drag(scene, tool.transform_rect_item, False, during_drag)
+        self.assertNotEqual(a.pos(), QPointF(100, 100))
+
+    def test_press_outside_transform_rect_does_not_prepare_drag(self):
+        scene = CustomScene()
+        tool = TransformTool(scene, group_min_items=2, preview_min_items=2)
+        scene.registerTool('transform', tool)
+        scene.setActiveTool('transform')
+        self.addCleanup(scene.selectionChanged.disconnect, tool.onSelectionChanged)
+        transform_scene = TransformScene(group_min_items=2)
+        transform_scene.tool = 'transform'
+        for target in (tool, transform_scene):
+            drag_scene = scene if target is tool else transform_scene
+            items = add_items(drag_scene, 5)
+            press = QPointF(600, 600)
+            send_mouse(drag_scene, QEvent.Type.GraphicsSceneMousePress, press, press, press)
+            # 変形矩形の外の押下ではグループ・プレビュー・スナップショットを用意しない
+            self.assertIsNone(target.group_item.scene())
+            self.assertIsNone(target._press_state)
+            self.assertIsNone(target.last_transform_rect)
+            send_mouse(drag_scene, QEvent.Type.GraphicsSceneMouseMove, press + QPointF(30, 20), press, press)
+            send_mouse(drag_scene, QEvent.Type.GraphicsSceneMouseRelease, press + QPointF(30, 20), press,
+                       press + QPointF(30, 20))
+            self.assertEqual(items[0].pos(), QPointF(100, 100))
+
+    def test_group_queries_only_around_members(self):
+        scene = CustomScene()
+        tool = TransformTool(scene, group_min_items=10)
+        scene.registerTool('transform', tool)
+        scene.setActiveTool('transform')
+        self.addCleanup(scene.selectionChanged.disconnect, tool.onSelectionChanged)
+        items = add_items(scene, 20)
+        for i in range(200):
+            other = QGraphicsRectItem(0, 0, 10, 10)
+            other.setPos(2000 + (i % 20) * 20, (i // 20) * 20)
+            scene.importItem(other)
+        QCoreApplication.processEvents()  # 追加時に予約されたインデックス方式の再判定を済ませる
+        returned = []
+        items_in_scene = scene.items
+        scene.items = lambda *args: returned.append(len(result := items_in_scene(*args))) or result
+
+        def during_drag():
+            self.assertIs(items[0].topLevelItem(), tool.group_item)
+
+        self.run_drag(scene, tool.transform_rect_item, False, during_drag)
+        # グループの作成・解除でシーン全体を検索しない
+        self.assertTrue(returned)
+        self.assertLess(max(returned), 100)
+        self.assertIs(items[0].topLevelItem(), items[0])
+
+    def test_scene_group(self):
+        results = []
+        for group_min_items in (None, 10):
+            scene = TransformScene(group_min_items=group_min_items)
+            scene.tool = 'transform'
+            items = add_items(scene, 30)
+            finished = []
+            scene.itemsTransformedFinished.connect(finished.append)
+            self.run_drag(scene, scene.transform_rect_item, True)
+            self.assertEqual(len(finished), 1)
+            self.assertIsNone(scene.group_item.scene())
+            results.append([(item.pos(), item.rect()) for item in items])
+        self.assertEqual(results[0], results[1])
+
+
+class TestAbsoluteTransforms(unittest.TestCase):
+
+    def rotate_drag(self, absolute: bool, count: int, steps: int, corner: bool = False):
+        """回転ハンドル（またはcorner=Trueの場合は右下のハンドル）を掴んで、steps回の移動イベントで操作"""
+        scene = CustomScene()
+        tool = TransformTool(scene, absolute_transforms=absolute)
+        scene.registerTool('transform', tool)
+        scene.setActiveTool('transform')
+        items = add_items(scene, count)
+        self.addCleanup(scene.selectionChanged.disconnect, tool.onSelectionChanged)
+
+        rect_item = tool.transform_rect_item
+        if corner:
+            press = rect_item.mapToScene(rect_item.rect().bottomRight())
+            points = [press + QPointF(40 * i / steps, 25 * i / steps) for i in range(1, steps + 1)]
+        else:
+            # 回転ハンドルは変形矩形の中心を囲むリング
+            handle = rect_item.handles[rect_item.handleRotate]
+            press = rect_item.mapToScene(QPointF(handle.right(), handle.center().y()))
+            center = rect_item.transformCenterScenePos()
+            radius = math.hypot(press.x() - center.x(), press.y() - center.y())
+            start = math.atan2(press.y() - center.y(), press.x() - center.x())
+            points = [center + QPointF(radius * math.cos(start + math.radians(75) * i / steps),
+                                       radius * math.sin(start + math.radians(75) * i / steps))
+                      for i in range(1, steps + 1)]
+        send_mouse(scene, QEvent.Type.GraphicsSceneMousePress, press, press, press)
+        last = press
+        for pos in points:
+            send_mouse(scene, QEvent.Type.GraphicsSceneMouseMove, pos, press, last)
+            last = pos
+        send_mouse(scene, QEvent.Type.GraphicsSceneMouseRelease, last, press, last)
+        return rect_item, items
+
+    def assertSameItems(self, items, expected_items, places):
+        for item, expected in zip(items, expected_items):
+            self.assertAlmostEqual(item.pos().x(), expected.pos().x(), places=places)
+            self.assertAlmostEqual(item.pos().y(), expected.pos().y(), places=places)
+            self.assertAlmostEqual(item.transform().m12(), expected.transform().m12(), places=places)
+            self.assertAlmostEqual(item.rect().width(), expected.rect().width(), places=places)
+
+    def test_rotation_does_not_depend_on_event_count(self):
+        # 32個以上はTransformBatch、それ未満はアイテムごとの変形
+        for count in (8, 40):
+            rect_item, single = self.rotate_drag(True, count, 1)
+            self.assertAlmostEqual(rect_item.rotationAngle, 75, places=9)
+            rect_item, many = self.rotate_drag(True, count, 200)
+            self.assertAlmostEqual(rect_item.rotationAngle, 75, places=9)
+            self.assertSameItems(many, single, 9)
+            # 差分を積み重ねる場合も結果は誤差の範囲で一致する
+            _, incremental = self.rotate_drag(False, count, 200)
+            self.assertSameItems(incremental, single, 6)
+
+    def test_resize_matches_incremental(self):
+        for count in (8, 40):
+            _, absolute = self.rotate_drag(True, count, 50, corner=True)
+            _, incremental = self.rotate_drag(False, count, 50, corner=True)
+            self.assertSameItems(absolute, incremental, 6)
+
+
+if __name__ == '__main__':
+    unittest.main()